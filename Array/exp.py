@@ -1,3 +1,37 @@
+import mmap
+import operator
+import os
+import struct
+from array import array
+from itertools import compress, filterfalse, islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; it is only needed for to_numpy().
+    np = None
+
+
+# NumPy-style dtype names mapped to ``array`` typecodes.
+DTYPES = {
+    "i1": "b", "u1": "B",
+    "i2": "h", "u2": "H",
+    "i4": "i", "u4": "I",
+    "i8": "q", "u8": "Q",
+    "f4": "f", "f8": "d",
+}
+
+# Buffer format characters grouped by kind, to tell which buffers can be copied as raw bytes.
+FORMAT_KINDS = {
+    "b": "i", "h": "i", "i": "i", "l": "i", "q": "i",
+    "B": "u", "H": "u", "I": "u", "L": "u", "Q": "u",
+    "f": "f", "d": "f",
+}
+
+# Header of a memory-mapped array file: magic, typecode and the number of elements.
+MMAP_HEADER = struct.Struct("<7scQ")
+MMAP_MAGIC = b"PYARRAY"
+
+
 class Array:
     """
     A simple dynamic array implementation.
@@ -6,24 +40,209 @@ class Array:
     like appending elements, getting elements by index, and removing elements.
     The array automatically resizes as needed when elements are added.
 
+    By default elements are stored as Python objects in a list. Passing a
+    ``dtype`` switches to typed mode, where numbers are stored unboxed in an
+    ``array.array`` (8 bytes per ``'i8'`` element instead of a pointer plus
+    an int object), and the elements can be shared without copying through
+    ``view()`` (or ``memoryview(array)`` on Python 3.12+) or ``to_numpy()``.
+
+    The storage is preallocated: ``data`` holds ``capacity`` slots of which
+    the first ``size`` are in use. When it is full it is reallocated to
+    ``growth_factor`` times its capacity, which makes ``append`` and
+    ``extend`` amortized O(1) per element. Capacity can also be managed
+    explicitly with ``reserve()`` and ``shrink_to_fit()``.
+
+    With ``indexed=True`` the array also keeps a hash index from each value to
+    the set of positions holding it, updated on every modification. This makes
+    membership tests O(1) and lets ``swap_remove()`` delete in O(1), at the
+    cost of requiring hashable elements and extra memory.
+
+    ``Array.open_mmap()`` creates a typed array whose storage is a
+    memory-mapped file, so large arrays can be opened without reading them
+    and shared read-only between processes.
+
     Attributes:
-        data (list): A list used to store the array elements.
+        data (list | array.array): The storage of the array elements; only
+            the first ``size`` slots hold elements.
         size (int): The number of elements currently in the array.
+        dtype (str | None): The element type in typed mode, one of ``DTYPES``,
+            or None for a list of Python objects.
+        typecode (str | None): The ``array`` typecode matching ``dtype``.
+        growth_factor (float): The factor by which the capacity grows when full.
+        indexed (bool): Whether the value to positions index is maintained.
+        reallocations (int): The number of times the storage was reallocated.
+        bytes_copied (int): The number of bytes copied by reallocations.
+        MIN_CAPACITY (int): The smallest capacity allocated on growth.
+        MMAP_CHUNK (int): The granularity in bytes by which memory-mapped
+            files grow.
     """
 
-    def __init__(self):
+    MIN_CAPACITY = 8
+    MMAP_CHUNK = 2 ** 20
+
+    def __init__(self, dtype: str = None, capacity: int = 0, growth_factor: float = 2.0,
+                 indexed: bool = False):
         """
         Initializes a new dynamic array.
 
-        This constructor initializes the array with an empty list
+        This constructor preallocates storage for ``capacity`` elements
         and sets the size to 0.
 
+        Args:
+            dtype (str, optional): The element type for typed mode, e.g. ``'i8'``
+                or ``'f8'``. If omitted, any Python objects can be stored.
+            capacity (int): The number of elements to preallocate storage for.
+            growth_factor (float): The factor by which the capacity grows when
+                the storage is full; must be greater than 1.
+            indexed (bool): If True, maintain a value to positions index for
+                O(1) membership tests and removals.
+
+        Raises:
+            ValueError: If ``dtype`` is not one of ``DTYPES``, or ``capacity``
+                or ``growth_factor`` is out of range.
+
         Attributes:
-            data (list): The list that holds the elements of the array.
+            data (list | array.array): The storage of the array elements; only
+                the first ``size`` slots hold elements, the rest is spare capacity.
             size (int): The number of elements currently in the array.
         """
-        self.data = []
+        if dtype is not None and dtype not in DTYPES:
+            raise ValueError(f"Unsupported dtype {dtype!r}, expected one of {sorted(DTYPES)}")
+        if capacity < 0:
+            raise ValueError("Capacity must not be negative")
+        if growth_factor <= 1:
+            raise ValueError("Growth factor must be greater than 1")
+        self.dtype = dtype
+        self.typecode = None if dtype is None else DTYPES[dtype]
+        self.growth_factor = growth_factor
+        self.data = self._allocate(capacity)
         self.size = 0
+        self.reallocations = 0
+        self.bytes_copied = 0
+        self._positions = {} if indexed else None
+        self._mmap = None
+        self._file = None
+
+    @property
+    def indexed(self):
+        """
+        Returns whether the value to positions index is maintained.
+
+        Returns:
+            bool: True if the array is indexed.
+        """
+        return self._positions is not None
+
+    def _index_range(self, start: int, stop: int):
+        """
+        Adds the elements at positions ``start`` to ``stop`` to the index.
+
+        Args:
+            start (int): The first position (inclusive).
+            stop (int): The last position (exclusive).
+        """
+        positions = self._positions
+        for position in range(start, stop):
+            value = self.data[position]
+            if value in positions:
+                positions[value].add(position)
+            else:
+                positions[value] = {position}
+
+    def _unindex_range(self, start: int, stop: int):
+        """
+        Removes the elements at positions ``start`` to ``stop`` from the index.
+
+        Args:
+            start (int): The first position (inclusive).
+            stop (int): The last position (exclusive).
+        """
+        positions = self._positions
+        for position in range(start, stop):
+            value = self.data[position]
+            entries = positions[value]
+            entries.discard(position)
+            if not entries:
+                del positions[value]
+
+    @property
+    def capacity(self):
+        """
+        Returns the number of elements the array can hold without reallocating.
+
+        Returns:
+            int: The capacity of the storage.
+        """
+        return len(self.data)
+
+    @property
+    def itemsize(self):
+        """
+        Returns the number of bytes one storage slot takes.
+
+        In object mode a slot is a pointer to the element.
+
+        Returns:
+            int: The size of a slot in bytes.
+        """
+        return struct.calcsize("P") if self.dtype is None else array(self.typecode).itemsize
+
+    def _allocate(self, capacity: int):
+        """
+        Creates empty storage with ``capacity`` slots.
+
+        Args:
+            capacity (int): The number of slots.
+
+        Returns:
+            list | array.array: The new storage, filled with None or zeros.
+        """
+        if self.dtype is None:
+            return [None] * capacity
+        return array(self.typecode, bytes(capacity * array(self.typecode).itemsize))
+
+    def _reallocate(self, capacity: int):
+        """
+        Moves the elements to new storage with ``capacity`` slots.
+
+        Args:
+            capacity (int): The new capacity, at least ``size``.
+        """
+        if self._mmap is not None:
+            self._remap(capacity)
+            return
+        data = self._allocate(capacity)
+        data[:self.size] = self.data[:self.size]
+        self.data = data
+        self.reallocations += 1
+        self.bytes_copied += self.size * self.itemsize
+
+    def reserve(self, capacity: int):
+        """
+        Ensures the array can hold ``capacity`` elements without reallocating.
+
+        Args:
+            capacity (int): The number of elements to reserve storage for.
+        """
+        if capacity > len(self.data):
+            self._reallocate(capacity)
+
+    def shrink_to_fit(self):
+        """
+        Releases unused capacity so that the capacity equals the size.
+        """
+        if len(self.data) > self.size:
+            self._reallocate(self.size)
+
+    def _grow(self, min_capacity: int):
+        """
+        Grows the storage geometrically to hold at least ``min_capacity`` elements.
+
+        Args:
+            min_capacity (int): The number of elements that must fit.
+        """
+        capacity = max(min_capacity, int(len(self.data) * self.growth_factor), self.MIN_CAPACITY)
+        self._reallocate(capacity)
 
     def append(self, value):
         """
@@ -35,24 +254,182 @@ class Array:
         Returns:
             None: This method does not return any value; it modifies the array in place.
         """
-        self.data.append(value)
+        if self.size == len(self.data):
+            self._grow(self.size + 1)
+        self.data[self.size] = value
         self.size += 1
+        if self._positions is not None:
+            self._index_range(self.size - 1, self.size)
+
+    def extend(self, values):
+        """
+        Adds all elements of an iterable to the end of the array.
+
+        The storage grows at most once, so this is amortized O(1) per element.
+
+        Args:
+            values (Iterable): The elements to be added to the array. Another
+                ``Array`` or, in typed mode, a buffer of the same element kind
+                and size (``array.array``, ``memoryview``, NumPy array) is
+                copied in one block.
+
+        Returns:
+            None: This method does not return any value; it modifies the array in place.
+        """
+        values = self._coerce(values)
+        end = self.size + len(values)
+        if end > len(self.data):
+            self._grow(end)
+        self.data[self.size:end] = values
+        start, self.size = self.size, end
+        if self._positions is not None:
+            self._index_range(start, end)
     
+    def _coerce(self, values):
+        """
+        Converts values to a sequence that can be assigned into the storage.
+
+        Args:
+            values (Iterable): The values to convert.
+
+        Returns:
+            list | array.array: A list in object mode, an array with the
+            storage's typecode in typed mode.
+        """
+        if isinstance(values, Array):
+            values = values.data[:values.size]
+        if self.dtype is None:
+            if isinstance(values, list):
+                return values
+            if isinstance(values, memoryview):
+                return values.tolist()
+            return list(values)
+
+        typecode = self.typecode
+        if isinstance(values, array):
+            return values if values.typecode == typecode else array(typecode, values.tolist())
+        try:
+            view = memoryview(values)
+        except TypeError:
+            return array(typecode, values if isinstance(values, list) else list(values))
+
+        fmt = view.format.lstrip("@")
+        if (view.ndim == 1 and view.contiguous and FORMAT_KINDS.get(fmt) == FORMAT_KINDS[typecode]
+                and view.itemsize == self.data.itemsize):
+            result = array(typecode)
+            result.frombytes(view.cast("B"))
+            return result
+        return array(typecode, view.tolist())
+
     def remove(self, value):
         """
-        Remove element by value of the array.
+        Remove the first occurrence of a value from the array.
+
+        The elements after it are shifted left, so this takes O(n) time; use
+        ``swap_remove()`` when the order of the elements does not matter.
 
         Args:
             value (Any): The value of the element to remove from the array.
+
+        Raises:
+            ValueError: If the value is not in the array.
         
         Returns:
             None: This method does not return any value;
         """
-        if value in self.data:
-            self.data.remove(value)
-            self.size -= 1
+        index = self._find(value)
+        if index < 0:
+            raise ValueError("Element not found")
+        if self._positions is not None:
+            self._unindex_range(index, self.size)
+        self.data[index:self.size - 1] = self.data[index + 1:self.size]
+        self.size -= 1
+        if self.dtype is None:
+            self.data[self.size] = None  # drop the reference held by the spare slot
+        if self._positions is not None:
+            self._index_range(index, self.size)
+
+    def swap_remove(self, value):
+        """
+        Removes one occurrence of a value by moving the last element into its place.
+
+        This does not preserve the order of the elements, but takes O(1) time
+        on an indexed array (O(n) to find the value otherwise).
+
+        Args:
+            value (Any): The value of the element to remove from the array.
+
+        Raises:
+            ValueError: If the value is not in the array.
+        """
+        if self._positions is not None:
+            entries = self._positions.get(value)
+            index = next(iter(entries)) if entries else -1
         else:
-            print("Element not found")
+            index = self._find(value)
+        if index < 0:
+            raise ValueError("Element not found")
+
+        last = self.size - 1
+        if self._positions is not None:
+            self._unindex_range(index, index + 1)
+            if index != last:
+                self._unindex_range(last, last + 1)
+        self.data[index] = self.data[last]
+        if self.dtype is None:
+            self.data[last] = None
+        self.size = last
+        if self._positions is not None and index != last:
+            self._index_range(index, index + 1)
+
+    def remove_all(self, values):
+        """
+        Removes every occurrence of the given values in a single pass.
+
+        The order of the remaining elements is preserved. The values must be
+        hashable.
+
+        Args:
+            values (Iterable): The values to remove.
+
+        Returns:
+            int: The number of elements removed.
+        """
+        targets = set(values)
+        if self._positions is not None:
+            targets &= self._positions.keys()
+        if not targets:
+            return 0
+
+        kept = self._coerce(filterfalse(targets.__contains__, islice(self.data, self.size)))
+        removed = self.size - len(kept)
+        if removed:
+            self.data[:len(kept)] = kept
+            if self.dtype is None:
+                self.data[len(kept):self.size] = [None] * removed
+            self.size = len(kept)
+            if self._positions is not None:
+                self._positions.clear()
+                self._index_range(0, self.size)
+        return removed
+
+    def _find(self, value):
+        """
+        Returns the index of the first occurrence of a value, or -1.
+
+        Args:
+            value (Any): The value to look for.
+
+        Returns:
+            int: The index of the value among the first ``size`` slots, or -1.
+        """
+        if self._positions is not None:
+            entries = self._positions.get(value)
+            return min(entries) if entries else -1
+        try:
+            return operator.indexOf(islice(self.data, self.size), value)
+        except ValueError:
+            return -1
     
     def __repr__(self):
         """
@@ -64,7 +441,7 @@ class Array:
         Returns:
             str: A string that shows the current elements of the array.
         """
-        return str(self.data)
+        return str(self.tolist())
     
     def __len__(self):
         """
@@ -80,38 +457,197 @@ class Array:
 
     def __getitem__(self, index):
         """
-        Retrieves an element at the specified index.
+        Retrieves an element, a slice or a selection of elements.
 
         Args:
-            index (int): The index of the element to retrieve.
+            index (int | slice | Iterable): The index of the element to retrieve
+                (negative values count from the end), a slice, or a sequence of
+                indices or booleans (a mask of the array's length) selecting
+                several elements.
 
         Raises:
             IndexError: If the index is out of range.
 
         Returns:
-            Any: The element at the specified index.
+            Any | Array: The element at the specified index, or a new array of
+            the same dtype holding the selected elements.
         """
+        if isinstance(index, slice):
+            start, stop, step = self._slice_bounds(index)
+            values = self.data[start:stop:step]
+            if isinstance(values, memoryview):
+                values = array(self.typecode, values.tobytes())  # copy out of the mapped file
+            return self._wrap(values)
 
+        try:
+            index = operator.index(index)
+        except TypeError:
+            values = list(map(self.data.__getitem__, self._fancy_indices(index)))
+            return self._wrap(values if self.dtype is None else array(self.typecode, values))
+
+        if index < 0:
+            index += self.size
         if index < 0 or index >= self.size:
             raise IndexError("Index out of range")
         return self.data[index]
 
     def __setitem__(self, index, value):
         """
-        Sets the element at the specified index.
+        Sets an element, a slice or a selection of elements.
 
         This method allows modifying elements of the array using indexing.
+        Assigning to a slice with step 1 may change the size of the array,
+        as with lists.
 
         Args:
-            index (int): The index of the element to modify.
-            value (Any): The new value of assign to the element.
+            index (int | slice | Iterable): The index of the element to modify
+                (negative values count from the end), a slice, or a sequence of
+                indices or booleans selecting several elements.
+            value (Any): The new value of assign to the element, or an iterable
+                of values for a slice or selection.
 
         Raises:
             IndexError: If index is out of range.
+            ValueError: If the number of values does not match an extended
+                slice or selection.
         """
+        if isinstance(index, slice):
+            self._set_slice(index, self._coerce(value))
+            return
+
+        try:
+            index = operator.index(index)
+        except TypeError:
+            indices = self._fancy_indices(index)
+            values = self._coerce(value)
+            if len(values) != len(indices):
+                raise ValueError(f"Cannot assign {len(values)} values to {len(indices)} positions")
+            for position, item in zip(indices, values):
+                if self._positions is not None:
+                    self._unindex_range(position, position + 1)
+                self.data[position] = item
+                if self._positions is not None:
+                    self._index_range(position, position + 1)
+            return
+
+        if index < 0:
+            index += self.size
         if index < 0 or index >= self.size:
             raise IndexError("Index out of range")
+        if self._positions is not None:
+            self._unindex_range(index, index + 1)
         self.data[index] = value
+        if self._positions is not None:
+            self._index_range(index, index + 1)
+
+    def _slice_bounds(self, index: slice):
+        """
+        Resolves a slice against the live elements of the array.
+
+        Args:
+            index (slice): The slice to resolve.
+
+        Returns:
+            tuple: ``(start, stop, step)`` that can be applied to the storage
+            directly; ``stop`` is None when a negative step runs past the start.
+        """
+        start, stop, step = index.indices(self.size)
+        if step < 0:
+            if start < 0:
+                return 0, 0, 1  # empty; a negative start would wrap into the spare capacity
+            if stop < 0:
+                stop = None
+        return start, stop, step
+
+    def _set_slice(self, index: slice, values):
+        """
+        Assigns values to a slice of the array.
+
+        Args:
+            index (slice): The slice to assign to.
+            values (list | array.array): The values, already coerced to the storage type.
+
+        Raises:
+            ValueError: If an extended slice and the values differ in length.
+        """
+        start, stop, step = index.indices(self.size)
+        if step != 1:
+            count = len(range(start, stop, step))
+            if len(values) != count:
+                raise ValueError(f"Attempt to assign sequence of size {len(values)} "
+                                 f"to extended slice of size {count}")
+            if count:
+                positions = range(*index.indices(self.size))
+                if self._positions is not None:
+                    for position in positions:
+                        self._unindex_range(position, position + 1)
+                start, stop, step = self._slice_bounds(index)
+                self.data[start:stop:step] = values
+                if self._positions is not None:
+                    for position in positions:
+                        self._index_range(position, position + 1)
+            return
+
+        stop = max(stop, start)
+        count = len(values)
+        size = self.size - (stop - start) + count
+        # Positions after the slice shift unless the length is unchanged.
+        shifts = size != self.size
+        if self._positions is not None:
+            self._unindex_range(start, self.size if shifts else stop)
+        if size > len(self.data):
+            self._grow(size)
+        self.data[start + count:size] = self.data[stop:self.size]
+        self.data[start:start + count] = values
+        if self.dtype is None and size < self.size:
+            self.data[size:self.size] = [None] * (self.size - size)
+        self.size = size
+        if self._positions is not None:
+            self._index_range(start, size if shifts else stop)
+
+    def _fancy_indices(self, index):
+        """
+        Converts a sequence of indices or a boolean mask to non-negative indices.
+
+        Args:
+            index (Iterable): Integer indices or a boolean mask, including
+                NumPy arrays of either.
+
+        Raises:
+            IndexError: If an index is out of range or a mask has the wrong length.
+
+        Returns:
+            list: The selected indices.
+        """
+        # NumPy arrays convert to Python bools and ints, so a NumPy mask is a mask here too.
+        numpy_index = np is not None and isinstance(index, np.ndarray)
+        indices = index.tolist() if numpy_index or isinstance(index, Array) else list(index)
+        if numpy_index and index.dtype == bool or indices and all(type(i) is bool for i in indices):
+            if len(indices) != self.size:
+                raise IndexError("Boolean mask must have the same length as the array")
+            return list(compress(range(self.size), indices))
+
+        if indices:
+            if min(indices) < -self.size or max(indices) >= self.size:
+                raise IndexError("Index out of range")
+            if min(indices) < 0:
+                indices = [i + self.size if i < 0 else i for i in indices]
+        return indices
+
+    def _wrap(self, values):
+        """
+        Creates a new array of the same dtype that takes ownership of ``values``.
+
+        Args:
+            values (list | array.array): The storage for the new array.
+
+        Returns:
+            Array: The new array.
+        """
+        new_array = Array(self.dtype, growth_factor=self.growth_factor)
+        new_array.data = values
+        new_array.size = len(values)
+        return new_array
 
     def __iter__(self):
         """
@@ -123,7 +659,7 @@ class Array:
         Returns:
             iterator: An iterator over the array elements.
         """
-        return iter(self.data)
+        return islice(self.data, self.size)
     
     def __contains__(self, value):
         """
@@ -138,7 +674,7 @@ class Array:
         Returns:
             bool: True if element exists in the array. False othewise.
         """
-        return value in self.data
+        return self._find(value) >= 0
     
 
     def __str__(self):
@@ -151,7 +687,7 @@ class Array:
         Returns:
             str: A string showing the elements of the array.
         """
-        return f"Array({self.data})"
+        return f"Array({self.tolist()})"
     
     def __eq__(self, other):
         """
@@ -166,7 +702,7 @@ class Array:
             bool: True if the arrays have the same elements, False otherwise.
         """
         if isinstance(other, Array):
-            return self.data == other.data
+            return self.tolist() == other.tolist()
         return False
 
     def __add__(self, other):
@@ -184,8 +720,344 @@ class Array:
         """
 
         if isinstance(other, Array):
-            new_array = Array()
-            new_array.data = self.data + other.data
-            new_array.size = len(new_array.data)
+            new_array = Array(self.dtype if self.dtype == other.dtype else None,
+                              capacity=self.size + other.size)
+            new_array.extend(self.data[:self.size])
+            new_array.extend(other.data[:other.size])
             return new_array
         raise TypeError("Unsuported operand type(s) for +: 'Array' and 'Array'")
+
+    def __iadd__(self, other):
+        """
+        Appends the elements of another array or iterable in place.
+
+        Unlike '+', the left operand is not copied.
+
+        Args:
+            other (Array | Iterable): The elements to append.
+
+        Returns:
+            Array: This array.
+        """
+        self.extend(other)
+        return self
+
+    def map(self, func, dtype: str = None):
+        """
+        Applies a function to every element and returns the results as a new array.
+
+        The loop runs in C through the built-in ``map``. For a typed array and
+        a NumPy ufunc (e.g. ``numpy.sqrt``) the whole array is processed by
+        NumPy in one vectorized pass.
+
+        Args:
+            func (callable): The function to apply.
+            dtype (str, optional): The dtype of the result; by default a ufunc
+                result keeps the dtype NumPy produced if it is one of
+                ``DTYPES``, and other results are stored as Python objects.
+
+        Returns:
+            Array: A new array with the results.
+        """
+        if self._vectorized(func):
+            result = func(self.to_numpy())
+            if dtype is None:
+                # Results such as booleans ('b1') have no typed storage; keep them as objects.
+                dtype = f"{result.dtype.kind}{result.dtype.itemsize}"
+                dtype = dtype if dtype in DTYPES else None
+            if dtype is not None:
+                new_array = Array(dtype)
+                new_array.extend(result.astype(dtype, copy=False))
+                return new_array
+            values = result.tolist()
+        else:
+            values = list(map(func, islice(self.data, self.size)))
+
+        new_array = Array(dtype)
+        new_array.extend(values)
+        return new_array
+
+    def filter(self, predicate):
+        """
+        Returns a new array of the same dtype with the elements for which
+        ``predicate`` is true.
+
+        The loop runs in C through the built-in ``filter``. For a typed array
+        and a NumPy ufunc returning booleans (e.g. ``numpy.isfinite``) the mask
+        is computed by NumPy in one vectorized pass.
+
+        Args:
+            predicate (callable): The function deciding which elements to keep.
+
+        Returns:
+            Array: A new array with the kept elements.
+        """
+        new_array = Array(self.dtype)
+        if self._vectorized(predicate):
+            view = self.to_numpy()
+            new_array.extend(view[predicate(view)])
+        else:
+            new_array.extend(filter(predicate, islice(self.data, self.size)))
+        return new_array
+
+    def sum(self):
+        """
+        Returns the sum of the elements in one pass.
+
+        Float arrays are summed by NumPy when it is installed; integers use the
+        built-in ``sum`` so the result cannot overflow.
+
+        Returns:
+            int | float: The sum of the elements.
+        """
+        if np is not None and self.dtype in ("f4", "f8"):
+            return self.to_numpy().sum().item()
+        return sum(islice(self.data, self.size))
+
+    def min(self):
+        """
+        Returns the smallest element in one pass.
+
+        Raises:
+            ValueError: If the array is empty.
+
+        Returns:
+            Any: The smallest element.
+        """
+        if self.size == 0:
+            raise ValueError("min() of an empty array")
+        if np is not None and self.dtype is not None:
+            return self.to_numpy().min().item()
+        return min(islice(self.data, self.size))
+
+    def max(self):
+        """
+        Returns the largest element in one pass.
+
+        Raises:
+            ValueError: If the array is empty.
+
+        Returns:
+            Any: The largest element.
+        """
+        if self.size == 0:
+            raise ValueError("max() of an empty array")
+        if np is not None and self.dtype is not None:
+            return self.to_numpy().max().item()
+        return max(islice(self.data, self.size))
+
+    def _vectorized(self, func):
+        """
+        Checks whether ``func`` can be applied to the whole array with NumPy.
+
+        Args:
+            func (callable): The function to check.
+
+        Returns:
+            bool: True for a NumPy ufunc on a typed array.
+        """
+        return np is not None and self.dtype is not None and isinstance(func, np.ufunc)
+
+    def tolist(self):
+        """
+        Returns the elements of the array as a list.
+
+        Returns:
+            list: A new list with the elements of the array.
+        """
+        if self.dtype is None:
+            return self.data[:self.size]
+        return self.data[:self.size].tolist()
+
+    def view(self) -> memoryview:
+        """
+        Returns a zero-copy view of the elements of a typed array.
+
+        Only the ``size`` elements in use are included, not the spare
+        capacity of ``data``. Like ``to_numpy()``, the view is only valid
+        until the array next grows, since growing may move the storage.
+
+        Raises:
+            TypeError: If the array is not in typed mode.
+
+        Returns:
+            memoryview: A view of the elements with the array's typecode.
+        """
+        if self.dtype is None:
+            raise TypeError("Only typed arrays can be viewed as memory")
+        return memoryview(self.data)[:self.size]
+
+    def __buffer__(self, flags):
+        """
+        Exposes the typed storage through the buffer protocol (Python 3.12+).
+
+        On older Pythons use ``view()``; ``memoryview(array.data)`` would
+        also include the spare capacity.
+
+        Args:
+            flags (int): The requested buffer flags.
+
+        Raises:
+            TypeError: If the array is not in typed mode.
+
+        Returns:
+            memoryview: A zero-copy view of the elements.
+        """
+        if self.dtype is None:
+            raise TypeError("Only typed arrays support the buffer protocol")
+        return self.view()
+
+    def to_numpy(self):
+        """
+        Returns a NumPy array that shares memory with the typed storage.
+
+        The view is only valid until the array next grows, since growing may
+        move the storage.
+
+        Raises:
+            TypeError: If the array is not in typed mode.
+            ImportError: If NumPy is not installed.
+
+        Returns:
+            numpy.ndarray: A zero-copy view of the elements.
+        """
+        if self.dtype is None:
+            raise TypeError("Only typed arrays can be viewed as NumPy arrays")
+        if np is None:
+            raise ImportError("to_numpy() requires NumPy")
+        return np.frombuffer(self.data, dtype=self.dtype, count=self.size)
+
+    @classmethod
+    def open_mmap(cls, path: str, dtype: str, mode: str = "r+"):
+        """
+        Opens a typed array stored in a memory-mapped file.
+
+        The file starts with a small header recording the dtype and the number
+        of elements, followed by the raw elements. Opening only maps the file,
+        so it takes the same time regardless of its size, and reads go
+        straight to the mapped pages without copying. Appends grow the file
+        in ``MMAP_CHUNK`` steps; ``flush()`` persists the element count and
+        the modified pages. Any number of processes can map the same file
+        with ``mode="r"``.
+
+        Args:
+            path (str): The path of the file.
+            dtype (str): The element type, one of ``DTYPES``.
+            mode (str): ``"r"`` to map an existing file read-only, ``"r+"`` to
+                map it read-write (creating it if missing), or ``"w+"`` to
+                create or truncate it.
+
+        Raises:
+            ValueError: If the mode or dtype is invalid, or the file is not an
+                array file of this dtype.
+
+        Returns:
+            Array: The memory-mapped array; call ``close()`` when done.
+        """
+        if mode not in ("r", "r+", "w+"):
+            raise ValueError(f"Invalid mode {mode!r}, expected 'r', 'r+' or 'w+'")
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported dtype {dtype!r}, expected one of {sorted(DTYPES)}")
+
+        new_array = cls(dtype)
+        if mode == "w+" or (mode == "r+" and not os.path.exists(path)):
+            file = open(path, "w+b")
+            file.write(MMAP_HEADER.pack(MMAP_MAGIC, new_array.typecode.encode(), 0))
+            file.flush()
+            file.seek(0)
+        else:
+            file = open(path, "rb" if mode == "r" else "r+b")
+
+        try:
+            magic, typecode, size = MMAP_HEADER.unpack(file.read(MMAP_HEADER.size))
+        except struct.error:
+            file.close()
+            raise ValueError(f"{path} is not an array file") from None
+        if magic != MMAP_MAGIC or typecode.decode() != new_array.typecode:
+            file.close()
+            raise ValueError(f"{path} is not an array file of dtype {dtype!r}")
+
+        new_array._file = file
+        new_array._map(mmap.ACCESS_READ if mode == "r" else mmap.ACCESS_WRITE)
+        new_array.size = size
+        return new_array
+
+    def _map(self, access: int):
+        """
+        Maps the whole backing file and points the storage at its element area.
+
+        Args:
+            access (int): The ``mmap`` access mode.
+        """
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=access)
+        elements = (len(self._mmap) - MMAP_HEADER.size) // self.itemsize
+        end = MMAP_HEADER.size + elements * self.itemsize
+        self.data = memoryview(self._mmap)[MMAP_HEADER.size:end].cast(self.typecode)
+
+    def _remap(self, capacity: int):
+        """
+        Resizes the backing file to hold ``capacity`` elements and maps it again.
+
+        The file size is rounded up to a multiple of ``MMAP_CHUNK``. Views
+        previously obtained from the array (e.g. through ``to_numpy()``) must
+        be released first.
+
+        Args:
+            capacity (int): The number of elements the file must hold.
+        """
+        length = MMAP_HEADER.size + capacity * self.itemsize
+        length = -(-length // self.MMAP_CHUNK) * self.MMAP_CHUNK
+        self._write_header()
+        self.data.release()
+        self._mmap.close()
+        self._file.truncate(length)
+        self._map(mmap.ACCESS_WRITE)
+        self.reallocations += 1
+
+    def _write_header(self):
+        """
+        Records the current number of elements in the header of the mapped file.
+        """
+        self._mmap[:MMAP_HEADER.size] = MMAP_HEADER.pack(MMAP_MAGIC, self.typecode.encode(), self.size)
+
+    def flush(self):
+        """
+        Writes the element count and all modified pages of a memory-mapped array to disk.
+
+        Does nothing for arrays that are not memory-mapped or are read-only.
+        """
+        if self._mmap is not None and self._file.mode != "rb":
+            self._write_header()
+            self._mmap.flush()
+
+    def close(self):
+        """
+        Flushes and unmaps a memory-mapped array.
+
+        The array must not be used afterwards. Does nothing for arrays that
+        are not memory-mapped.
+        """
+        if self._mmap is None:
+            return
+        self.flush()
+        self.data.release()
+        self._mmap.close()
+        self._file.close()
+        self._mmap = self._file = None
+        self.data = self._allocate(0)
+        self.size = 0
+
+    def __enter__(self):
+        """
+        Returns the array, so a memory-mapped array can be used in a ``with`` block.
+
+        Returns:
+            Array: This array.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Closes a memory-mapped array at the end of a ``with`` block.
+        """
+        self.close()
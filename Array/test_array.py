@@ -0,0 +1,112 @@
+import importlib.util
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+# Every package directory names its module ``exp``; load this one under a unique name.
+_spec = importlib.util.spec_from_file_location("array_exp", os.path.join(os.path.dirname(__file__), "exp.py"))
+exp = sys.modules["array_exp"] = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(exp)
+Array = exp.Array
+np = exp.np
+
+
+class TestArray(unittest.TestCase):
+    def test_matches_list(self):
+        rng = random.Random(0)
+        for dtype, indexed in ((None, False), (None, True), ("i8", False), ("i4", True)):
+            array, expected = Array(dtype, indexed=indexed), []
+            for _ in range(3000):
+                op = rng.randrange(8)
+                value = rng.randrange(50)
+                size = len(expected)
+                if op == 0:
+                    array.append(value)
+                    expected.append(value)
+                elif op == 1:
+                    values = [rng.randrange(50) for _ in range(rng.randrange(10))]
+                    array.extend(values)
+                    expected.extend(values)
+                elif op == 2 and size:
+                    i = rng.randrange(-size, size)
+                    self.assertEqual(array[i], expected[i])
+                    array[i] = expected[i] = value
+                elif op == 3:
+                    start, stop = sorted((rng.randint(-size, size), rng.randint(-size, size)))
+                    values = [rng.randrange(50) for _ in range(rng.randrange(5))]
+                    array[start:stop] = values
+                    expected[start:stop] = values
+                elif op == 4:
+                    self.assertEqual(value in array, value in expected)
+                    if value in expected:
+                        array.remove(value)
+                        expected.remove(value)
+                    else:
+                        self.assertRaises(ValueError, array.remove, value)
+                elif op == 5 and value in expected:
+                    array.swap_remove(value)
+                    expected.remove(value)
+                    self.assertEqual(sorted(array.tolist()), sorted(expected))
+                    expected = array.tolist()  # the order is not preserved
+                elif op == 6 and rng.random() < 0.1:
+                    targets = {value, value + 1}
+                    self.assertEqual(array.remove_all(targets), sum(item in targets for item in expected))
+                    expected = [item for item in expected if item not in targets]
+                elif op == 7 and size:
+                    self.assertEqual(array[::-2].tolist(), expected[::-2])
+                self.assertEqual(len(array), len(expected))
+            self.assertEqual(array.tolist(), expected)
+
+    def test_capacity(self):
+        array = Array("f8", capacity=4)
+        self.assertEqual(array.capacity, 4)
+        array.extend(range(5))
+        self.assertGreaterEqual(array.capacity, 8)
+        array.shrink_to_fit()
+        self.assertEqual(array.capacity, 5)
+        array.reserve(100)
+        self.assertEqual((array.capacity, array.tolist()), (100, [0.0, 1.0, 2.0, 3.0, 4.0]))
+        self.assertRaises(ValueError, Array, "b1")
+
+    def test_bulk_operations(self):
+        array = Array("i4")
+        array.extend(range(10))
+        self.assertEqual(array[[0, -1, 3]].tolist(), [0, 9, 3])
+        self.assertEqual(array[[i % 3 == 0 for i in range(10)]].tolist(), [0, 3, 6, 9])
+        self.assertRaises(IndexError, array.__getitem__, [True, False])
+        self.assertRaises(IndexError, array.__getitem__, [10])
+        array[[1, 2]] = [-1, -2]
+        self.assertEqual(array[:4].tolist(), [0, -1, -2, 3])
+        self.assertEqual(array.map(lambda x: x * 2).tolist(), [2 * x for x in array.tolist()])
+        self.assertEqual(array.filter(lambda x: x > 5).tolist(), [6, 7, 8, 9])
+        self.assertEqual((array.sum(), array.min(), array.max()), (sum(array.tolist()), -2, 9))
+        self.assertEqual((array + array).tolist(), array.tolist() * 2)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_numpy(self):
+        array = Array("f8")
+        array.extend([1.0, float("inf"), 4.0])
+        self.assertEqual(array.map(np.sqrt).tolist(), [1.0, float("inf"), 2.0])
+        finite = array.map(np.isfinite)
+        self.assertIsNone(finite.dtype)
+        self.assertEqual(finite.tolist(), [True, False, True])
+        self.assertEqual(array[np.array([True, False, True])].tolist(), [1.0, 4.0])
+        self.assertEqual(array[np.array([2, 0])].tolist(), [4.0, 1.0])
+        self.assertEqual(array.to_numpy().tolist(), array.tolist())
+
+    def test_mmap_round_trip(self):
+        with tempfile.TemporaryDirectory() as path:
+            path = os.path.join(path, "values.bin")
+            with Array.open_mmap(path, "i8", "w+") as array:
+                array.extend(range(100_000))
+                array[5] = -5
+            with Array.open_mmap(path, "i8", "r") as array:
+                self.assertEqual(len(array), 100_000)
+                self.assertEqual((array[5], array[-1]), (-5, 99_999))
+            self.assertRaises(ValueError, Array.open_mmap, path, "f8", "r")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import os
+import random
+import time
+import tracemalloc
+
+from exp import BFS, CSRGraph
+
+
+def make_graph(people: int, degree: int, seed: int = 0) -> dict:
+    """
+    Builds a random social network in the dict form used by ``BFS``, without sellers.
+
+    Args:
+        people (int): The number of people.
+        degree (int): The number of friends per person.
+        seed (int): The random seed.
+
+    Returns:
+        dict: Person names mapped to person dicts.
+    """
+    rng = random.Random(seed)
+    names = [f"person{i}" for i in range(people)]
+    return {
+        name: {"name": name, "is_seller": False, "is_checked": False,
+               "friends": [names[rng.randrange(people)] for _ in range(degree)]}
+        for name in names
+    }
+
+
+def measure(build):
+    """
+    Runs ``build`` and reports the memory its result keeps alive.
+
+    Args:
+        build (callable): Creates the object to measure.
+
+    Returns:
+        tuple: The object and the number of bytes allocated for it.
+    """
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def bench_csr(sizes=((10_000, 10), (100_000, 10), (200_000, 50))):
+    """
+    Compares memory use and full-traversal time of the dict and CSR graph forms.
+
+    The graphs have no seller, so every search visits every reachable person.
+    The CSR figure includes its name list and index; the name strings
+    themselves are shared with the dict form and counted there only.
+
+    Args:
+        sizes (tuple): ``(people, friends per person)`` pairs.
+    """
+    print(f"{'people':>9} {'edges':>11} {'dict MB':>9} {'CSR MB':>8} {'dict s':>8} {'CSR s':>8}")
+    for people, degree in sizes:
+        data, dict_bytes = measure(lambda: make_graph(people, degree))
+        graph, csr_bytes = measure(lambda: CSRGraph.from_edges(
+            (name, friend) for name, person in data.items() for friend in person["friends"]))
+
+        start = time.perf_counter()
+        BFS(data).search("person0")
+        dict_time = time.perf_counter() - start
+        start = time.perf_counter()
+        BFS(graph).search("person0")
+        csr_time = time.perf_counter() - start
+
+        print(f"{people:>9,} {people * degree:>11,} {dict_bytes / 2**20:>9.1f} {csr_bytes / 2**20:>8.1f}"
+              f" {dict_time:>8.2f} {csr_time:>8.2f}")
+
+
+def bench_direction(sizes=((100_000, 10), (200_000, 20)), pairs: int = 20, seed: int = 1):
+    """
+    Compares direction-optimizing and top-down-only traversal, and one- and two-sided path search.
+
+    ``traverse`` with ``alpha=inf`` never switches to bottom-up, which makes
+    it a plain level-synchronous BFS. The path columns are the mean time per
+    query over ``pairs`` random pairs: ``traverse`` from the source followed
+    by ``path``, against ``shortest_path``. The transpose is built before
+    timing starts.
+
+    Args:
+        sizes (tuple): ``(people, friends per person)`` pairs.
+        pairs (int): The number of random path queries.
+        seed (int): The random seed of the queries.
+    """
+    rng = random.Random(seed)
+    print(f"{'people':>9} {'edges':>11} {'top-down s':>11} {'optimized s':>12} {'one-sided ms':>13}"
+          f" {'bidirectional ms':>17}")
+    for people, degree in sizes:
+        data = make_graph(people, degree)
+        bfs = BFS(data)
+        bfs.graph.transpose()
+
+        start = time.perf_counter()
+        bfs.traverse("person0", alpha=float("inf"))
+        top_down = time.perf_counter() - start
+        start = time.perf_counter()
+        bfs.traverse("person0")
+        optimized = time.perf_counter() - start
+
+        queries = [(f"person{rng.randrange(people)}", f"person{rng.randrange(people)}") for _ in range(pairs)]
+        start = time.perf_counter()
+        for source, target in queries:
+            bfs.path(bfs.traverse(source)[1], target)
+        one_sided = (time.perf_counter() - start) / pairs
+        start = time.perf_counter()
+        for source, target in queries:
+            bfs.shortest_path(source, target)
+        bidirectional = (time.perf_counter() - start) / pairs
+
+        print(f"{people:>9,} {people * degree:>11,} {top_down:>11.2f} {optimized:>12.2f}"
+              f" {one_sided * 1e3:>13.1f} {bidirectional * 1e3:>17.2f}")
+
+
+def bench_parallel(people: int = 200_000, degree: int = 10, sellers: int = 20, queries: int = 2_000,
+                   counts=(1, 2, 4, 8), seed: int = 2):
+    """
+    Measures ``nearest_sellers`` in its multi-source and process-pool modes.
+
+    The serial row runs one ``CSRGraph.nearest_seller`` search per query in
+    this process. The pool rows include starting the workers and sharing
+    the graph, and they can only scale up to ``os.cpu_count()``.
+
+    Args:
+        people (int): The number of people.
+        degree (int): The number of friends per person.
+        sellers (int): The number of people marked as sellers.
+        queries (int): The number of start people.
+        counts (tuple): The pool sizes to run.
+        seed (int): The random seed of the sellers and queries.
+    """
+    rng = random.Random(seed)
+    data = make_graph(people, degree)
+    for i in rng.sample(range(people), sellers):
+        data[f"person{i}"]["is_seller"] = True
+    bfs = BFS(data)
+    names = [f"person{rng.randrange(people)}" for _ in range(queries)]
+    print(f"{queries:,} queries, {people:,} people, {people * degree:,} edges, {os.cpu_count()} CPUs")
+
+    start = time.perf_counter()
+    for name in names:
+        bfs.graph.nearest_seller(bfs.graph.index[name])
+    serial = time.perf_counter() - start
+    print(f"{'serial':<16} {serial:>8.2f} s")
+
+    start = time.perf_counter()
+    bfs.nearest_sellers(names)
+    print(f"{'multi-source':<16} {time.perf_counter() - start:>8.2f} s   (includes the transpose)")
+
+    for processes in counts:
+        start = time.perf_counter()
+        bfs.nearest_sellers(names, processes)
+        elapsed = time.perf_counter() - start
+        print(f"{f'{processes} processes':<16} {elapsed:>8.2f} s   speedup {serial / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    bench_csr()
+    bench_direction()
+    bench_parallel()
@@ -1,4 +1,380 @@
+import multiprocessing
+from array import array
 from collections import deque
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class CSRGraph:
+    """
+    A read-only graph in compressed sparse row (CSR) form.
+
+    Node names are interned to consecutive integer ids. The friends of node
+    ``i`` are ``neighbors[offsets[i]:offsets[i + 1]]``, so the whole graph
+    lives in two flat ``array.array`` buffers (about 4-8 bytes per edge)
+    instead of a dict and a list of strings per person. Per-node flags such
+    as ``is_seller`` are stored as a bitset, one bit per node.
+
+    Attributes:
+        names (list): The node names, indexed by id.
+        index (dict): Node names mapped to their ids.
+        offsets (array): ``n + 1`` edge offsets (typecode ``q``).
+        neighbors (array): The concatenated friend ids of all nodes.
+        sellers (bytearray): The ``is_seller`` bitset.
+    """
+
+    def __init__(self, names: list, offsets: array, neighbors: array, sellers: bytearray, index: dict = None):
+        """
+        Wraps prebuilt CSR arrays; use ``from_dict`` or ``from_edges`` to build them.
+
+        Args:
+            names (list): The node names, indexed by id.
+            offsets (array): ``len(names) + 1`` edge offsets.
+            neighbors (array): The concatenated friend ids.
+            sellers (bytearray): The ``is_seller`` bitset.
+            index (dict, optional): The name-to-id mapping, if already built.
+        """
+        self.names = names
+        self.index = index if index is not None else {name: i for i, name in enumerate(names)}
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.sellers = sellers
+        self._transpose = None
+
+    @staticmethod
+    def _id_typecode(count: int) -> str:
+        """
+        Returns the smallest array typecode able to hold ``count`` node ids.
+
+        Args:
+            count (int): The number of nodes.
+
+        Returns:
+            str: ``"i"`` for up to 2**31 nodes, otherwise ``"q"``.
+        """
+        return "i" if count < 2 ** 31 else "q"
+
+    @staticmethod
+    def _bitset(count: int, members) -> bytearray:
+        """
+        Builds a bitset with the given node ids set.
+
+        Args:
+            count (int): The number of nodes.
+            members (Iterable): The ids whose bit is set.
+
+        Returns:
+            bytearray: ``ceil(count / 8)`` bytes, bit ``i % 8`` of byte ``i // 8`` for node ``i``.
+        """
+        bits = bytearray((count + 7) // 8)
+        for i in members:
+            bits[i >> 3] |= 1 << (i & 7)
+        return bits
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CSRGraph":
+        """
+        Builds a CSR graph from the dict-of-dicts form used by ``BFS``.
+
+        Friends that are not keys of ``data`` are dropped, as ``BFS.search`` ignores them.
+
+        Args:
+            data (dict): Person names mapped to dicts with ``is_seller`` and ``friends``.
+
+        Returns:
+            CSRGraph: The interned graph.
+        """
+        names = list(data)
+        index = {name: i for i, name in enumerate(names)}
+        offsets = array("q", [0])
+        neighbors = array(cls._id_typecode(len(names)))
+        for name in names:
+            neighbors.extend([index[friend] for friend in data[name]["friends"] if friend in index])
+            offsets.append(len(neighbors))
+        sellers = cls._bitset(len(names), (i for i, name in enumerate(names) if data[name].get("is_seller")))
+        return cls(names, offsets, neighbors, sellers)
+
+    @classmethod
+    def from_edges(cls, edges, sellers=()) -> "CSRGraph":
+        """
+        Builds a CSR graph from ``(person, friend)`` pairs.
+
+        Names are interned in order of first appearance and the edges are
+        kept only as two integer arrays until they are bucketed by source
+        (a counting sort, vectorized with NumPy when it is installed), so
+        graphs with tens of millions of edges never exist as Python objects.
+
+        Args:
+            edges (Iterable): ``(person, friend)`` name pairs.
+            sellers (Iterable): The names of the sellers.
+
+        Returns:
+            CSRGraph: The interned graph.
+        """
+        index = {}
+        names = []
+
+        def intern(name):
+            i = index.get(name)
+            if i is None:
+                i = index[name] = len(names)
+                names.append(name)
+            return i
+
+        sources, targets = array("q"), array("q")
+        for person, friend in edges:
+            sources.append(intern(person))
+            targets.append(intern(friend))
+        seller_ids = [intern(name) for name in sellers]
+        offsets, neighbors = cls._bucket(len(names), sources, targets)
+        return cls(names, offsets, neighbors, cls._bitset(len(names), seller_ids), index)
+
+    @classmethod
+    def _bucket(cls, count: int, sources: array, targets: array):
+        """
+        Groups edges by source with a stable counting sort.
+
+        Args:
+            count (int): The number of nodes.
+            sources (array): The source id of every edge (typecode ``q``).
+            targets (array): The target id of every edge (typecode ``q``).
+
+        Returns:
+            tuple: The ``offsets`` and ``neighbors`` arrays.
+        """
+        typecode = cls._id_typecode(count)
+        if np is not None:
+            source = np.frombuffer(sources, dtype=np.int64)
+            order = np.argsort(source, kind="stable")
+            offsets = array("q", [0])
+            offsets.frombytes(np.cumsum(np.bincount(source, minlength=count), dtype=np.int64).tobytes())
+            neighbors = array(typecode)
+            dtype = np.int32 if typecode == "i" else np.int64
+            neighbors.frombytes(np.frombuffer(targets, dtype=np.int64)[order].astype(dtype).tobytes())
+            return offsets, neighbors
+
+        offsets = array("q", bytes(8 * (count + 1)))
+        for source in sources:
+            offsets[source + 1] += 1
+        for i in range(count):
+            offsets[i + 1] += offsets[i]
+        position = array("q", offsets)
+        neighbors = array(typecode, bytes(array(typecode).itemsize * len(targets)))
+        for source, target in zip(sources, targets):
+            neighbors[position[source]] = target
+            position[source] += 1
+        return offsets, neighbors
+
+    def transpose(self) -> "CSRGraph":
+        """
+        Returns the graph with every edge reversed, building it on first use.
+
+        The friends of node ``i`` in the transpose are the people who list
+        ``i`` as a friend; bottom-up BFS steps and backward searches use it.
+
+        Returns:
+            CSRGraph: The transposed graph, sharing names and sellers with this one.
+        """
+        if self._transpose is None:
+            sources = array("q")
+            for node in range(len(self)):
+                sources.extend([node] * (self.offsets[node + 1] - self.offsets[node]))
+            offsets, neighbors = self._bucket(len(self), array("q", self.neighbors), sources)
+            transpose = CSRGraph(self.names, offsets, neighbors, self.sellers, self.index)
+            transpose._transpose = self
+            self._transpose = transpose
+        return self._transpose
+
+    def __len__(self):
+        """
+        Returns the number of nodes.
+
+        Returns:
+            int: The node count.
+        """
+        return len(self.names)
+
+    def friends(self, node: int) -> array:
+        """
+        Returns the friend ids of a node.
+
+        Args:
+            node (int): The node id.
+
+        Returns:
+            array: A copy of the node's slice of ``neighbors``.
+        """
+        return self.neighbors[self.offsets[node]:self.offsets[node + 1]]
+
+    def is_seller(self, node: int) -> bool:
+        """
+        Tests the ``is_seller`` bit of a node.
+
+        Args:
+            node (int): The node id.
+
+        Returns:
+            bool: True if the node is a seller.
+        """
+        return bool(self.sellers[node >> 3] >> (node & 7) & 1)
+
+    def nbytes(self) -> int:
+        """
+        Returns the size of the CSR arrays (not counting the name tables).
+
+        Returns:
+            int: The number of bytes.
+        """
+        return (len(self.offsets) * self.offsets.itemsize + len(self.neighbors) * self.neighbors.itemsize
+                + len(self.sellers))
+
+    def share(self) -> shared_memory.SharedMemory:
+        """
+        Copies the CSR arrays and the seller bitset into a new shared memory block.
+
+        Other processes map the block with ``attach`` instead of each
+        receiving a pickled copy of the graph. The names stay in this
+        process. The caller must ``close`` and ``unlink`` the block.
+
+        Returns:
+            SharedMemory: The block, laid out as a ``(nodes, edges, id size)``
+                header followed by ``offsets``, ``neighbors`` and ``sellers``.
+        """
+        header = array("q", [len(self), len(self.neighbors), self.neighbors.itemsize])
+        parts = [memoryview(part).cast("B") for part in (header, self.offsets, self.neighbors, self.sellers)]
+        shm = shared_memory.SharedMemory(create=True, size=sum(len(part) for part in parts))
+        position = 0
+        for part in parts:
+            shm.buf[position:position + len(part)] = part
+            position += len(part)
+        return shm
+
+    @classmethod
+    def attach(cls, shm: shared_memory.SharedMemory) -> "CSRGraph":
+        """
+        Wraps a block written by ``share`` without copying it.
+
+        The arrays are memoryviews into the block, so the graph must not be
+        used after the block is closed. Names are not shared: node ``i`` is
+        named ``i`` and ``index`` is empty, so search by id.
+
+        Args:
+            shm (SharedMemory): The block.
+
+        Returns:
+            CSRGraph: The id-level graph.
+        """
+        buf = shm.buf
+        count, edges, itemsize = buf[:24].cast("q")
+        position = 24
+        offsets = buf[position:position + 8 * (count + 1)].cast("q")
+        position += 8 * (count + 1)
+        neighbors = buf[position:position + itemsize * edges].cast("i" if itemsize == 4 else "q")
+        position += itemsize * edges
+        sellers = buf[position:position + (count + 7) // 8]
+        return cls(range(count), offsets, neighbors, sellers, {})
+
+    def nearest_seller(self, start: int):
+        """
+        Finds the seller closest to a node, in the order ``BFS.search`` would.
+
+        Args:
+            start (int): The node id to start from.
+
+        Returns:
+            tuple: ``(hops, seller id)``, or ``(-1, -1)`` if no seller is reachable.
+        """
+        offsets, neighbors, sellers = self.offsets, self.neighbors, self.sellers
+        visited = bytearray(len(self))
+        visited[start] = 1
+        frontier = [start]
+        hops = 0
+        while frontier:
+            for node in frontier:
+                if sellers[node >> 3] >> (node & 7) & 1:
+                    return hops, node
+            hops += 1
+            found = []
+            for node in frontier:
+                for friend in neighbors[offsets[node]:offsets[node + 1]]:
+                    if not visited[friend]:
+                        visited[friend] = 1
+                        found.append(friend)
+            frontier = found
+        return -1, -1
+
+    def seller_distances(self):
+        """
+        Computes the distance to the nearest seller from every node in one pass.
+
+        This is a multi-source BFS from all sellers at once over the
+        transpose, so one traversal of the graph answers the nearest-seller
+        query for every node, however many are asked about.
+
+        Returns:
+            tuple: ``(distances, nearest)``, arrays indexed by node id holding
+                the hops to the nearest seller and that seller's id (one of
+                them if several are equally near), both -1 if none is reachable.
+        """
+        reverse = self.transpose()
+        offsets, neighbors = reverse.offsets, reverse.neighbors
+        count = len(self)
+        distances = array("i", [-1]) * count
+        nearest = array(neighbors.typecode, [-1]) * count
+        frontier = [node for node in range(count) if self.sellers[node >> 3] >> (node & 7) & 1]
+        for node in frontier:
+            distances[node] = 0
+            nearest[node] = node
+
+        hops = 0
+        while frontier:
+            hops += 1
+            found = []
+            for node in frontier:
+                seller = nearest[node]
+                for person in neighbors[offsets[node]:offsets[node + 1]]:
+                    if distances[person] < 0:
+                        distances[person] = hops
+                        nearest[person] = seller
+                        found.append(person)
+            frontier = found
+        return distances, nearest
+
+
+# The graph attached by each pool worker of ``BFS.nearest_sellers``.
+_shared = None
+
+
+def _attach_worker(name: str):
+    """
+    Maps the shared graph into a pool worker.
+
+    Args:
+        name (str): The name of the shared memory block.
+    """
+    global _shared
+    # Pool workers share the resource tracker of the process that created
+    # the block, so a plain attach adds no registration of its own.
+    shm = shared_memory.SharedMemory(name=name)
+    _shared = (shm, CSRGraph.attach(shm))
+
+
+def _nearest_worker(start: int):
+    """
+    Runs one nearest-seller search in a pool worker.
+
+    Args:
+        start (int): The node id to start from.
+
+    Returns:
+        tuple: ``(hops, seller id)`` as returned by ``CSRGraph.nearest_seller``.
+    """
+    return _shared[1].nearest_seller(start)
+
 
 class BFS:
     """
@@ -8,14 +384,47 @@ class BFS:
     def __init__(self, data):
         """
         Initializes the BFS object with the given adjacency list.
+
+        The graph is only read, so one instance (and one graph) can serve
+        any number of searches, including concurrent ones from several threads.
         
         Args:
-            data (dict): A dictionary representing the graph, where keys are person names 
+            data (dict | CSRGraph): A dictionary representing the graph, where keys are person names 
                          and values are dictionaries containing attributes such as 'is_seller' 
-                         and a list of friends.
+                         and a list of friends; or the same graph as a ``CSRGraph``.
+        """
+        self.data = data
+        self._graph = data if isinstance(data, CSRGraph) else None
+
+    @property
+    def graph(self) -> CSRGraph:
         """
-        self.queue: deque = deque()
-        self.data: dict = data
+        Returns the graph in CSR form, converting dict data once, on first use.
+
+        Returns:
+            CSRGraph: The graph used by ``traverse`` and ``shortest_path``.
+        """
+        if self._graph is None:
+            self._graph = CSRGraph.from_dict(self.data)
+        return self._graph
+
+    def _node(self, name) -> int:
+        """
+        Returns the id of a person in ``graph``.
+
+        Args:
+            name (str): The name of the person.
+
+        Raises:
+            ValueError: If the person is not in the network.
+
+        Returns:
+            int: The node id.
+        """
+        node = self.graph.index.get(name)
+        if node is None:
+            raise ValueError(f"Person {name} not found in the network.")
+        return node
 
     def person_is_seller(self, name):
         """
@@ -27,6 +436,9 @@ class BFS:
         Returns:
             bool: True if the person is a seller, False otherwise.
         """
+        if isinstance(self.data, CSRGraph):
+            node = self.data.index.get(name)
+            return node is not None and self.data.is_seller(node)
         return self.data.get(name, {}).get("is_seller", False)
 
     def search(self, name):
@@ -39,29 +451,285 @@ class BFS:
         Returns:
             str: A message indicating whether a seller was found or not.
         """
+        if isinstance(self.data, CSRGraph):
+            return self._search_csr(name)
         if name not in self.data:
             return "Person not found in the network."
 
-        self.queue.appendleft(self.data[name])
-
-        while self.queue:
-            person: dict = self.queue.popleft()
-            is_checked = person.get("is_checked")
+        # Visited people are tracked per search instead of in the graph, and
+        # marked when queued, so nobody is queued twice.
+        queue = deque([name])
+        visited = {name}
 
-            if is_checked:
-                continue
+        while queue:
+            person: dict = self.data[queue.popleft()]
 
             if person["is_seller"]:
                 return f"Person {person['name']} is a seller!"
             
             for friend in person['friends']:
-                if friend in self.data:
-                    self.queue.append(self.data[friend])
-            
-            person["is_checked"] = True
+                if friend not in visited and friend in self.data:
+                    visited.add(friend)
+                    queue.append(friend)
+
+        return "Seller not found!"
+
+    def _search_csr(self, name):
+        """
+        Performs the seller search over a ``CSRGraph``.
+
+        Nodes are plain ints, visited nodes are tracked in a per-search
+        bytearray and neighbours are read straight from the CSR arrays, so
+        no per-person dict is touched.
+
+        Args:
+            name (str): The name of the starting person.
+
+        Returns:
+            str: A message indicating whether a seller was found or not.
+        """
+        graph = self.data
+        start = graph.index.get(name)
+        if start is None:
+            return "Person not found in the network."
+
+        offsets, neighbors, sellers = graph.offsets, graph.neighbors, graph.sellers
+        visited = bytearray(len(graph))
+        visited[start] = 1
+        queue = deque([start])
+
+        while queue:
+            node = queue.popleft()
+            if sellers[node >> 3] >> (node & 7) & 1:
+                return f"Person {graph.names[node]} is a seller!"
+            for friend in neighbors[offsets[node]:offsets[node + 1]]:
+                if not visited[friend]:
+                    visited[friend] = 1
+                    queue.append(friend)
 
         return "Seller not found!"
 
+    def traverse(self, name, alpha: float = 14, beta: float = 24):
+        """
+        Runs a direction-optimizing, level-synchronous BFS from a person.
+
+        Each level is expanded either top-down (every frontier node scans
+        its friends) or bottom-up (every unvisited node scans the people who
+        list it as a friend and stops at the first one in the frontier).
+        Following Beamer et al., the search switches to bottom-up when the
+        frontier's edges exceed ``1 / alpha`` of the edges still unexplored,
+        which is when the middle levels would otherwise touch nearly every
+        edge, and back to top-down once a shrinking frontier holds fewer
+        than ``1 / beta`` of the nodes.
+
+        Args:
+            name (str): The name of the starting person.
+            alpha (float): The top-down to bottom-up switching threshold.
+            beta (float): The bottom-up to top-down switching threshold.
+
+        Raises:
+            ValueError: If the person is not in the network.
+
+        Returns:
+            tuple: ``(distances, parents)``, arrays indexed by node id (see
+                ``graph.index``) holding the hop distance from the start and
+                the previous node on a shortest path; both are -1 for
+                unreachable nodes and the parent of the start is -1.
+        """
+        graph = self.graph
+        start = self._node(name)
+        count = len(graph)
+        offsets, neighbors = graph.offsets, graph.neighbors
+        distances = array("i", [-1]) * count
+        parents = array(neighbors.typecode, [-1]) * count
+        distances[start] = 0
+
+        frontier = [start]
+        unexplored = len(neighbors) - (offsets[start + 1] - offsets[start])
+        bottom_up = False
+        level = 0
+        while frontier:
+            level += 1
+            if bottom_up:
+                if len(frontier) < count / beta and len(frontier) < previous:
+                    bottom_up = False
+            else:
+                frontier_edges = sum(offsets[node + 1] - offsets[node] for node in frontier)
+                bottom_up = frontier_edges > unexplored / alpha
+            previous = len(frontier)
+
+            found = []
+            if bottom_up:
+                reverse = graph.transpose()
+                in_offsets, in_neighbors = reverse.offsets, reverse.neighbors
+                in_frontier = bytearray(count)
+                for node in frontier:
+                    in_frontier[node] = 1
+                for node in range(count):
+                    if distances[node] < 0:
+                        for parent in in_neighbors[in_offsets[node]:in_offsets[node + 1]]:
+                            if in_frontier[parent]:
+                                distances[node] = level
+                                parents[node] = parent
+                                found.append(node)
+                                break
+            else:
+                for parent in frontier:
+                    for node in neighbors[offsets[parent]:offsets[parent + 1]]:
+                        if distances[node] < 0:
+                            distances[node] = level
+                            parents[node] = parent
+                            found.append(node)
+
+            unexplored -= sum(offsets[node + 1] - offsets[node] for node in found)
+            frontier = found
+
+        return distances, parents
+
+    def path(self, parents: array, name) -> list:
+        """
+        Rebuilds the path to a person from the ``parents`` returned by ``traverse``.
+
+        Args:
+            parents (array): The parent pointers.
+            name (str): The name of the destination person.
+
+        Raises:
+            ValueError: If the person is not in the network.
+
+        Returns:
+            list: The names from the start of the traversal to ``name``;
+                just ``[name]`` for the start or an unreachable person.
+        """
+        names = self.graph.names
+        node = self._node(name)
+        path = [names[node]]
+        while parents[node] >= 0:
+            node = parents[node]
+            path.append(names[node])
+        path.reverse()
+        return path
+
+    def shortest_path(self, source, target):
+        """
+        Finds a shortest friendship path between two people with a bidirectional BFS.
+
+        One search walks friend lists forward from ``source`` while the other
+        walks them backward (``graph.transpose()``) from ``target``. Each
+        round expands a whole level of the smaller frontier, so the two
+        searches together visit far fewer nodes than one search from
+        ``source``; they stop at the first level where they meet.
+
+        Args:
+            source (str): The name of the first person.
+            target (str): The name of the person to reach.
+
+        Raises:
+            ValueError: If either person is not in the network.
+
+        Returns:
+            tuple: ``(hops, path)``, the number of edges on a shortest path
+                and the names along it from ``source`` to ``target``, or
+                ``(-1, [])`` if ``target`` cannot be reached.
+        """
+        graph = self.graph
+        start, goal = self._node(source), self._node(target)
+        if start == goal:
+            return 0, [source]
+
+        reverse = graph.transpose()
+        # For each side: parent pointers, distances and the current frontier.
+        forward_parents, backward_parents = {start: -1}, {goal: -1}
+        forward_distances, backward_distances = {start: 0}, {goal: 0}
+        forward, backward = [start], [goal]
+
+        while forward and backward:
+            if len(forward) <= len(backward):
+                edges, parents, distances, other = graph, forward_parents, forward_distances, backward_distances
+                frontier = forward
+            else:
+                edges, parents, distances, other = reverse, backward_parents, backward_distances, forward_distances
+                frontier = backward
+            offsets, neighbors = edges.offsets, edges.neighbors
+
+            found = []
+            meeting, best = -1, None
+            for parent in frontier:
+                level = distances[parent] + 1
+                for node in neighbors[offsets[parent]:offsets[parent + 1]]:
+                    if node not in parents:
+                        parents[node] = parent
+                        distances[node] = level
+                        found.append(node)
+                        if node in other and (best is None or level + other[node] < best):
+                            meeting, best = node, level + other[node]
+
+            if meeting >= 0:
+                path = []
+                node = meeting
+                while node >= 0:
+                    path.append(graph.names[node])
+                    node = forward_parents[node]
+                path.reverse()
+                node = backward_parents[meeting]
+                while node >= 0:
+                    path.append(graph.names[node])
+                    node = backward_parents[node]
+                return best, path
+
+            if frontier is forward:
+                forward = found
+            else:
+                backward = found
+
+        return -1, []
+
+    def nearest_sellers(self, names, processes: int = 0) -> dict:
+        """
+        Finds the nearest seller for many people at once.
+
+        With ``processes=0`` one multi-source BFS from every seller
+        (``graph.seller_distances``) answers all the queries, at the cost
+        of a single traversal however many names are given. Otherwise each
+        name gets an independent search, which stops at the first seller
+        like ``search`` does, spread over a pool of ``processes`` processes.
+        The workers map the graph from one shared memory block instead of
+        each receiving a pickled copy; this suits few queries on a graph
+        where sellers are near, or callers that want ``search``'s choice
+        among equally near sellers.
+
+        Args:
+            names (Iterable): The names of the people to start from.
+            processes (int): The number of worker processes, or 0 for the
+                single multi-source pass.
+
+        Raises:
+            ValueError: If a person is not in the network.
+
+        Returns:
+            dict: Each name mapped to ``(hops, seller name)``, or
+                ``(-1, None)`` if no seller can be reached.
+        """
+        graph = self.graph
+        names = list(names)
+        starts = [self._node(name) for name in names]
+
+        if not processes:
+            distances, nearest = graph.seller_distances()
+            found = [(distances[node], nearest[node]) for node in starts]
+        else:
+            shm = graph.share()
+            try:
+                with multiprocessing.Pool(processes, _attach_worker, (shm.name,)) as pool:
+                    chunk = max(1, len(starts) // (4 * processes))
+                    found = pool.map(_nearest_worker, starts, chunk)
+            finally:
+                shm.close()
+                shm.unlink()
+
+        return {name: (hops, graph.names[seller] if seller >= 0 else None)
+                for name, (hops, seller) in zip(names, found)}
+
 
 if __name__ == "__main__":
     data = {
@@ -115,6 +783,10 @@ if __name__ == "__main__":
         },
     }
 
+    graph = CSRGraph.from_dict(data)
+
     bfs = BFS(data)
     result = bfs.search("you")
     print(result)
+
+    print(BFS(graph).search("you"))
@@ -0,0 +1,130 @@
+import importlib.util
+import os
+import random
+import sys
+import unittest
+from collections import deque
+
+# Every package directory names its module ``exp``; load this one under a unique name.
+_spec = importlib.util.spec_from_file_location("bfs_exp", os.path.join(os.path.dirname(__file__), "exp.py"))
+exp = sys.modules["bfs_exp"] = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(exp)
+BFS = exp.BFS
+
+
+def make_graph(people: int, degree: int, sellers: int, seed: int) -> dict:
+    """
+    Builds a random directed network in the dict form used by ``BFS``.
+    """
+    rng = random.Random(seed)
+    names = [f"person{i}" for i in range(people)]
+    data = {}
+    for name in names:
+        friends = [rng.choice(names) for _ in range(rng.randrange(2 * degree + 1))]
+        if rng.random() < 0.05:
+            friends.append("stranger")  # not in the network, ignored
+        data[name] = {"name": name, "is_seller": False, "is_checked": False, "friends": friends}
+    for name in rng.sample(names, sellers):
+        data[name]["is_seller"] = True
+    return data
+
+
+def plain_distances(data: dict, start: str) -> dict:
+    """
+    Returns the hop distance from ``start`` to every reachable person.
+    """
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        person = queue.popleft()
+        for friend in data[person]["friends"]:
+            if friend in data and friend not in distances:
+                distances[friend] = distances[person] + 1
+                queue.append(friend)
+    return distances
+
+
+class TestBFS(unittest.TestCase):
+    def setUp(self):
+        self.graphs = [make_graph(300, 1, 3, seed=0), make_graph(300, 3, 5, seed=1),
+                       make_graph(200, 20, 2, seed=2)]
+
+    def test_traverse_matches_plain_bfs(self):
+        # The thresholds force top-down only, bottom-up as early as possible and the default mix.
+        for data in self.graphs:
+            bfs = BFS(data)
+            names = bfs.graph.names
+            for start in ("person0", "person7", "person42"):
+                expected = plain_distances(data, start)
+                for alpha in (1e-9, 1e9, 14):
+                    distances, parents = bfs.traverse(start, alpha=alpha)
+                    for node, name in enumerate(names):
+                        self.assertEqual(distances[node], expected.get(name, -1))
+                        if distances[node] > 0:
+                            parent = names[parents[node]]
+                            self.assertEqual(distances[parents[node]], distances[node] - 1)
+                            self.assertIn(name, data[parent]["friends"])
+                        else:
+                            self.assertEqual(parents[node], -1)
+                    path = bfs.path(parents, "person1")
+                    if "person1" in expected:
+                        self.assertEqual((path[0], len(path) - 1), (start, expected["person1"]))
+                    else:
+                        self.assertEqual(path, ["person1"])
+
+    def test_shortest_path_matches_plain_bfs(self):
+        rng = random.Random(3)
+        for data in self.graphs:
+            bfs = BFS(data)
+            for _ in range(30):
+                source, target = f"person{rng.randrange(len(data))}", f"person{rng.randrange(len(data))}"
+                hops, path = bfs.shortest_path(source, target)
+                self.assertEqual(hops, plain_distances(data, source).get(target, -1))
+                if hops < 0:
+                    self.assertEqual(path, [])
+                    continue
+                self.assertEqual((path[0], path[-1], len(path)), (source, target, hops + 1))
+                for person, friend in zip(path, path[1:]):
+                    self.assertIn(friend, data[person]["friends"])
+
+    def test_nearest_sellers_match_plain_bfs(self):
+        data = self.graphs[1]
+        bfs = BFS(data)
+        names = list(data)
+        for processes in (0, 2):
+            found = bfs.nearest_sellers(names, processes=processes)
+            for name in names:
+                distances = plain_distances(data, name)
+                reachable = [hops for person, hops in distances.items() if data[person]["is_seller"]]
+                hops, seller = found[name]
+                self.assertEqual(hops, min(reachable, default=-1))
+                if hops >= 0:
+                    self.assertTrue(data[seller]["is_seller"])
+                    self.assertEqual(distances[seller], hops)
+                else:
+                    self.assertIsNone(seller)
+
+    def test_search_is_repeatable_and_csr_agrees(self):
+        for data in self.graphs:
+            by_dict, by_csr = BFS(data), BFS(exp.CSRGraph.from_dict(data))
+            for start in ("person0", "person5", "nobody"):
+                first = by_dict.search(start)
+                self.assertEqual(by_dict.search(start), first)
+                self.assertEqual(by_csr.search(start), first)
+
+    def test_from_edges_matches_from_dict(self):
+        data = self.graphs[0]
+        edges = [(name, friend) for name in data for friend in data[name]["friends"] if friend in data]
+        sellers = [name for name in data if data[name]["is_seller"]]
+        graph = exp.CSRGraph.from_edges(edges, sellers)
+        reference = exp.CSRGraph.from_dict(data)
+        for name in data:
+            if name in graph.index:
+                node = graph.index[name]
+                self.assertEqual([graph.names[i] for i in graph.friends(node)],
+                                 [reference.names[i] for i in reference.friends(reference.index[name])])
+                self.assertEqual(graph.is_seller(node), data[name]["is_seller"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import random
+import time
+
+from exp import Deque
+
+
+def bench_metrics(items: int = 200_000, repeat: int = 9):
+    """
+    Measures the overhead of ``Deque.enable_metrics`` on append/popleft and append/pop loops.
+
+    Runs with and without metrics alternate, so drift affects both alike.
+    These bare loops are the worst case: a plain end operation costs well
+    under 100 ns, so the bookkeeping shows up as a large relative overhead
+    (see ``Deque.enable_metrics``).
+
+    Args:
+        items (int): The number of elements pushed and popped per run.
+        repeat (int): The number of runs per configuration; the best is kept.
+    """
+    def run(metrics: bool, lifo: bool) -> float:
+        d = Deque()
+        if metrics:
+            d.enable_metrics()
+        start = time.perf_counter()
+        for i in range(items):
+            d.append(i)
+        remove = d.pop if lifo else d.popleft
+        for _ in range(items):
+            remove()
+        return time.perf_counter() - start
+
+    for label, lifo in (("append/popleft", False), ("append/pop", True)):
+        times = [(run(False, lifo), run(True, lifo)) for _ in range(repeat)]
+        plain = min(pair[0] for pair in times)
+        instrumented = min(pair[1] for pair in times)
+        print(f"{label:<16} {items / plain:>12,.0f} {items / instrumented:>12,.0f} ops/s"
+              f"   overhead {instrumented / plain - 1:+.1%}")
+
+
+def bench_store(sizes=(10_000, 100_000, 1_000_000), operations: int = 2_000):
+    """
+    Compares the ``collections.deque`` store with the chunked ``BlockList`` store.
+
+    For each size a deque is filled and then timed on end-heavy work
+    (append/pop at both ends), positional reads, inserts and deletes at
+    random positions, and split/concat at random positions.
+
+    Args:
+        sizes (tuple): The deque sizes to measure.
+        operations (int): The number of operations per workload.
+    """
+    def workloads(d: Deque, n: int):
+        positions = [random.randrange(n) for _ in range(operations)]
+
+        def ends():
+            for i in range(operations):
+                d.append(i)
+                d.appendleft(i)
+                d.pop()
+                d.popleft()
+
+        def read():
+            for i in positions:
+                d[i]
+
+        def insert():
+            for i in positions:
+                d.insert(i, i)
+
+        def delete():
+            for i in positions:
+                d.delete(i)
+
+        def split_concat():
+            for i in positions[:operations // 10]:
+                rest = d.split(i)
+                d.concat(rest)
+
+        return (("ends", ends, 4 * operations), ("read", read, operations), ("insert", insert, operations),
+                ("delete", delete, operations), ("split+concat", split_concat, operations // 10))
+
+    print(f"{'size':>9} {'workload':<14} {'deque':>12} {'chunked':>12}   (us/op)")
+    for n in sizes:
+        results = {}
+        for chunked in (False, True):
+            d = Deque(chunked=chunked)
+            for i in range(n):
+                d.append(i)
+            random.seed(n)
+            for label, run, count in workloads(d, n):
+                start = time.perf_counter()
+                run()
+                results.setdefault(label, []).append((time.perf_counter() - start) / count * 1e6)
+        for label, (plain, chunked) in results.items():
+            print(f"{n:>9,} {label:<14} {plain:>12.2f} {chunked:>12.2f}")
+
+
+if __name__ == "__main__":
+    bench_metrics()
+    bench_store()
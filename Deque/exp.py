@@ -1,35 +1,847 @@
+"""
+A double-ended queue with optional window aggregates and a chunked store.
+
+``LatencyHistogram`` is a copy of the one in ``Queue/exp.py`` (only the
+docstring headings follow this file's style), and ``DequeMetrics`` follows
+``QueueMetrics``: the directories are standalone modules without a common
+package, so keep both in step when changing either.
+"""
+import random
+import time
 from typing import Any
 from collections import deque
+from itertools import chain, islice
+
+class _Node:
+    """
+    A node of the ``BlockList`` rope: one block of elements plus treap links.
+
+    Attributes:
+        block (list): The elements of this block, in order.
+        priority (float): The random treap priority; parents have higher priority.
+        left (_Node): The subtree of the blocks before this one.
+        right (_Node): The subtree of the blocks after this one.
+        size (int): The number of elements in this subtree.
+    """
+
+    __slots__ = ("block", "priority", "left", "right", "size")
+
+    def __init__(self, block: list):
+        """
+        Creates a leaf node holding ``block``.
+
+        Arguments:
+            block (list): The elements of the block.
+        """
+        self.block = block
+        self.priority = random.random()
+        self.left = self.right = None
+        self.size = len(block)
+
+    def update(self):
+        """
+        Recomputes the subtree size from the children.
+        """
+        self.size = len(self.block) + (self.left.size if self.left else 0) + (self.right.size if self.right else 0)
+
+
+def _merge(a: _Node, b: _Node) -> _Node:
+    """
+    Concatenates two ropes; every element of ``a`` comes before every element of ``b``.
+
+    Arguments:
+        a (_Node): The root of the first rope, or None.
+        b (_Node): The root of the second rope, or None.
+
+    Returns:
+        _Node: The root of the combined rope.
+    """
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.priority > b.priority:
+        a.right = _merge(a.right, b)
+        a.update()
+        return a
+    b.left = _merge(a, b.left)
+    b.update()
+    return b
+
+
+def _split(node: _Node, k: int):
+    """
+    Splits a rope after its first ``k`` elements, cutting a block if needed.
+
+    Arguments:
+        node (_Node): The root of the rope, or None.
+        k (int): The number of elements that go to the left rope.
+
+    Returns:
+        tuple: The roots of the left and right ropes.
+    """
+    if node is None:
+        return None, None
+    left_size = node.left.size if node.left else 0
+    if k <= left_size:
+        left, node.left = _split(node.left, k)
+        node.update()
+        return left, node
+    rest = k - left_size - len(node.block)
+    if rest >= 0:
+        node.right, right = _split(node.right, rest)
+        node.update()
+        return node, right
+    cut = k - left_size
+    right = _merge(_Node(node.block[cut:]), node.right)
+    del node.block[cut:]
+    node.right = None
+    node.update()
+    return node, right
+
+
+def _edge(node: _Node, last: bool) -> _Node:
+    """
+    Returns the node holding the first or last block of a rope.
+
+    Arguments:
+        node (_Node): The root of a non-empty rope.
+        last (bool): Whether to find the last block instead of the first.
+
+    Returns:
+        _Node: The leftmost or rightmost node.
+    """
+    while (node.right if last else node.left) is not None:
+        node = node.right if last else node.left
+    return node
+
+
+def _join(a: _Node, b: _Node, block: int) -> _Node:
+    """
+    Concatenates two ropes like ``_merge``, coalescing undersized blocks at the seam.
+
+    If the last block of ``a`` or the first block of ``b`` holds fewer than
+    ``block // 2`` elements, the two are combined into one block, or into
+    two halves if that would exceed ``2 * block``, so repeated cuts cannot
+    fill the rope with tiny blocks.
+
+    Arguments:
+        a (_Node): The root of the first rope, or None.
+        b (_Node): The root of the second rope, or None.
+        block (int): The nominal block size.
+
+    Returns:
+        _Node: The root of the combined rope.
+    """
+    if a is None or b is None:
+        return _merge(a, b)
+    first, last = _edge(b, False), _edge(a, True)
+    if len(last.block) >= block // 2 and len(first.block) >= block // 2:
+        return _merge(a, b)
+    a = _split(a, a.size - len(last.block))[0]
+    b = _split(b, len(first.block))[1]
+    items = last.block + first.block
+    if len(items) > 2 * block:
+        middle = _merge(_Node(items[:len(items) // 2]), _Node(items[len(items) // 2:]))
+    else:
+        middle = _Node(items)
+    return _merge(_merge(a, middle), b)
+
+
+def _settle(node: _Node, block: int) -> _Node:
+    """
+    Coalesces undersized first and last blocks of a rope (left by a cut) into their neighbours.
+
+    Arguments:
+        node (_Node): The root of the rope, or None.
+        block (int): The nominal block size.
+
+    Returns:
+        _Node: The root of the rope.
+    """
+    if node is None:
+        return None
+    size = len(_edge(node, False).block)
+    if size < block // 2 and size < node.size:
+        node = _join(*_split(node, size), block)
+    size = len(_edge(node, True).block)
+    if size < block // 2 and size < node.size:
+        node = _join(*_split(node, node.size - size), block)
+    return node
+
+
+class BlockList:
+    """
+    A sequence of fixed-size blocks with O(log n) positional access and O(1) ends.
+
+    The middle of the sequence is a rope: an implicit treap whose nodes hold
+    blocks of ``BLOCK // 2`` to ``2 * BLOCK`` elements (undersized blocks
+    are coalesced with a neighbour) and know the size of their subtree, so reading, inserting or deleting at a position, ``split``
+    and ``concat`` all take O(log n) expected time (plus O(BLOCK) to shift
+    elements inside one block). The two ends are plain list buffers outside
+    the rope: ``append``/``appendleft``/``pop``/``popleft`` work on those,
+    and a whole block is moved into or out of the rope only once a buffer
+    holds ``2 * BLOCK`` elements or runs empty, which keeps the end
+    operations O(1) amortized and the buffers short enough for positional
+    operations on them to stay O(BLOCK).
+
+    It offers the subset of the ``collections.deque`` interface that
+    ``Deque`` uses, so it can serve as its backing store.
+
+    Attributes:
+        maxlen (int): The maximum number of elements, or None if unbounded.
+    """
+
+    BLOCK = 256
+
+    def __init__(self, iterable=(), maxlen: int = None):
+        """
+        Initializes the sequence.
+
+        Arguments:
+            iterable (Iterable): The initial elements.
+            maxlen (int, optional): The maximum number of elements; adding to
+                a full sequence drops an element from the opposite end.
+        """
+        self.maxlen = maxlen
+        self._head = []  # the first elements, in reverse order
+        self._root = None
+        self._tail = []  # the last elements, in order
+        self._build(iterable)
+
+    def _build(self, iterable):
+        """
+        Replaces the contents with ``iterable``, packed into full blocks.
+
+        Arguments:
+            iterable (Iterable): The new elements.
+        """
+        items = list(iterable)
+        if self.maxlen is not None and len(items) > self.maxlen:
+            items = items[len(items) - self.maxlen:]
+        self._head, self._tail = [], []
+        self._root = None
+        for start in range(0, len(items), self.BLOCK):
+            self._root = _merge(self._root, _Node(items[start:start + self.BLOCK]))
+
+    def __len__(self):
+        """
+        Returns the number of elements.
+
+        Returns:
+            int: The length of the sequence.
+        """
+        return len(self._head) + (self._root.size if self._root else 0) + len(self._tail)
+
+    def _flush(self):
+        """
+        Moves both end buffers into the rope.
+        """
+        if self._head:
+            self._root = _join(_Node(self._head[::-1]), self._root, self.BLOCK)
+            self._head = []
+        if self._tail:
+            self._root = _join(self._root, _Node(self._tail), self.BLOCK)
+            self._tail = []
+
+    def _spill(self, last: bool):
+        """
+        Moves one block from an overfull end buffer into the rope.
+
+        Arguments:
+            last (bool): Whether to spill the back buffer instead of the front one.
+        """
+        if last:
+            self._root = _merge(self._root, _Node(self._tail[:self.BLOCK]))
+            del self._tail[:self.BLOCK]
+        else:
+            self._root = _merge(_Node(self._head[self.BLOCK - 1::-1]), self._root)
+            del self._head[:self.BLOCK]
+
+    def _take_block(self, last: bool) -> list:
+        """
+        Detaches the first or last block of the rope.
+
+        Arguments:
+            last (bool): Whether to take the last block instead of the first.
+
+        Returns:
+            list: The elements of the detached block.
+        """
+        node = _edge(self._root, last)
+        if last:
+            self._root, rest = _split(self._root, self._root.size - len(node.block))
+        else:
+            rest, self._root = _split(self._root, len(node.block))
+        return rest.block
+
+    def append(self, item):
+        """
+        Adds an element at the end.
+
+        Arguments:
+            item (Any): The element to add.
+        """
+        if self.maxlen is not None and len(self) >= self.maxlen:
+            if not self.maxlen:
+                return
+            self.popleft()
+        tail = self._tail
+        tail.append(item)
+        if len(tail) >= 2 * self.BLOCK:
+            self._spill(True)
+
+    def extend(self, iterable):
+        """
+        Adds every element of ``iterable`` at the end.
+
+        Arguments:
+            iterable (Iterable): The elements to add.
+        """
+        for item in iterable:
+            self.append(item)
+
+    def appendleft(self, item):
+        """
+        Adds an element at the front.
+
+        Arguments:
+            item (Any): The element to add.
+        """
+        if self.maxlen is not None and len(self) >= self.maxlen:
+            if not self.maxlen:
+                return
+            self.pop()
+        head = self._head
+        head.append(item)
+        if len(head) >= 2 * self.BLOCK:
+            self._spill(False)
+
+    def pop(self):
+        """
+        Removes and returns the last element.
+
+        Exceptions:
+            IndexError: Raised if the sequence is empty.
+
+        Returns:
+            Any: The removed element.
+        """
+        if not self._tail:
+            if self._root is not None:
+                self._tail = self._take_block(True)
+            elif self._head:
+                return self._head.pop(0)
+            else:
+                raise IndexError("pop from an empty BlockList")
+        return self._tail.pop()
+
+    def popleft(self):
+        """
+        Removes and returns the first element.
+
+        Exceptions:
+            IndexError: Raised if the sequence is empty.
+
+        Returns:
+            Any: The removed element.
+        """
+        if not self._head:
+            if self._root is not None:
+                self._head = self._take_block(False)[::-1]
+            elif self._tail:
+                return self._tail.pop(0)
+            else:
+                raise IndexError("pop from an empty BlockList")
+        return self._head.pop()
+
+    def _position(self, i: int) -> int:
+        """
+        Normalizes a possibly negative index.
+
+        Arguments:
+            i (int): The index.
+
+        Exceptions:
+            IndexError: Raised if the index is out of range.
+
+        Returns:
+            int: The index as a non-negative position.
+        """
+        size = len(self)
+        if i < 0:
+            i += size
+        if not 0 <= i < size:
+            raise IndexError("BlockList index out of range")
+        return i
+
+    def _locate(self, i: int):
+        """
+        Finds the list holding position ``i`` and the offset within it.
+
+        Arguments:
+            i (int): A valid non-negative position.
+
+        Returns:
+            tuple: ``(list, offset)``.
+        """
+        if i < len(self._head):
+            return self._head, len(self._head) - 1 - i
+        i -= len(self._head)
+        node = self._root
+        if node is None or i >= node.size:
+            return self._tail, i - (node.size if node else 0)
+        while True:
+            left_size = node.left.size if node.left else 0
+            if i < left_size:
+                node = node.left
+            elif i < left_size + len(node.block):
+                return node.block, i - left_size
+            else:
+                i -= left_size + len(node.block)
+                node = node.right
+
+    def __getitem__(self, i: int):
+        """
+        Returns the element at position ``i`` in O(log n).
+
+        Arguments:
+            i (int): The index; negative values count from the end.
+
+        Exceptions:
+            IndexError: Raised if the index is out of range.
+
+        Returns:
+            Any: The element.
+        """
+        block, offset = self._locate(self._position(i))
+        return block[offset]
+
+    def __setitem__(self, i: int, item):
+        """
+        Replaces the element at position ``i`` in O(log n).
+
+        Arguments:
+            i (int): The index; negative values count from the end.
+            item (Any): The new element.
+
+        Exceptions:
+            IndexError: Raised if the index is out of range.
+        """
+        block, offset = self._locate(self._position(i))
+        block[offset] = item
+
+    def insert(self, i: int, item):
+        """
+        Inserts an element before position ``i`` in O(log n).
+
+        Arguments:
+            i (int): The position; it is clamped to the sequence like ``list.insert``.
+            item (Any): The element to insert.
+
+        Exceptions:
+            IndexError: Raised if the sequence is bounded and full.
+        """
+        size = len(self)
+        if self.maxlen is not None and size >= self.maxlen:
+            raise IndexError("BlockList already at its maximum size")
+        if i < 0:
+            i = max(i + size, 0)
+        i = min(i, size)
+        heads = len(self._head)
+        if i <= heads:
+            self._head.insert(heads - i, item)
+            if len(self._head) >= 2 * self.BLOCK:
+                self._spill(False)
+            return
+        i -= heads
+        tree = self._root.size if self._root else 0
+        if i >= tree:
+            self._tail.insert(i - tree, item)
+            if len(self._tail) >= 2 * self.BLOCK:
+                self._spill(True)
+            return
+
+        # Walk down to the block, growing the subtree sizes on the way.
+        node, start = self._root, 0
+        while True:
+            node.size += 1
+            left_size = node.left.size if node.left else 0
+            if i < left_size:
+                node = node.left
+            elif i <= left_size + len(node.block):
+                offset = i - left_size
+                node.block.insert(offset, item)
+                break
+            else:
+                i -= left_size + len(node.block)
+                start += left_size + len(node.block)
+                node = node.right
+        if len(node.block) > 2 * self.BLOCK:
+            # Cut the block in half; _split makes a node of the second half.
+            middle = start + (node.left.size if node.left else 0) + len(node.block) // 2
+            self._root = _merge(*_split(self._root, middle))
+
+    def __delitem__(self, i: int):
+        """
+        Removes the element at position ``i`` in O(log n).
+
+        Arguments:
+            i (int): The index; negative values count from the end.
+
+        Exceptions:
+            IndexError: Raised if the index is out of range.
+        """
+        i = self._position(i)
+        heads = len(self._head)
+        if i < heads:
+            del self._head[heads - 1 - i]
+            return
+        i -= heads
+        tree = self._root.size if self._root else 0
+        if i >= tree:
+            del self._tail[i - tree]
+            return
+
+        # Walk down to the block, shrinking the subtree sizes on the way.
+        parent, node, start = None, self._root, 0
+        while True:
+            node.size -= 1
+            left_size = node.left.size if node.left else 0
+            if i < left_size:
+                parent, node = node, node.left
+            elif i < left_size + len(node.block):
+                del node.block[i - left_size]
+                start += left_size
+                break
+            else:
+                i -= left_size + len(node.block)
+                start += left_size + len(node.block)
+                parent, node = node, node.right
+        if node.block and len(node.block) < self.BLOCK // 2 and len(node.block) < self._root.size:
+            # Cut the undersized block out and coalesce it with a neighbour.
+            left, rest = _split(self._root, start)
+            middle, right = _split(rest, len(node.block))
+            self._root = _join(_join(left, middle, self.BLOCK), right, self.BLOCK)
+        elif not node.block:
+            merged = _merge(node.left, node.right)
+            if parent is None:
+                self._root = merged
+            elif parent.left is node:
+                parent.left = merged
+            else:
+                parent.right = merged
+
+    def split(self, i: int) -> "BlockList":
+        """
+        Moves the elements from position ``i`` on into a new sequence in O(log n).
+
+        Arguments:
+            i (int): The split position; it is clamped to the sequence.
+
+        Returns:
+            BlockList: The elements ``[i:]``; this sequence keeps ``[:i]``.
+        """
+        size = len(self)
+        if i < 0:
+            i = max(i + size, 0)
+        self._flush()
+        other = BlockList(maxlen=self.maxlen)
+        left, right = _split(self._root, min(i, size))
+        self._root, other._root = _settle(left, self.BLOCK), _settle(right, self.BLOCK)
+        return other
+
+    def concat(self, other: "BlockList"):
+        """
+        Appends all elements of ``other`` in O(log n), leaving ``other`` empty.
+
+        If the result exceeds ``maxlen``, elements are dropped from the front.
+
+        Arguments:
+            other (BlockList): The sequence to append.
+        """
+        self._flush()
+        other._flush()
+        self._root = _join(self._root, other._root, self.BLOCK)
+        other._root = None
+        if self.maxlen is not None and len(self) > self.maxlen:
+            self._root = _settle(_split(self._root, len(self) - self.maxlen)[1], self.BLOCK)
+
+    def _chunks(self):
+        """
+        Yields the underlying lists in order.
+
+        Yields:
+            list: The front buffer (reversed into order), every block, then the back buffer.
+        """
+        if self._head:
+            yield self._head[::-1]
+        stack, node = [], self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.block
+            node = node.right
+        if self._tail:
+            yield self._tail
+
+    def __iter__(self):
+        """
+        Returns an iterator over the elements in order.
+
+        Returns:
+            iterator: An iterator over the elements.
+        """
+        return chain.from_iterable(self._chunks())
+
+    def index(self, item, start: int = 0, end: int = None) -> int:
+        """
+        Finds the first occurrence of an element within ``[start, end)``.
+
+        Arguments:
+            item (Any): The element to search for.
+            start (int): The first position to search.
+            end (int, optional): The position to stop at.
+
+        Exceptions:
+            ValueError: Raised if the element is not found.
+
+        Returns:
+            int: The position of the element.
+        """
+        start, end, _ = slice(start, end).indices(len(self))
+        offset = 0
+        for chunk in self._chunks():
+            if offset >= end:
+                break
+            low, high = max(start - offset, 0), min(end - offset, len(chunk))
+            if low < high:
+                try:
+                    return offset + chunk.index(item, low, high)
+                except ValueError:
+                    pass
+            offset += len(chunk)
+        raise ValueError(f"{item!r} is not in BlockList")
+
+    def count(self, item) -> int:
+        """
+        Counts the occurrences of an element.
+
+        Arguments:
+            item (Any): The element to count.
+
+        Returns:
+            int: The number of occurrences.
+        """
+        return sum(chunk.count(item) for chunk in self._chunks())
+
+    def reverse(self):
+        """
+        Reverses the sequence in place in O(n).
+        """
+        items = list(self)
+        items.reverse()
+        self._build(items)
+
+    def rotate(self, n: int = 1):
+        """
+        Rotates the sequence ``n`` steps to the right in O(log n).
+
+        Arguments:
+            n (int): The number of steps; negative values rotate left.
+        """
+        size = len(self)
+        if size > 1 and n % size:
+            self._flush()
+            left, right = _split(self._root, size - n % size)
+            self._root = _settle(_join(right, left, self.BLOCK), self.BLOCK)
+
+    def clear(self):
+        """
+        Removes all elements.
+        """
+        self._head, self._tail = [], []
+        self._root = None
+
 
 class Deque:
     """
     A class to represent a deque (double-ended queue).
     Uses the deque from Python's standard library for implementation.
+
+    With ``maxlen`` the deque is bounded: adding to a full deque drops an
+    element from the opposite end, which makes it a sliding window. With
+    ``window=True`` the deque also maintains aggregates of its (numeric)
+    elements on every ``append``/``appendleft``/``pop``/``popleft``, so
+    ``min``, ``max``, ``sum``, ``mean`` and ``count`` are O(1) (amortized
+    for ``min``/``max``) instead of rescanning the window.
+
+    ``min``/``max`` use two stacks of running minima and maxima, one growing
+    from each end of the deque; when a pop empties one stack, both are
+    rebuilt from the two halves of the remaining elements, which keeps every
+    operation O(1) amortized at either end. The running sum is updated
+    incrementally, so with floats it can drift by rounding error; ``rotate``
+    and ``reverse`` rebuild the aggregates in O(n).
+
+    With ``chunked=True`` the elements are stored in a ``BlockList``
+    instead of a ``collections.deque``: positional reads, ``insert``,
+    ``delete``, ``split`` and ``concat`` become O(log n) while the end
+    operations stay O(1) amortized (but slower than the C deque by a
+    constant factor). In window mode, operations away from the ends
+    rebuild the aggregates in O(n).
+
+    Attributes:
+        window (bool): Whether the aggregates are maintained.
+        chunked (bool): Whether the elements are stored in a ``BlockList``.
+        metrics (DequeMetrics): The usage metrics, or None unless
+            ``enable_metrics`` was called.
     """
 
-    def __init__(self):
+    metrics = None
+
+    def __init__(self, maxlen: int = None, window: bool = False, chunked: bool = False):
         """
         Initializes an empty deque.
+
+        Arguments:
+            maxlen (int, optional): The maximum number of elements; None means unbounded.
+            window (bool): Whether to maintain the window aggregates.
+            chunked (bool): Whether to store the elements in a ``BlockList``.
         """
-        self.deque = deque()
-    
+        self.deque = BlockList(maxlen=maxlen) if chunked else deque(maxlen=maxlen)
+        self.chunked = chunked
+        self.window = window
+        if window:
+            self._reset_aggregates()
+
+    @property
+    def maxlen(self):
+        """
+        Returns the bound of the deque.
+
+        Returns:
+            int: The maximum number of elements, or None if unbounded.
+        """
+        return self.deque.maxlen
+
+    def _reset_aggregates(self):
+        """
+        Recomputes all window aggregates from the current elements.
+        """
+        self._sum = sum(self.deque)
+        self._counts = {}
+        for item in self.deque:
+            self._counts[item] = self._counts.get(item, 0) + 1
+        self._rebalance()
+
+    def _rebalance(self):
+        """
+        Rebuilds the min/max stacks, splitting the elements evenly between them.
+
+        ``_front[-1]`` aggregates the first ``len(_front)`` elements and
+        ``_back[-1]`` the remaining ones.
+        """
+        half = len(self.deque) // 2
+        self._front = []
+        self._back = []
+        for item in reversed(list(islice(self.deque, half))):
+            self._stack_push(self._front, item)
+        for item in islice(self.deque, half, None):
+            self._stack_push(self._back, item)
+
+    @staticmethod
+    def _stack_push(stack: list, item):
+        """
+        Pushes the running (min, max) including ``item`` onto a stack.
+
+        Arguments:
+            stack (list): The front or back stack.
+            item (Any): The element being added at that end.
+        """
+        if stack:
+            low, high = stack[-1]
+            stack.append((item if item < low else low, item if item > high else high))
+        else:
+            stack.append((item, item))
+
+    def _added(self, item, front: bool):
+        """
+        Updates the aggregates for an element added at one end.
+
+        Arguments:
+            item (Any): The added element.
+            front (bool): True if it was added at the front.
+        """
+        self._stack_push(self._front if front else self._back, item)
+        self._tally(item, 1)
+
+    def _tally(self, item, sign: int):
+        """
+        Adds an element to (or, with ``sign`` -1, removes it from) the sum and counts.
+
+        Arguments:
+            item (Any): The element.
+            sign (int): 1 for an added element, -1 for a removed one.
+        """
+        self._sum += sign * item
+        count = self._counts.get(item, 0) + sign
+        if count:
+            self._counts[item] = count
+        else:
+            del self._counts[item]
+
+    def _removed(self, item, front: bool):
+        """
+        Updates the aggregates for an element removed from one end.
+
+        Arguments:
+            item (Any): The removed element.
+            front (bool): True if it was removed from the front.
+        """
+        stack = self._front if front else self._back
+        if stack:
+            stack.pop()
+        else:
+            self._rebalance()  # the element was already removed from the deque
+        self._tally(item, -1)
+
     def append(self, item: Any):
         """
         Adds an element to the end of the deque.
 
+        If the deque is full, the element at the front is dropped.
+
         Arguments:
             item (Any): The element to be added to the end of the deque.
         """
+        if self.window and self.deque.maxlen is not None:
+            if not self.deque.maxlen:
+                return
+            if len(self.deque) == self.deque.maxlen:
+                self._removed(self.deque.popleft(), True)
         self.deque.append(item)
+        if self.window:
+            self._added(item, False)
 
     def appendleft(self, item: Any):
         """
         Adds an element to the front of the deque.
 
+        If the deque is full, the element at the end is dropped.
+
         Arguments:
             item (Any): The element to be added to the front of the deque.
         """
+        if self.window and self.deque.maxlen is not None:
+            if not self.deque.maxlen:
+                return
+            if len(self.deque) == self.deque.maxlen:
+                self._removed(self.deque.pop(), False)
         self.deque.appendleft(item)
+        if self.window:
+            self._added(item, True)
 
     def is_empty(self):
         """
@@ -52,7 +864,10 @@ class Deque:
         """
         if self.is_empty():
             raise IndexError("Deque is empty")
-        return self.deque.pop()
+        item = self.deque.pop()
+        if self.window:
+            self._removed(item, False)
+        return item
 
     def popleft(self):
         """
@@ -66,8 +881,116 @@ class Deque:
         """
         if self.is_empty():
             raise IndexError("Deque is empty")
-        return self.deque.popleft()
+        item = self.deque.popleft()
+        if self.window:
+            self._removed(item, True)
+        return item
     
+    def __getitem__(self, i: int):
+        """
+        Returns the element at position ``i``; O(log n) when chunked.
+
+        Arguments:
+            i (int): The index; negative values count from the end.
+
+        Exceptions:
+            IndexError: Raised if the index is out of range.
+
+        Returns:
+            Any: The element at that position.
+        """
+        return self.deque[i]
+
+    def insert(self, i: int, item: Any):
+        """
+        Inserts an element before position ``i``; O(log n) when chunked.
+
+        Arguments:
+            i (int): The position, clamped to the deque like ``list.insert``.
+            item (Any): The element to insert.
+
+        Exceptions:
+            IndexError: Raised if the deque is bounded and full.
+        """
+        self.deque.insert(i, item)
+        if self.window:
+            self._tally(item, 1)
+            self._rebalance()
+
+    def delete(self, i: int):
+        """
+        Removes and returns the element at position ``i``; O(log n) when chunked.
+
+        Arguments:
+            i (int): The index; negative values count from the end.
+
+        Exceptions:
+            IndexError: Raised if the index is out of range.
+
+        Returns:
+            Any: The removed element.
+        """
+        item = self.deque[i]
+        del self.deque[i]
+        if self.window:
+            self._tally(item, -1)
+            self._rebalance()
+        return item
+
+    def __delitem__(self, i: int):
+        """
+        Removes the element at position ``i`` (see ``delete``).
+
+        Arguments:
+            i (int): The index; negative values count from the end.
+        """
+        self.delete(i)
+
+    def split(self, i: int) -> "Deque":
+        """
+        Moves the elements from position ``i`` on into a new deque.
+
+        O(log n) when chunked, O(n - i) otherwise.
+
+        Arguments:
+            i (int): The split position, clamped to the deque.
+
+        Returns:
+            Deque: A deque with the same settings holding ``[i:]``; this deque keeps ``[:i]``.
+        """
+        other = Deque(self.maxlen, self.window, self.chunked)
+        if self.chunked:
+            other.deque = self.deque.split(i)
+        else:
+            start = slice(i, None).indices(len(self.deque))[0]
+            other.deque.extend(islice(self.deque, start, None))
+            for _ in range(len(self.deque) - start):
+                self.deque.pop()
+        if self.window:
+            self._reset_aggregates()
+            other._reset_aggregates()
+        return other
+
+    def concat(self, other: "Deque"):
+        """
+        Appends all elements of ``other``, leaving it empty.
+
+        O(log n) when both deques are chunked, O(len(other)) otherwise. If
+        the result exceeds ``maxlen``, elements are dropped from the front.
+
+        Arguments:
+            other (Deque): The deque to append.
+        """
+        if self.chunked and other.chunked:
+            self.deque.concat(other.deque)
+        else:
+            self.deque.extend(other.deque)
+            other.deque.clear()
+        if self.window:
+            self._reset_aggregates()
+        if other.window:
+            other._reset_aggregates()
+
     def index(self, item, start=None, end=None):
         """
         Finds the index of the first occurrence of an element in the deque within the specified range.
@@ -78,14 +1001,12 @@ class Deque:
             end (int, optional): The index to stop searching at (default is the length of the deque).
         
         Exceptions:
-            ValueError: Raised if the item is not found within the specified range.
+            ValueError: Raised if the item is not found within the specified range,
+                including when the deque is empty.
 
         Returns:
             int: The index of the first occurrence of the item.
         """
-        if self.is_empty():
-            raise IndexError("Deque is empty")
-        
         start = start if start is not None else 0
         end = end if end is not None else len(self.deque)
 
@@ -98,20 +1019,94 @@ class Deque:
         """
         Counts the number of occurrences of an element in the deque.
 
+        O(1) in window mode, otherwise a single pass in C.
+
         Arguments:
             item (Any): The element to count.
 
         Returns:
             int: The count of occurrences of the item.
         """
+        if self.window:
+            return self._counts.get(item, 0)
+        return self.deque.count(item)
+
+    def counts(self):
+        """
+        Returns the number of occurrences of every distinct element.
+
+        Returns:
+            dict: Elements mapped to their counts.
+        """
+        if self.window:
+            return dict(self._counts)
+        counts = {}
+        for item in self.deque:
+            counts[item] = counts.get(item, 0) + 1
+        return counts
+
+    def min(self):
+        """
+        Returns the smallest element; O(1) in window mode.
+
+        Exceptions:
+            ValueError: Raised if the deque is empty.
+
+        Returns:
+            Any: The smallest element.
+        """
         if self.is_empty():
-            return 0
-        
-        count = 0
-        for element in self.deque:
-            if element == item:
-                count += 1
-        return count
+            raise ValueError("Deque is empty")
+        if not self.window:
+            return min(self.deque)
+        if not self._front:
+            return self._back[-1][0]
+        if not self._back:
+            return self._front[-1][0]
+        return min(self._front[-1][0], self._back[-1][0])
+
+    def max(self):
+        """
+        Returns the largest element; O(1) in window mode.
+
+        Exceptions:
+            ValueError: Raised if the deque is empty.
+
+        Returns:
+            Any: The largest element.
+        """
+        if self.is_empty():
+            raise ValueError("Deque is empty")
+        if not self.window:
+            return max(self.deque)
+        if not self._front:
+            return self._back[-1][1]
+        if not self._back:
+            return self._front[-1][1]
+        return max(self._front[-1][1], self._back[-1][1])
+
+    def sum(self):
+        """
+        Returns the sum of the elements; O(1) in window mode.
+
+        Returns:
+            Any: The sum, 0 for an empty deque.
+        """
+        return self._sum if self.window else sum(self.deque)
+
+    def mean(self):
+        """
+        Returns the arithmetic mean of the elements; O(1) in window mode.
+
+        Exceptions:
+            ValueError: Raised if the deque is empty.
+
+        Returns:
+            float: The mean.
+        """
+        if self.is_empty():
+            raise ValueError("Deque is empty")
+        return self.sum() / len(self.deque)
     
     def size(self):
         """
@@ -127,6 +1122,8 @@ class Deque:
         Reverses the order of elements in the deque in place.
         """
         self.deque.reverse()
+        if self.window:
+            self._rebalance()
     
     def rotate(self, n):
         """
@@ -136,12 +1133,16 @@ class Deque:
             n (int): The number of steps to rotate the deque.
         """
         self.deque.rotate(n)
+        if self.window:
+            self._rebalance()
 
     def clear(self):
         """
         Clears all elements from the deque.
         """
         self.deque.clear()
+        if self.window:
+            self._reset_aggregates()
     
     def __iter__(self):
         """
@@ -159,4 +1160,433 @@ class Deque:
         Returns:
             str: A string representation of the deque as a list.
         """
-        return f"{list(self.deque)}"
\ No newline at end of file
+        return f"{list(self.deque)}"
+
+    def enable_metrics(self, sample_every: int = 64) -> "DequeMetrics":
+        """
+        Starts recording usage metrics for this deque.
+
+        Instrumented versions of the mutating methods (``del d[i]`` goes
+        through ``delete``) are installed on this instance only, so a deque
+        without metrics runs the plain methods at no extra cost. Unless the
+        deque keeps window aggregates, they call the backing store directly.
+        Elements carry implicit logical indices (the deque holds
+        ``left .. right - 1``), so an end operation only moves an index,
+        bumps the enqueue count and compares against a closure cell. Every
+        ``sample_every``-th inserted element gets a timestamp, kept in a
+        deque ordered by index; latency is measured whichever end an
+        element leaves from. ``insert`` and ``delete`` shift the indices,
+        so they drop the pending samples instead of re-keying them, which
+        keeps them O(log n) when chunked: elements that live across a
+        middle operation are not timed. The counters are exact; the
+        high-water mark is updated at sampled elements, by the other
+        operations and when a snapshot is taken, so a short peak can be
+        reported up to ``sample_every - 1`` elements low.
+
+        Unlike ``Queue``, whose operations take a lock, a plain end
+        operation here costs well under 100 ns, so even this bookkeeping
+        is a large fraction of it: ``bench.bench_metrics`` shows the bare
+        append/pop loops running at roughly 70% of their plain speed. Use
+        the metrics to diagnose a deque rather than leaving them on for
+        hot paths; the under-5% budget of ``Queue.enable_metrics`` does not
+        apply here.
+
+        Arguments:
+            sample_every (int): The latency sampling interval; 1 times every element.
+
+        Exceptions:
+            ValueError: Raised if ``sample_every`` is not positive.
+
+        Returns:
+            DequeMetrics: The metrics, also available as ``self.metrics``.
+        """
+        if sample_every <= 0:
+            raise ValueError("sample_every must be positive")
+        self.disable_metrics()
+
+        metrics = DequeMetrics(sample_every)
+        store = self.deque
+        if self.window:
+            append, appendleft, pop, popleft = self.append, self.appendleft, self.pop, self.popleft
+        else:
+            append, appendleft, pop, popleft = store.append, store.appendleft, store.pop, store.popleft
+        clear, reverse, rotate, size = self.clear, self.reverse, self.rotate, self.size
+        insert, delete, split, concat = self.insert, self.delete, self.split, self.concat
+        limit = self.maxlen
+        every = sample_every
+        stamps = deque()  # (logical index, insert time) of the sampled elements, by index
+        now = time.perf_counter_ns
+        record = metrics.latency.record
+        never = 1 << 62  # ints, so comparing indices with them stays on the int fast path
+        lo, hi = never, -never  # the smallest and largest index in ``stamps``
+        initial = high = size()
+        left, right = 0, initial
+        enqueued = discarded = 0
+        sample = every
+
+        def _bounds():
+            nonlocal lo, hi
+            lo, hi = (stamps[0][0], stamps[-1][0]) if stamps else (never, -never)
+
+        def _stamp(index: int, at_left: bool):
+            nonlocal sample, high
+            sample += every
+            high = max(high, right - left)
+            if left <= index < right:  # not already dropped by a zero maxlen
+                if at_left:
+                    stamps.appendleft((index, now()))
+                else:
+                    stamps.append((index, now()))
+                _bounds()
+
+        def _sampled(at_left: bool):
+            record(now() - (stamps.popleft() if at_left else stamps.pop())[1])
+            _bounds()
+
+        def _evict(at_left: bool):
+            # A full bounded deque dropped the element at the other end.
+            nonlocal left, right, discarded
+            discarded += 1
+            if at_left:
+                right -= 1
+                if right == hi:
+                    stamps.pop()
+                    _bounds()
+            else:
+                if left == lo:
+                    stamps.popleft()
+                    _bounds()
+                left += 1
+
+        def _append(item):
+            nonlocal right, enqueued
+            append(item)
+            right += 1
+            enqueued += 1
+            if enqueued == sample:
+                _stamp(right - 1, False)
+
+        def _appendleft(item):
+            nonlocal left, enqueued
+            appendleft(item)
+            left -= 1
+            enqueued += 1
+            if enqueued == sample:
+                _stamp(left, True)
+
+        def _append_bounded(item):
+            nonlocal right, enqueued
+            append(item)
+            right += 1
+            enqueued += 1
+            if right - left > limit:
+                _evict(False)
+            if enqueued == sample:
+                _stamp(right - 1, False)
+
+        def _appendleft_bounded(item):
+            nonlocal left, enqueued
+            appendleft(item)
+            left -= 1
+            enqueued += 1
+            if right - left > limit:
+                _evict(True)
+            if enqueued == sample:
+                _stamp(left, True)
+
+        def _pop():
+            nonlocal right
+            try:
+                item = pop()
+            except IndexError:
+                raise IndexError("Deque is empty") from None
+            right -= 1
+            if right == hi:
+                _sampled(False)
+            return item
+
+        def _popleft():
+            nonlocal left
+            try:
+                item = popleft()
+            except IndexError:
+                raise IndexError("Deque is empty") from None
+            if left == lo:
+                _sampled(True)
+            left += 1
+            return item
+
+        def _insert(i, item):
+            nonlocal right, enqueued, high
+            count = right - left
+            insert(i, item)
+            index = left + min(max(i + count, 0) if i < 0 else i, count)
+            # Shifting the indices of the pending samples would cost O(n /
+            # sample_every); drop them instead (each is dropped at most once).
+            stamps.clear()
+            _bounds()
+            right += 1
+            enqueued += 1
+            high = max(high, right - left)
+            if enqueued == sample:
+                _stamp(index, False)
+
+        def _delete(i):
+            nonlocal right
+            item = delete(i)
+            index = left + (i + right - left if i < 0 else i)
+            stamp = next((stamp for k, stamp in stamps if k == index), None)
+            stamps.clear()
+            _bounds()
+            right -= 1
+            if stamp is not None:
+                record(now() - stamp)
+            return item
+
+        def _split(i):
+            nonlocal right, discarded
+            other = split(i)
+            cut = left + size()
+            discarded += right - cut
+            right = cut
+            while stamps and stamps[-1][0] >= cut:
+                stamps.pop()
+            _bounds()
+            return other
+
+        def _concat(other):
+            nonlocal left, right, enqueued, discarded, high, sample
+            added = other.size()
+            concat(other)
+            enqueued += added
+            if sample <= enqueued:
+                # Concatenated elements are not timestamped; move on to the next insert.
+                sample += (enqueued - sample) // every * every + every
+            right += added
+            dropped = right - left - size()
+            if dropped:
+                discarded += dropped
+                left += dropped
+                while stamps and stamps[0][0] < left:
+                    stamps.popleft()
+                _bounds()
+            high = max(high, right - left)
+
+        def _clear():
+            nonlocal left, right, discarded, high
+            clear()
+            high = max(high, right - left)
+            discarded += right - left
+            left = right = 0
+            stamps.clear()
+            _bounds()
+
+        def _reindex(mapping):
+            entries = sorted((mapping(index), stamp) for index, stamp in stamps)
+            stamps.clear()
+            stamps.extend(entries)
+            _bounds()
+
+        def _reverse():
+            reverse()
+            _reindex(lambda k: left + right - 1 - k)
+
+        def _rotate(n):
+            rotate(n)
+            if right > left:
+                _reindex(lambda k: left + (k - left + n) % (right - left))
+
+        def _counters():
+            nonlocal high
+            depth = size()
+            high = max(high, depth)
+            return enqueued, initial + enqueued - discarded - depth, high
+
+        bounded = limit is not None
+        hooks = {"append": _append_bounded if bounded else _append,
+                 "appendleft": _appendleft_bounded if bounded else _appendleft,
+                 "pop": _pop, "popleft": _popleft, "clear": _clear, "reverse": _reverse,
+                 "rotate": _rotate, "insert": _insert, "delete": _delete, "split": _split,
+                 "concat": _concat}
+        metrics._bind(_counters, size, initial)
+        metrics.hooks = tuple(hooks)
+        for name, hook in hooks.items():
+            setattr(self, name, hook)
+        self.metrics = metrics
+        return metrics
+
+    def disable_metrics(self):
+        """
+        Stops recording metrics and restores the plain methods.
+        """
+        if self.metrics is not None:
+            for name in self.metrics.hooks:
+                delattr(self, name)
+            self.metrics = None
+
+
+class LatencyHistogram:
+    """
+    A log-linear (HDR-style) histogram of durations in nanoseconds.
+
+    Values below ``2 ** precision`` get a bucket each; larger values are
+    bucketed by their top ``precision`` bits, so every percentile is
+    reported within a relative error of ``2 ** (1 - precision)`` while
+    ``record`` stays O(1) and the bucket array has a fixed size.
+
+    Attributes:
+        precision (int): The number of significant bits kept per value.
+        counts (list): The number of values recorded in each bucket.
+        count (int): The number of recorded values.
+        total (int): The sum of the recorded values.
+        min (int): The smallest recorded value (``2 ** 64`` while empty).
+        max (int): The largest recorded value.
+    """
+
+    def __init__(self, precision: int = 7):
+        """
+        Creates an empty histogram.
+
+        Arguments:
+            precision (int): The number of significant bits kept per value.
+        """
+        self.precision = precision
+        self._sub = 1 << precision
+        self._half = self._sub >> 1
+        self.counts = [0] * (self._sub + 64 * self._half)
+        self.count = self.total = self.max = 0
+        self.min = 1 << 64
+
+    def _upper(self, index: int) -> int:
+        """
+        Returns the largest value that falls into a bucket.
+
+        Arguments:
+            index (int): The bucket index.
+
+        Returns:
+            int: The upper bound of the bucket.
+        """
+        if index < self._sub:
+            return index
+        shift, offset = divmod(index - self._sub, self._half)
+        return ((self._half + offset + 1) << (shift + 1)) - 1
+
+    def record(self, value: int):
+        """
+        Adds a duration to the histogram.
+
+        Arguments:
+            value (int): The duration in nanoseconds; negative values count as 0.
+        """
+        if value >= self._sub:
+            # ``_sub + (shift - 1) * _half + (value >> shift) - _half``, simplified.
+            shift = value.bit_length() - self.precision
+            self.counts[shift * self._half + (value >> shift)] += 1
+        else:
+            if value < 0:
+                value = 0
+            self.counts[value] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if value < self.min:
+            self.min = value
+
+    def percentile(self, q: float) -> int:
+        """
+        Returns the value below which ``q`` percent of the recorded values fall.
+
+        Arguments:
+            q (float): The percentile, between 0 and 100.
+
+        Returns:
+            int: The percentile in nanoseconds, or 0 if nothing was recorded.
+        """
+        if not self.count:
+            return 0
+        rank = max(1, -int(-q * self.count // 100))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                return min(self._upper(index), self.max)
+        return self.max
+
+    def snapshot(self) -> dict:
+        """
+        Summarises the histogram.
+
+        Returns:
+            dict: ``count`` and ``min``/``mean``/``p50``/``p90``/``p99``/
+                ``p999``/``max`` in seconds.
+        """
+        summary = {"count": self.count, "min": self.min / 1e9 if self.count else 0.0,
+                   "mean": self.total / self.count / 1e9 if self.count else 0.0}
+        for label, q in (("p50", 50), ("p90", 90), ("p99", 99), ("p999", 99.9)):
+            summary[label] = self.percentile(q) / 1e9
+        summary["max"] = self.max / 1e9
+        return summary
+
+
+class DequeMetrics:
+    """
+    Usage metrics of a deque, created by ``Deque.enable_metrics``.
+
+    Attributes:
+        sample_every (int): The latency sampling interval in elements.
+        latency (LatencyHistogram): Insert-to-remove latency of sampled elements.
+        started (float): The ``time.monotonic()`` when recording started.
+        hooks (tuple): The names of the instrumented methods.
+    """
+
+    def __init__(self, sample_every: int = 64):
+        """
+        Creates empty metrics.
+
+        Arguments:
+            sample_every (int): The latency sampling interval in elements.
+        """
+        self.sample_every = sample_every
+        self.latency = LatencyHistogram()
+        self.started = time.monotonic()
+        self.hooks = ()
+
+    def _bind(self, counters, depth, initial: int):
+        """
+        Connects the metrics to the instrumented deque.
+
+        Arguments:
+            counters (callable): Returns ``(enqueued, dequeued, high_water)``.
+            depth (callable): Returns the current number of elements.
+            initial (int): The number of elements when recording started.
+        """
+        self._counters = counters
+        self._depth = depth
+        self._initial = initial
+
+    def snapshot(self) -> dict:
+        """
+        Returns a copy of the current metrics.
+
+        Returns:
+            dict: ``depth``, ``high_water``, ``enqueued``, ``dequeued``,
+                ``discarded`` (cleared), ``elapsed`` seconds,
+                ``enqueue_rate``/``dequeue_rate`` in elements per second and
+                the ``latency`` summary from ``LatencyHistogram.snapshot``.
+        """
+        enqueued, dequeued, high_water = self._counters()
+        depth = self._depth()
+        elapsed = time.monotonic() - self.started
+        return {
+            "depth": depth,
+            "high_water": high_water,
+            "enqueued": enqueued,
+            "dequeued": dequeued,
+            "discarded": self._initial + enqueued - dequeued - depth,
+            "elapsed": elapsed,
+            "enqueue_rate": enqueued / elapsed if elapsed else 0.0,
+            "dequeue_rate": dequeued / elapsed if elapsed else 0.0,
+            "latency": self.latency.snapshot(),
+        }
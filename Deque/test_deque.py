@@ -0,0 +1,172 @@
+import importlib.util
+import os
+import random
+import sys
+import unittest
+from collections import deque
+from unittest import mock
+
+# Every package directory names its module ``exp``; load this one under a unique name.
+_spec = importlib.util.spec_from_file_location("deque_exp", os.path.join(os.path.dirname(__file__), "exp.py"))
+exp = sys.modules["deque_exp"] = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(exp)
+
+
+class TestBlockList(unittest.TestCase):
+    def setUp(self):
+        # Tiny blocks, so a few hundred elements already exercise the rope.
+        patcher = mock.patch.object(exp.BlockList, "BLOCK", 4)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_matches_list(self):
+        rng = random.Random(0)
+        blocks, expected = exp.BlockList(range(50)), list(range(50))
+        for step in range(5000):
+            op = rng.randrange(12)
+            size = len(expected)
+            if op == 0:
+                blocks.append(step)
+                expected.append(step)
+            elif op == 1:
+                blocks.appendleft(step)
+                expected.insert(0, step)
+            elif op == 2 and size:
+                self.assertEqual(blocks.pop(), expected.pop())
+            elif op == 3 and size:
+                self.assertEqual(blocks.popleft(), expected.pop(0))
+            elif op == 4 and size:
+                i = rng.randrange(-size, size)
+                self.assertEqual(blocks[i], expected[i])
+                blocks[i] = expected[i] = -step
+            elif op == 5:
+                i = rng.randint(-size - 2, size + 2)
+                blocks.insert(i, step)
+                expected.insert(i, step)
+            elif op == 6 and size:
+                i = rng.randrange(-size, size)
+                del blocks[i]
+                del expected[i]
+            elif op == 7:
+                i = rng.randint(-size - 2, size + 2)
+                other = blocks.split(i)
+                tail = expected[i:]
+                del expected[len(expected) - len(tail):]
+                self.assertEqual(list(other), tail)
+                self.assertEqual(list(blocks), expected)
+                extra = rng.randrange(10)
+                other.extend(range(extra))
+                blocks.concat(other)
+                expected += tail + list(range(extra))
+                self.assertEqual(len(other), 0)
+            elif op == 8:
+                n = rng.randint(-size - 3, size + 3)
+                blocks.rotate(n)
+                if size:
+                    n %= size
+                    expected[:] = expected[size - n:] + expected[:size - n]
+            elif op == 9 and size:
+                item = expected[rng.randrange(size)]
+                start = rng.randrange(size)
+                self.assertEqual(blocks.count(item), expected.count(item))
+                try:
+                    position = expected.index(item, start)
+                except ValueError:
+                    self.assertRaises(ValueError, blocks.index, item, start)
+                else:
+                    self.assertEqual(blocks.index(item, start), position)
+            elif op == 10 and rng.random() < 0.1:
+                blocks.reverse()
+                expected.reverse()
+            elif op == 11 and rng.random() < 0.01:
+                blocks.clear()
+                expected.clear()
+            self.assertEqual(len(blocks), len(expected))
+            if step % 100 == 0:
+                self.assertEqual(list(blocks), expected)
+        self.assertEqual(list(blocks), expected)
+
+    def test_empty(self):
+        blocks = exp.BlockList()
+        self.assertRaises(IndexError, blocks.pop)
+        self.assertRaises(IndexError, blocks.popleft)
+        self.assertRaises(IndexError, blocks.__getitem__, 0)
+        self.assertEqual(len(blocks.split(0)), 0)
+
+    def test_maxlen_matches_deque(self):
+        rng = random.Random(1)
+        blocks, expected = exp.BlockList(range(30), maxlen=20), deque(range(30), maxlen=20)
+        for step in range(2000):
+            op = rng.randrange(4)
+            if op == 0:
+                blocks.append(step)
+                expected.append(step)
+            elif op == 1:
+                blocks.appendleft(step)
+                expected.appendleft(step)
+            elif op == 2:
+                items = range(step, step + rng.randrange(30))
+                blocks.extend(items)
+                expected.extend(items)
+            else:
+                items = list(range(step, step + rng.randrange(30)))
+                blocks.concat(exp.BlockList(items))
+                expected.extend(items)
+            self.assertEqual(list(blocks), list(expected))
+
+
+class TestDeque(unittest.TestCase):
+    def test_chunked_matches_plain(self):
+        rng = random.Random(2)
+        plain, chunked = exp.Deque(window=True), exp.Deque(window=True, chunked=True)
+        for step in range(3000):
+            op = rng.randrange(6)
+            size = plain.size()
+            for d in (plain, chunked):
+                if op == 0:
+                    d.append(step % 97)
+                elif op == 1:
+                    d.appendleft(step % 89)
+                elif op == 2 and size:
+                    d.pop()
+                elif op == 3 and size:
+                    d.popleft()
+                elif op == 4:
+                    d.insert(size // 2, step % 83)
+                elif op == 5 and size:
+                    d.delete(size // 3)
+            self.assertEqual(list(plain), list(chunked))
+            if plain.size():
+                items = list(plain)
+                self.assertEqual((plain.min(), plain.max(), plain.sum()), (min(items), max(items), sum(items)))
+                self.assertEqual((chunked.min(), chunked.max(), chunked.sum()), (min(items), max(items), sum(items)))
+                self.assertEqual(chunked.count(items[0]), items.count(items[0]))
+
+    def test_sliding_window(self):
+        rng = random.Random(3)
+        values = [rng.randrange(1000) for _ in range(500)]
+        window = exp.Deque(maxlen=16, window=True)
+        for i, value in enumerate(values):
+            window.append(value)
+            recent = values[max(0, i - 15):i + 1]
+            self.assertEqual((window.min(), window.max(), window.sum()), (min(recent), max(recent), sum(recent)))
+
+    def test_metrics(self):
+        d = exp.Deque(chunked=True)
+        metrics = d.enable_metrics(sample_every=1)
+        for i in range(10):
+            d.append(i)
+        d.insert(5, "middle")
+        d.delete(0)
+        for _ in range(4):
+            d.popleft()
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["depth"], d.size())
+        self.assertEqual(snapshot["high_water"], 11)
+        d.disable_metrics()
+        d.append(0)
+        self.assertEqual(d.size(), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
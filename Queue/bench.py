@@ -0,0 +1,332 @@
+import asyncio
+import multiprocessing
+import queue
+import tempfile
+import threading
+import time
+
+from exp import AsyncQueue, PersistentQueue, Queue, SharedRingQueue
+
+SENTINEL = object()
+
+
+def run(producer, consumer, finish, producers: int, consumers: int) -> float:
+    """
+    Runs producer and consumer threads and returns the elapsed wall time.
+
+    Args:
+        producer (callable): The body of every producer thread.
+        consumer (callable): The body of every consumer thread.
+        finish (callable): Called once all producers are done, to stop the consumers.
+        producers (int): The number of producer threads.
+        consumers (int): The number of consumer threads.
+
+    Returns:
+        float: The elapsed time in seconds.
+    """
+    senders = [threading.Thread(target=producer) for _ in range(producers)]
+    receivers = [threading.Thread(target=consumer) for _ in range(consumers)]
+    start = time.perf_counter()
+    for thread in receivers + senders:
+        thread.start()
+    for thread in senders:
+        thread.join()
+    finish()
+    for thread in receivers:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def bench_stdlib(items: int, producers: int, consumers: int, maxsize: int) -> float:
+    """
+    Measures ``queue.Queue`` with single-item ``put``/``get``.
+
+    Args:
+        items (int): The total number of items to move.
+        producers (int): The number of producer threads.
+        consumers (int): The number of consumer threads.
+        maxsize (int): The queue bound.
+
+    Returns:
+        float: The elapsed time in seconds.
+    """
+    q = queue.Queue(maxsize)
+    per_producer = items // producers
+
+    def producer():
+        for i in range(per_producer):
+            q.put(i)
+
+    def consumer():
+        while q.get() is not SENTINEL:
+            pass
+
+    def finish():
+        for _ in range(consumers):
+            q.put(SENTINEL)
+
+    return run(producer, consumer, finish, producers, consumers)
+
+
+def bench_queue(items: int, producers: int, consumers: int, maxsize: int, batch: int = 0,
+                metrics: bool = False) -> float:
+    """
+    Measures ``Queue``, either item by item or with ``put_many``/``get_batch``.
+
+    Args:
+        items (int): The total number of items to move.
+        producers (int): The number of producer threads.
+        consumers (int): The number of consumer threads.
+        maxsize (int): The queue bound.
+        batch (int): The batch size, or 0 for single-item operations.
+        metrics (bool): Whether to run with ``enable_metrics``.
+
+    Returns:
+        float: The elapsed time in seconds.
+    """
+    q = Queue(maxsize)
+    if metrics:
+        q.enable_metrics()
+    per_producer = items // producers
+
+    def producer():
+        if batch:
+            for start in range(0, per_producer, batch):
+                q.put_many(range(start, min(start + batch, per_producer)))
+        else:
+            for i in range(per_producer):
+                q.enqueue(i)
+
+    def consumer():
+        if not batch:
+            while q.dequeue(block=True) is not SENTINEL:
+                pass
+            return
+        while True:
+            sentinels = q.get_batch(batch).count(SENTINEL)
+            if sentinels:
+                # Hand back the sentinels meant for other consumers.
+                q.put_many([SENTINEL] * (sentinels - 1))
+                return
+
+    def finish():
+        q.put_many([SENTINEL] * consumers)
+
+    return run(producer, consumer, finish, producers, consumers)
+
+
+def bench_mpmc(items: int = 200_000, maxsize: int = 1024, batch: int = 256,
+               configurations=((1, 1), (2, 2), (4, 4))):
+    """
+    Compares multi-producer/multi-consumer throughput of ``Queue`` and ``queue.Queue``.
+
+    Args:
+        items (int): The total number of items moved per run.
+        maxsize (int): The queue bound.
+        batch (int): The batch size used by the batched ``Queue`` run.
+        configurations (tuple): ``(producers, consumers)`` pairs to run.
+    """
+    print(f"{'P x C':>6} {'queue.Queue':>14} {'Queue':>14} {'Queue batched':>14}   (items/s)")
+    for producers, consumers in configurations:
+        stdlib = items / bench_stdlib(items, producers, consumers, maxsize)
+        single = items / bench_queue(items, producers, consumers, maxsize)
+        batched = items / bench_queue(items, producers, consumers, maxsize, batch)
+        print(f"{producers}x{consumers:<4} {stdlib:>14,.0f} {single:>14,.0f} {batched:>14,.0f}")
+
+
+async def bench_async_queue(kind: str, items: int, maxsize: int, batch: int = 0) -> float:
+    """
+    Measures one producer and one consumer task on an asyncio queue.
+
+    Args:
+        kind (str): ``"asyncio"`` for ``asyncio.Queue`` or ``"AsyncQueue"``.
+        items (int): The number of items to move.
+        maxsize (int): The queue bound.
+        batch (int): For ``AsyncQueue``, consume with ``get_batch`` of this size.
+
+    Returns:
+        float: The elapsed time in seconds.
+    """
+    if kind == "asyncio":
+        q = asyncio.Queue(maxsize)
+        put, get = q.put, q.get
+    else:
+        q = AsyncQueue(maxsize)
+        put, get = q.enqueue, q.dequeue
+
+    async def producer():
+        for i in range(items):
+            await put(i)
+
+    async def consumer():
+        received = 0
+        while received < items:
+            if batch:
+                received += len(await q.get_batch(batch))
+            else:
+                await get()
+                received += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(producer(), consumer())
+    return time.perf_counter() - start
+
+
+def bench_async(items: int = 200_000, maxsize: int = 1024, batch: int = 256):
+    """
+    Compares message throughput of ``AsyncQueue`` and ``asyncio.Queue``.
+
+    Args:
+        items (int): The number of items moved per run.
+        maxsize (int): The queue bound.
+        batch (int): The batch size used by the batched ``AsyncQueue`` run.
+    """
+    runs = [("asyncio.Queue", "asyncio", 0), ("AsyncQueue", "AsyncQueue", 0),
+            ("AsyncQueue batched", "AsyncQueue", batch)]
+    for label, kind, size in runs:
+        elapsed = asyncio.run(bench_async_queue(kind, items, maxsize, size))
+        print(f"{label:<20} {items / elapsed:>12,.0f} msg/s")
+
+
+def _ring_consumer(name: str, items: int, raw: bool):
+    """
+    Drains ``items`` messages from a ``SharedRingQueue`` in a child process.
+    """
+    ring = SharedRingQueue.attach(name, shared_tracker=True)
+    get = ring.dequeue_bytes if raw else ring.dequeue
+    for _ in range(items):
+        get(block=True)
+    ring.close()
+
+
+def _pipe_consumer(q, items: int):
+    """
+    Drains ``items`` messages from a ``multiprocessing.Queue`` in a child process.
+    """
+    for _ in range(items):
+        q.get()
+
+
+def bench_cross_process(items: int = 500_000, capacity: int = 4096, payload: int = 16):
+    """
+    Compares producer-to-consumer throughput between two processes.
+
+    Args:
+        items (int): The number of messages moved per run.
+        capacity (int): The number of ring slots.
+        payload (int): The message size in bytes.
+    """
+    message = bytes(payload)
+
+    q = multiprocessing.Queue(capacity)
+    child = multiprocessing.Process(target=_pipe_consumer, args=(q, items))
+    child.start()
+    start = time.perf_counter()
+    for _ in range(items):
+        q.put(message)
+    child.join()
+    print(f"{'multiprocessing.Queue':<28} {items / (time.perf_counter() - start):>12,.0f} msg/s")
+
+    for label, raw in (("SharedRingQueue", False), ("SharedRingQueue bytes", True)):
+        ring = SharedRingQueue(capacity, max(payload, 64))
+        put = ring.enqueue_bytes if raw else ring.enqueue
+        child = multiprocessing.Process(target=_ring_consumer, args=(ring.name, items, raw))
+        child.start()
+        start = time.perf_counter()
+        for _ in range(items):
+            put(message)
+        child.join()
+        print(f"{label:<28} {items / (time.perf_counter() - start):>12,.0f} msg/s")
+        ring.close()
+        ring.unlink()
+
+
+def bench_persistent(items: int = 20_000, batch: int = 256):
+    """
+    Compares ``PersistentQueue`` throughput under each fsync policy.
+
+    Each policy is measured with single-item operations and with
+    ``put_many``/``get_batch`` groups of ``batch`` items (one commit per
+    group). The in-memory ``Queue`` is shown for reference.
+
+    Args:
+        items (int): The number of items enqueued and then dequeued per run.
+        batch (int): The group size of the batched runs.
+    """
+    print(f"{'policy':<18} {'enqueue/s':>12} {'dequeue/s':>12}")
+    runs = [("Queue", None, 0)]
+    for sync in PersistentQueue.SYNC_POLICIES:
+        # Per-item fsync is slow enough that a fraction of the items suffices.
+        runs += [(sync, sync, 0), (f"{sync} batched", sync, batch)]
+    for label, sync, size in runs:
+        count = items // 20 if sync == "always" and not size else items
+        with tempfile.TemporaryDirectory() as path:
+            q = Queue() if sync is None else PersistentQueue(path, sync=sync)
+            start = time.perf_counter()
+            if size:
+                for offset in range(0, count, size):
+                    q.put_many(range(offset, min(count, offset + size)))
+            else:
+                for i in range(count):
+                    q.enqueue(i)
+            middle = time.perf_counter()
+            if size:
+                while not q.is_empty():
+                    q.get_batch(size, timeout=0)
+            else:
+                for _ in range(count):
+                    q.dequeue()
+            end = time.perf_counter()
+            if sync is not None:
+                q.close()
+        print(f"{label:<18} {count / (middle - start):>12,.0f} {count / (end - middle):>12,.0f}")
+
+
+def bench_metrics(items: int = 200_000, maxsize: int = 1024, repeat: int = 9):
+    """
+    Measures the overhead of ``Queue.enable_metrics``.
+
+    Each workload is timed with and without metrics, alternating the two
+    and keeping the best of ``repeat`` runs each: a producer and a consumer
+    thread (``bench_queue``), the same with ``put_many``/``get_batch``, and
+    a single-threaded enqueue/dequeue loop. The instrumentation is meant to
+    stay under 5% on each of them.
+
+    Args:
+        items (int): The number of items moved per run.
+        maxsize (int): The queue bound of the threaded run.
+        repeat (int): The number of runs per configuration.
+    """
+    def loop(metrics: bool) -> float:
+        q = Queue()
+        if metrics:
+            q.enable_metrics()
+        start = time.perf_counter()
+        for i in range(items):
+            q.enqueue(i)
+        for _ in range(items):
+            q.dequeue()
+        return time.perf_counter() - start
+
+    def threaded(metrics: bool) -> float:
+        return bench_queue(items, 1, 1, maxsize, metrics=metrics)
+
+    def batched(metrics: bool) -> float:
+        return bench_queue(items, 1, 1, maxsize, batch=256, metrics=metrics)
+
+    runs = (("1 producer x 1 consumer", threaded), ("batched, 256 per call", batched),
+            ("single-thread loop", loop))
+    for label, run_once in runs:
+        times = [(run_once(False), run_once(True)) for _ in range(repeat)]
+        plain = min(pair[0] for pair in times)
+        instrumented = min(pair[1] for pair in times)
+        print(f"{label:<26} {items / plain:>12,.0f} {items / instrumented:>12,.0f} items/s"
+              f"   overhead {instrumented / plain - 1:+.1%}")
+
+
+if __name__ == "__main__":
+    bench_mpmc()
+    bench_async()
+    bench_cross_process()
+    bench_persistent()
+    bench_metrics()
@@ -1,4 +1,24 @@
+"""
+FIFO, priority, delay, persistent, asyncio and shared-memory queues.
+
+``LatencyHistogram`` also exists, identically, in ``Deque/exp.py``, and
+``QueueMetrics`` mirrors ``DequeMetrics`` there. Each directory of this
+repository is a self-contained module imported as ``exp`` from its own
+directory, so there is no shared package to import them from; change the
+copies together.
+"""
+import asyncio
+import bisect
+import itertools
+import os
+import pickle
+import platform
+import struct
+import threading
+import time
+import zlib
 from collections import deque
+from multiprocessing import resource_tracker, shared_memory
 
 class Queue:
     """
@@ -8,44 +28,253 @@ class Queue:
     supporting standard queue operations such as enqueue, dequeue, 
     and checking if the queue is empty.
 
+    The queue is thread-safe. With ``maxsize`` set it is bounded and applies
+    backpressure: ``enqueue`` blocks while the queue is full, and consumers
+    can block in ``dequeue`` or drain several items at once with
+    ``get_batch``. Waiting is done on condition variables, and the batch
+    operations move many items per lock acquisition.
+
+    Storage is accessed only through the ``_put``, ``_get``, ``_get_many``,
+    ``_peek``, ``_items`` and ``_has_items`` hooks, which subclasses
+    (``PriorityQueue``, ``DelayQueue``) override to change the ordering.
+
     Attributes:
         queue (deque): A deque used to store queue elements.
+        maxsize (int): The maximum number of elements, or 0 for no limit.
+        mutex (threading.Lock): The lock guarding the deque.
+        not_empty (threading.Condition): Signalled when items are added.
+        not_full (threading.Condition): Signalled when items are removed.
+        metrics (QueueMetrics): The usage metrics, or None unless
+            ``enable_metrics`` was called.
     """
 
-    def __init__(self):
+    metrics = None
+
+    def __init__(self, maxsize: int = 0):
         """
         Initializes an empty queue using deque.
 
+        Args:
+            maxsize (int): The maximum number of elements the queue can hold;
+                0 or a negative value means the queue is unbounded.
+
         Attributes:
             queue (deque): The deque structure used for storing queue elements.
         """
         self.queue = deque()
+        self.maxsize = max(maxsize, 0)
+        self.mutex = threading.Lock()
+        self.not_empty = threading.Condition(self.mutex)
+        self.not_full = threading.Condition(self.mutex)
+
+    def _has_items(self):
+        """
+        Returns whether the queue holds any items (condition predicate).
+
+        Returns:
+            bool: True if the queue is not empty.
+        """
+        return bool(self.queue)
+
+    def _wait_for_items(self, block: bool, timeout: float = None):
+        """
+        Waits until an item can be dequeued; the caller must hold the lock.
+
+        Args:
+            block (bool): Whether to wait at all.
+            timeout (float, optional): The maximum number of seconds to wait.
+
+        Returns:
+            bool: True if an item can be dequeued, False otherwise.
+        """
+        if self._has_items():
+            return True
+        return block and self.not_empty.wait_for(self._has_items, timeout)
+
+    def _wait_for_space(self, block: bool, timeout: float = None):
+        """
+        Waits until a bounded queue has room for an item; the caller must hold the lock.
+
+        Args:
+            block (bool): Whether to wait at all.
+            timeout (float, optional): The maximum number of seconds to wait.
+
+        Raises:
+            IndexError: If the queue is still full when giving up.
+        """
+        if self.maxsize and len(self.queue) >= self.maxsize:
+            if not block or not self.not_full.wait_for(self._has_space, timeout):
+                raise IndexError("Queue is full")
+
+    def _put(self, item):
+        """
+        Stores an item (storage hook).
+
+        Args:
+            item (Any): The element to store.
+        """
+        self.queue.append(item)
+
+    def _put_many(self, items: list):
+        """
+        Stores several items (storage hook).
+
+        Args:
+            items (list): The elements to store.
+        """
+        self.queue.extend(items)
+
+    def _get(self):
+        """
+        Removes and returns the next item (storage hook).
+
+        Returns:
+            Any: The next element.
+        """
+        return self.queue.popleft()
+
+    def _get_many(self, max_items: int) -> list:
+        """
+        Removes and returns up to ``max_items`` available items (storage hook).
+
+        Args:
+            max_items (int): The maximum number of items to return.
+
+        Returns:
+            list: The removed elements in order.
+        """
+        popleft = self.queue.popleft
+        return [popleft() for _ in range(min(max_items, len(self.queue)))]
+
+    def _peek(self):
+        """
+        Returns the next item without removing it (storage hook).
+
+        Returns:
+            Any: The next element.
+        """
+        return self.queue[0]
+
+    def _items(self) -> list:
+        """
+        Returns the stored items in dequeue order (storage hook).
+
+        Returns:
+            list: The elements of the queue.
+        """
+        return list(self.queue)
+
+    def _has_space(self):
+        """
+        Returns whether a bounded queue can take another item (condition predicate).
+
+        Returns:
+            bool: True if the queue is below its maximum size.
+        """
+        return len(self.queue) < self.maxsize
 
-    def enqueue(self, item):
+    def enqueue(self, item, block: bool = True, timeout: float = None):
         """
         Adds an item to the end of the queue.
 
+        If the queue is bounded and full, waits for space unless ``block`` is False.
+
         Args:
             item (Any): The element to be added to the queue.
+            block (bool): Whether to wait for space in a full queue.
+            timeout (float, optional): The maximum number of seconds to wait;
+                None waits indefinitely.
+
+        Raises:
+            IndexError: If the queue is still full when giving up.
 
         Returns:
             None: This method modifies the queue in place.
         """
-        self.queue.append(item)
+        with self.not_full:
+            self._wait_for_space(block, timeout)
+            self._put(item)
+            self.not_empty.notify()
+
+    def put_many(self, items, timeout: float = None):
+        """
+        Adds several items to the end of the queue.
+
+        As many items as fit are added under a single lock acquisition; in a
+        bounded queue the call then waits for space for the rest.
+
+        Args:
+            items (Iterable): The elements to be added to the queue.
+            timeout (float, optional): The maximum number of seconds to wait
+                for space in total; None waits indefinitely.
+
+        Raises:
+            IndexError: If the queue is still full when the timeout expires.
+                Items added before that remain in the queue.
+
+        Returns:
+            None: This method modifies the queue in place.
+        """
+        items = list(items)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        start = 0
+        with self.not_full:
+            while start < len(items):
+                if self.maxsize:
+                    if len(self.queue) >= self.maxsize:
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if not self.not_full.wait_for(self._has_space, remaining):
+                            raise IndexError("Queue is full")
+                    stop = min(len(items), start + self.maxsize - len(self.queue))
+                else:
+                    stop = len(items)
+                self._put_many(items[start:stop])
+                self.not_empty.notify(stop - start)
+                start = stop
 
-    def dequeue(self):
+    def dequeue(self, block: bool = False, timeout: float = None):
         """
         Removes and returns the first item from the queue.
 
+        Args:
+            block (bool): Whether to wait for an item if the queue is empty.
+            timeout (float, optional): The maximum number of seconds to wait
+                when blocking; None waits indefinitely.
+
         Raises:
-            IndexError: If the queue is empty.
+            IndexError: If the queue is empty (after waiting, when blocking).
 
         Returns:
             Any: The element that was removed from the queue.
         """
-        if self.is_empty():
-            raise IndexError("Queue is empty")
-        return self.queue.popleft()
+        with self.not_empty:
+            if not self._wait_for_items(block, timeout):
+                raise IndexError("Queue is empty")
+            item = self._get()
+            self.not_full.notify()
+            return item
+
+    def get_batch(self, max_items: int, timeout: float = None) -> list:
+        """
+        Removes and returns up to ``max_items`` items from the front of the queue.
+
+        Waits until at least one item is available, then takes as many as are
+        queued (up to ``max_items``) under a single lock acquisition.
+
+        Args:
+            max_items (int): The maximum number of items to return.
+            timeout (float, optional): The maximum number of seconds to wait
+                for the first item; None waits indefinitely.
+
+        Returns:
+            list: The removed items in FIFO order; empty if the timeout expired.
+        """
+        with self.not_empty:
+            if not self._wait_for_items(True, timeout):
+                return []
+            items = self._get_many(max_items)
+            self.not_full.notify(len(items))
+            return items
 
     def is_empty(self):
         """
@@ -56,6 +285,15 @@ class Queue:
         """
         return not self.queue
 
+    def is_full(self):
+        """
+        Checks whether a bounded queue has reached its maximum size.
+
+        Returns:
+            bool: True if the queue is bounded and full, otherwise False.
+        """
+        return 0 < self.maxsize <= len(self.queue)
+
     def peek(self):
         """
         Returns the first item in the queue without removing it.
@@ -66,9 +304,10 @@ class Queue:
         Returns:
             Any: The first element in the queue.
         """
-        if self.is_empty():
-            raise IndexError("Queue is empty")
-        return self.queue[0]
+        with self.mutex:
+            if not self._has_items():
+                raise IndexError("Queue is empty")
+            return self._peek()
 
     def size(self):
         """
@@ -79,6 +318,12 @@ class Queue:
         """
         return len(self.queue)
 
+    def _clear(self):
+        """
+        Discards all stored items (storage hook).
+        """
+        self.queue.clear()
+
     def clear(self):
         """
         Removes all elements from the queue.
@@ -86,7 +331,217 @@ class Queue:
         Returns:
             None: This method clears the queue in place.
         """
-        self.queue.clear()
+        with self.mutex:
+            self._clear()
+            self.not_full.notify_all()
+
+    def _instrument(self, metrics: "QueueMetrics") -> dict:
+        """
+        Builds instrumented versions of the storage hooks for ``enable_metrics``.
+
+        Items leave a FIFO queue in enqueue order, so numbering them on
+        enqueue is enough: the number of the last item that left is the
+        enqueue count minus the depth, which gives the dequeue count and
+        tells whether a sampled item has left. The per-item work is one
+        counter update and one comparison on enqueue. On dequeue from the
+        plain deque storage it is one identity check against the oldest
+        sampled item still queued (an object queued several times can match
+        early; the item numbers sort that out). Other storage compares the
+        numbers on every dequeue. The high-water mark is only updated when
+        an item is sampled, by ``put_many`` and when a snapshot is taken, so
+        a short peak can be reported up to ``sample_every - 1`` items low.
+        Latency is sampled per enqueue operation: a ``put_many`` call counts
+        as one operation and only its first item is timestamped, so batched
+        producers pay for one sample per ``sample_every`` calls rather than
+        per ``sample_every`` items.
+
+        When ``enqueue``, ``dequeue`` and the storage hooks they use are the
+        plain ones, instrumented copies of ``enqueue`` and ``dequeue`` with
+        the storage calls inlined are installed as well. They save two
+        Python calls per item, which pays for the counting.
+
+        Args:
+            metrics (QueueMetrics): The metrics object to report into.
+
+        Returns:
+            dict: Hook names mapped to their instrumented versions.
+        """
+        cls = type(self)
+        plain = cls._get is Queue._get
+        put = self.queue.append if cls._put is Queue._put else self._put
+        get = self.queue.popleft if plain else self._get
+        put_many, get_many, clear = self._put_many, self._get_many, self._clear
+        depth = self.queue.__len__ if cls.size is Queue.size else self.size
+        every = metrics.sample_every
+        stamps = deque()  # (number, item, stamp) of the sampled items still queued
+        now = time.perf_counter_ns
+        record = metrics.latency.record
+        never = 1 << 62  # an int, so comparing numbers with it stays on the int fast path
+        nothing = object()
+        initial = high = depth()
+        # Items are numbered from 1 in enqueue order (those already queued get
+        # numbers up to 0); ``enqueued`` is the last number handed out, and
+        # the last number that left the queue is ``enqueued - depth()``.
+        # ``sample`` is the number at which the next operation is sampled;
+        # ``due`` and ``due_item`` are the number and item of the oldest
+        # sampled item still queued.
+        enqueued = cleared = 0
+        sample = every
+        due, due_item = never, nothing
+
+        def _stamp(number: int, item):
+            nonlocal sample, due, due_item, high
+            high = max(high, depth())
+            stamps.append((number, item, now()))
+            if due is never:
+                due, due_item = number, item
+            sample = enqueued + every
+
+        def _sampled():
+            nonlocal due, due_item
+            position = enqueued - depth()
+            if position >= due:
+                stamp = now()
+                while position >= due:
+                    record(stamp - stamps.popleft()[2])
+                    due, due_item = stamps[0][:2] if stamps else (never, nothing)
+
+        def _put(item):
+            nonlocal enqueued
+            put(item)
+            enqueued += 1
+            if enqueued == sample:
+                _stamp(enqueued, item)
+
+        def _put_many(items):
+            nonlocal enqueued, high, sample
+            put_many(items)
+            count = len(items)
+            if count:
+                enqueued += count
+                sample += count - 1  # the call counts as one operation
+                if enqueued >= sample:
+                    _stamp(enqueued - count + 1, items[0])
+                else:
+                    high = max(high, depth())
+
+        def _get_plain():
+            item = get()
+            if item is due_item:
+                _sampled()
+            return item
+
+        def _get():
+            item = get()
+            if enqueued - depth() >= due:
+                _sampled()
+            return item
+
+        def _get_many(max_items):
+            items = get_many(max_items)
+            if enqueued - depth() >= due:
+                _sampled()
+            return items
+
+        def _clear():
+            nonlocal cleared, due, due_item, high
+            size = depth()
+            high = max(high, size)
+            cleared += size
+            stamps.clear()
+            due, due_item = never, nothing
+            clear()
+
+        def _counters():
+            nonlocal high
+            size = depth()
+            high = max(high, size)
+            return enqueued, enqueued - size + initial - cleared, high
+
+        hooks = {"_put": _put, "_put_many": _put_many, "_get": _get_plain if plain else _get,
+                 "_get_many": _get_many, "_clear": _clear}
+        metrics._bind(_counters, depth, self.mutex)
+        inlined = ("enqueue", "dequeue", "_put", "_get", "_has_items", "_wait_for_items", "_wait_for_space")
+        if any(getattr(cls, name) is not getattr(Queue, name) for name in inlined):
+            return hooks
+
+        queue, not_empty, not_full = self.queue, self.not_empty, self.not_full
+        wait_for_items, wait_for_space = self._wait_for_items, self._wait_for_space
+
+        def enqueue(item, block: bool = True, timeout: float = None):
+            nonlocal enqueued
+            with not_full:
+                if self.maxsize:
+                    wait_for_space(block, timeout)
+                put(item)
+                enqueued += 1
+                if enqueued == sample:
+                    _stamp(enqueued, item)
+                not_empty.notify()
+
+        def dequeue(block: bool = False, timeout: float = None):
+            with not_empty:
+                if not queue and not wait_for_items(block, timeout):
+                    raise IndexError("Queue is empty")
+                item = get()
+                if item is due_item:
+                    _sampled()
+                not_full.notify()
+                return item
+
+        hooks.update(enqueue=enqueue, dequeue=dequeue)
+        return hooks
+
+    def enable_metrics(self, sample_every: int = 64) -> "QueueMetrics":
+        """
+        Starts recording usage metrics for this queue.
+
+        Instrumented storage hooks (and, where possible, ``enqueue`` and
+        ``dequeue``) are installed on this instance only, so a queue without
+        metrics runs exactly the uninstrumented code. Every
+        ``sample_every``-th enqueue operation (an item, or a whole
+        ``put_many`` call) is timestamped for the latency histogram.
+        The enqueue and dequeue counters are exact; the high-water mark is
+        checked at sampled items (see ``_instrument``), which keeps the
+        overhead of ``bench.bench_metrics`` under 5%.
+
+        Args:
+            sample_every (int): The latency sampling interval; 1 times every item.
+
+        Raises:
+            ValueError: If ``sample_every`` is not positive.
+
+        Returns:
+            QueueMetrics: The metrics, also available as ``self.metrics``.
+        """
+        if sample_every <= 0:
+            raise ValueError("sample_every must be positive")
+        with self.mutex:
+            if self.metrics is not None:
+                self._disable_metrics()
+            metrics = QueueMetrics(sample_every)
+            hooks = self._instrument(metrics)
+            for name, hook in hooks.items():
+                setattr(self, name, hook)
+            metrics.hooks = tuple(hooks)
+            self.metrics = metrics
+            return metrics
+
+    def _disable_metrics(self):
+        """
+        Removes the instrumented hooks; the caller must hold the lock.
+        """
+        for name in self.metrics.hooks:
+            delattr(self, name)
+        self.metrics = None
+
+    def disable_metrics(self):
+        """
+        Stops recording metrics and restores the uninstrumented hooks.
+        """
+        with self.mutex:
+            if self.metrics is not None:
+                self._disable_metrics()
 
     def __repr__(self):
         """
@@ -98,7 +553,7 @@ class Queue:
         Returns:
             str: A string that shows the current elements of the queue.
         """
-        return f"Queue({list(self.queue)})"
+        return f"{type(self).__name__}({self._items()})"
 
     def __str__(self):
         """
@@ -109,4 +564,1844 @@ class Queue:
         Returns:
             str: A string showing the elements of the queue.
         """
-        return f"{list(self.queue)}"
+        return f"{self._items()}"
+
+
+class AsyncQueue:
+    """
+    An asyncio-native FIFO queue with the same interface as ``Queue``.
+
+    ``enqueue`` and ``dequeue`` are coroutines that wait while the queue is
+    full or empty; ``peek``, ``size`` and ``clear`` are plain methods. When
+    an operation can complete immediately no future is created: waiters
+    are only allocated for callers that actually have to wait.
+    ``get_batch`` waits for a batch to fill up (or a linger timeout to
+    pass) so that downstream I/O can be batched.
+
+    The queue is meant to be used from a single event loop and is not
+    thread-safe.
+
+    Attributes:
+        queue (deque): A deque used to store queue elements.
+        maxsize (int): The maximum number of elements, or 0 for no limit.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        """
+        Initializes an empty asynchronous queue.
+
+        Args:
+            maxsize (int): The maximum number of elements the queue can hold;
+                0 or a negative value means the queue is unbounded.
+        """
+        self.queue = deque()
+        self.maxsize = max(maxsize, 0)
+        self._getters = deque()
+        self._putters = deque()
+
+    @staticmethod
+    def _wakeup_next(waiters: deque):
+        """
+        Wakes up the first waiter that is still waiting.
+
+        Args:
+            waiters (deque): The futures of the waiting coroutines.
+        """
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    async def _wait(self, waiters: deque, timeout: float = None):
+        """
+        Parks the current coroutine until it is woken up or the timeout expires.
+
+        Args:
+            waiters (deque): The deque to register the waiter in.
+            timeout (float, optional): The maximum number of seconds to wait.
+
+        Returns:
+            bool: True if woken up, False if the timeout expired.
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # We were woken up but will not act on it; pass the wake-up on.
+                self._wakeup_next(waiters)
+            raise
+        finally:
+            try:
+                waiters.remove(waiter)
+            except ValueError:
+                pass
+
+    def _full(self):
+        """
+        Returns whether a bounded queue has reached its maximum size.
+
+        Returns:
+            bool: True if the queue is bounded and full.
+        """
+        return 0 < self.maxsize <= len(self.queue)
+
+    async def enqueue(self, item, timeout: float = None):
+        """
+        Adds an item to the end of the queue, waiting for space if it is full.
+
+        Args:
+            item (Any): The element to be added to the queue.
+            timeout (float, optional): The maximum number of seconds to wait;
+                None waits indefinitely.
+
+        Raises:
+            IndexError: If the queue is still full when the timeout expires.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._full():
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if not await self._wait(self._putters, remaining):
+                raise IndexError("Queue is full")
+        self.enqueue_nowait(item)
+
+    def enqueue_nowait(self, item):
+        """
+        Adds an item to the end of the queue without waiting.
+
+        Args:
+            item (Any): The element to be added to the queue.
+
+        Raises:
+            IndexError: If the queue is full.
+        """
+        if self._full():
+            raise IndexError("Queue is full")
+        self.queue.append(item)
+        if self._getters:
+            self._wakeup_next(self._getters)
+
+    async def dequeue(self, timeout: float = None):
+        """
+        Removes and returns the first item, waiting for one if the queue is empty.
+
+        Args:
+            timeout (float, optional): The maximum number of seconds to wait;
+                None waits indefinitely.
+
+        Raises:
+            IndexError: If the queue is still empty when the timeout expires.
+
+        Returns:
+            Any: The element that was removed from the queue.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.queue:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if not await self._wait(self._getters, remaining):
+                raise IndexError("Queue is empty")
+        return self.dequeue_nowait()
+
+    def dequeue_nowait(self):
+        """
+        Removes and returns the first item without waiting.
+
+        Raises:
+            IndexError: If the queue is empty.
+
+        Returns:
+            Any: The element that was removed from the queue.
+        """
+        if not self.queue:
+            raise IndexError("Queue is empty")
+        item = self.queue.popleft()
+        if self._putters:
+            self._wakeup_next(self._putters)
+        return item
+
+    async def get_batch(self, max_items: int, linger: float = 0.0, timeout: float = None) -> list:
+        """
+        Removes and returns up to ``max_items`` items from the front of the queue.
+
+        Waits up to ``timeout`` for the first item, then keeps collecting
+        items until ``max_items`` have been taken or ``linger`` seconds have
+        passed, whichever comes first. Items are removed as soon as they are
+        available, so other consumers cannot take them while the batch
+        lingers and producers blocked on a full queue can continue. If the
+        caller is cancelled while lingering, the collected items are put
+        back at the front of the queue in their original order.
+
+        Args:
+            max_items (int): The maximum number of items to return.
+            linger (float): How long to wait for the batch to fill up after
+                the first item is available, in seconds.
+            timeout (float, optional): The maximum number of seconds to wait
+                for the first item; None waits indefinitely.
+
+        Returns:
+            list: The removed items in FIFO order; empty if the timeout expired.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.queue:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if not await self._wait(self._getters, remaining):
+                return []
+
+        items = []
+        self._take(items, max_items)
+        linger_deadline = time.monotonic() + linger
+        try:
+            while len(items) < max_items:
+                remaining = linger_deadline - time.monotonic()
+                if remaining <= 0 or not await self._wait(self._getters, remaining):
+                    break
+                self._take(items, max_items)
+        except asyncio.CancelledError:
+            # Hand the batch back so a cancelled caller loses nothing.
+            self.queue.extendleft(reversed(items))
+            self._wakeup_next(self._getters)
+            raise
+
+        if self.queue and self._getters:
+            # The wake-up that brought these items may have been meant for
+            # another consumer; pass it on for whatever the batch left behind.
+            self._wakeup_next(self._getters)
+        return items
+
+    def _take(self, items: list, max_items: int):
+        """
+        Moves queued items into a batch until it holds ``max_items``.
+
+        Args:
+            items (list): The batch to extend.
+            max_items (int): The maximum size of the batch.
+        """
+        count = min(max_items - len(items), len(self.queue))
+        popleft = self.queue.popleft
+        items.extend(popleft() for _ in range(count))
+        for _ in range(min(count, len(self._putters))):
+            self._wakeup_next(self._putters)
+
+    def is_empty(self):
+        """
+        Checks whether the queue is empty.
+
+        Returns:
+            bool: True if the queue is empty, otherwise False.
+        """
+        return not self.queue
+
+    def peek(self):
+        """
+        Returns the first item in the queue without removing it.
+
+        Raises:
+            IndexError: If the queue is empty.
+
+        Returns:
+            Any: The first element in the queue.
+        """
+        if not self.queue:
+            raise IndexError("Queue is empty")
+        return self.queue[0]
+
+    def size(self):
+        """
+        Returns the number of elements in the queue.
+
+        Returns:
+            int: The number of elements in the queue.
+        """
+        return len(self.queue)
+
+    def clear(self):
+        """
+        Removes all elements from the queue and wakes up waiting producers.
+        """
+        self.queue.clear()
+        while self._putters:
+            self._wakeup_next(self._putters)
+
+    def __repr__(self):
+        """
+        Returns a string representation of the queue.
+
+        Returns:
+            str: A string that shows the current elements of the queue.
+        """
+        return f"AsyncQueue({list(self.queue)})"
+
+    def __str__(self):
+        """
+        Returns a user-friendly string representation of the queue.
+
+        Returns:
+            str: A string showing the elements of the queue.
+        """
+        return f"{list(self.queue)}"
+
+
+class HeapEntry:
+    """
+    A queued item in a ``PriorityQueue`` or ``DelayQueue``.
+
+    Entries are returned by ``enqueue`` and act as handles for cancelling or
+    re-prioritizing the item. Each entry records its current position in the
+    heap, so it can be found without scanning.
+
+    Attributes:
+        key (Any): The priority or due time; smaller keys are dequeued first.
+        seq (int): The insertion sequence number, which breaks ties in FIFO order.
+        item (Any): The queued element.
+        index (int): The position of the entry in the heap, or -1 once it has
+            left the queue.
+    """
+
+    __slots__ = ("key", "seq", "item", "index")
+
+    def __init__(self, key, seq: int, item):
+        """
+        Initializes an entry that is not yet in a heap.
+
+        Args:
+            key (Any): The priority or due time.
+            seq (int): The insertion sequence number.
+            item (Any): The queued element.
+        """
+        self.key = key
+        self.seq = seq
+        self.item = item
+        self.index = -1
+
+    def __lt__(self, other):
+        """
+        Orders entries by key, then by insertion order.
+
+        Args:
+            other (HeapEntry): The entry to compare with.
+
+        Returns:
+            bool: True if this entry is dequeued before ``other``.
+        """
+        return self.key < other.key or (self.key == other.key and self.seq < other.seq)
+
+    def __repr__(self):
+        """
+        Returns a string representation of the entry.
+
+        Returns:
+            str: The key and item of the entry.
+        """
+        return f"HeapEntry(key={self.key!r}, item={self.item!r})"
+
+
+class _HeapQueue(Queue):
+    """
+    A ``Queue`` whose storage is an indexed binary min-heap of ``HeapEntry`` objects.
+
+    Every entry tracks its heap position, so removing an arbitrary entry or
+    changing its key is O(log n) instead of requiring an O(n) search.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        """
+        Initializes an empty heap-backed queue.
+
+        Args:
+            maxsize (int): The maximum number of elements the queue can hold;
+                0 or a negative value means the queue is unbounded.
+        """
+        super().__init__(maxsize)
+        self.queue = []
+        self._counter = itertools.count()
+
+    def _sift_up(self, index: int):
+        """
+        Moves the entry at ``index`` up until its parent is not larger.
+
+        Args:
+            index (int): The heap position of the entry.
+        """
+        heap = self.queue
+        entry = heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if not entry < heap[parent]:
+                break
+            heap[index] = heap[parent]
+            heap[index].index = index
+            index = parent
+        heap[index] = entry
+        entry.index = index
+
+    def _sift_down(self, index: int):
+        """
+        Moves the entry at ``index`` down until no child is smaller.
+
+        Args:
+            index (int): The heap position of the entry.
+        """
+        heap = self.queue
+        size = len(heap)
+        entry = heap[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < entry:
+                break
+            heap[index] = heap[child]
+            heap[index].index = index
+            index = child
+        heap[index] = entry
+        entry.index = index
+
+    def _push(self, key, item) -> HeapEntry:
+        """
+        Adds an item to the heap with the given key.
+
+        Args:
+            key (Any): The priority or due time.
+            item (Any): The element to add.
+
+        Returns:
+            HeapEntry: The handle of the new entry.
+        """
+        entry = HeapEntry(key, next(self._counter), item)
+        self.queue.append(entry)
+        self._sift_up(len(self.queue) - 1)
+        return entry
+
+    def _remove(self, entry: HeapEntry):
+        """
+        Removes an entry from any position of the heap.
+
+        Args:
+            entry (HeapEntry): The entry to remove; it must be in this heap.
+        """
+        heap = self.queue
+        index = entry.index
+        last = heap.pop()
+        if last is not entry:
+            heap[index] = last
+            last.index = index
+            self._sift_up(index)
+            self._sift_down(last.index)
+        entry.index = -1
+
+    def _owns(self, entry: HeapEntry):
+        """
+        Checks whether a handle refers to an entry still queued in this queue.
+
+        Args:
+            entry (HeapEntry): The handle to check.
+
+        Returns:
+            bool: True if the entry is in this queue's heap.
+        """
+        return 0 <= entry.index < len(self.queue) and self.queue[entry.index] is entry
+
+    def _rekey(self, entry: HeapEntry, key):
+        """
+        Changes the key of a queued entry and restores the heap order.
+
+        Args:
+            entry (HeapEntry): The entry to update.
+            key (Any): The new key.
+        """
+        old_key, entry.key = entry.key, key
+        if key < old_key:
+            self._sift_up(entry.index)
+        else:
+            self._sift_down(entry.index)
+
+    def _get(self):
+        """
+        Removes and returns the item with the smallest key.
+
+        Returns:
+            Any: The next element.
+        """
+        entry = self.queue[0]
+        self._remove(entry)
+        return entry.item
+
+    def _get_many(self, max_items: int) -> list:
+        """
+        Removes and returns up to ``max_items`` items in key order.
+
+        Args:
+            max_items (int): The maximum number of items to return.
+
+        Returns:
+            list: The removed elements in order.
+        """
+        return [self._get() for _ in range(min(max_items, len(self.queue)))]
+
+    def _peek(self):
+        """
+        Returns the item with the smallest key without removing it.
+
+        Returns:
+            Any: The next element.
+        """
+        return self.queue[0].item
+
+    def _items(self) -> list:
+        """
+        Returns the stored items in dequeue order.
+
+        Returns:
+            list: The elements of the queue.
+        """
+        return [entry.item for entry in sorted(self.queue)]
+
+    def cancel(self, handle: HeapEntry):
+        """
+        Removes a queued item by its handle in O(log n).
+
+        Args:
+            handle (HeapEntry): The handle returned by ``enqueue``.
+
+        Returns:
+            bool: True if the item was removed, False if it had already left the queue.
+        """
+        with self.mutex:
+            if not self._owns(handle):
+                return False
+            self._remove(handle)
+            self.not_full.notify()
+            return True
+
+    def _clear(self):
+        """
+        Discards all entries and invalidates their handles.
+        """
+        for entry in self.queue:
+            entry.index = -1
+        self.queue.clear()
+
+    def _instrument(self, metrics: "QueueMetrics") -> dict:
+        """
+        Builds instrumented heap hooks for ``enable_metrics``.
+
+        Items do not leave a heap in enqueue order, so sampled entries are
+        timestamped by their sequence number and looked up on removal.
+
+        Args:
+            metrics (QueueMetrics): The metrics object to report into.
+
+        Returns:
+            dict: Hook names mapped to their instrumented versions.
+        """
+        push, get, remove, clear = self._push, self._get, self._remove, self._clear
+        heap = self.queue
+        every = metrics.sample_every
+        stamps = {}
+        now = time.perf_counter_ns
+        record = metrics.latency.record
+        enqueued = dequeued = 0
+        high = len(heap)
+
+        def _push(key, item):
+            nonlocal enqueued, high
+            entry = push(key, item)
+            enqueued += 1
+            if not entry.seq % every:
+                stamps[entry.seq] = now()
+            if len(heap) > high:
+                high = len(heap)
+            return entry
+
+        def _get():
+            nonlocal dequeued
+            stamp = stamps.pop(heap[0].seq, None) if stamps else None
+            item = get()
+            dequeued += 1
+            if stamp is not None:
+                record(now() - stamp)
+            return item
+
+        def _remove(entry):
+            remove(entry)
+            stamps.pop(entry.seq, None)  # cancelled; no-op for dequeued entries
+
+        def _clear():
+            stamps.clear()
+            clear()
+
+        metrics._bind(lambda: (enqueued, dequeued, high), heap.__len__, self.mutex)
+        return {"_push": _push, "_get": _get, "_remove": _remove, "_clear": _clear}
+
+
+class PriorityQueue(_HeapQueue):
+    """
+    A thread-safe priority queue.
+
+    Items with the smallest priority value are dequeued first; items with
+    equal priority come out in insertion order. ``enqueue`` returns a
+    handle that can be passed to ``decrease_key`` or ``cancel``. Enqueue,
+    dequeue, cancel and re-prioritizing are O(log n) and peek is O(1).
+    Bounding, blocking and batching work as in ``Queue``.
+    """
+
+    def enqueue(self, item, block: bool = True, timeout: float = None, *, priority=0) -> HeapEntry:
+        """
+        Adds an item with the given priority.
+
+        ``block`` and ``timeout`` keep their positions from ``Queue.enqueue``,
+        so ``priority`` is keyword-only.
+
+        Args:
+            item (Any): The element to be added to the queue.
+            block (bool): Whether to wait for space in a full queue.
+            timeout (float, optional): The maximum number of seconds to wait;
+                None waits indefinitely.
+            priority (Any): The priority; smaller values are dequeued first.
+
+        Raises:
+            IndexError: If the queue is still full when giving up.
+
+        Returns:
+            HeapEntry: The handle of the queued item.
+        """
+        with self.not_full:
+            self._wait_for_space(block, timeout)
+            handle = self._push(priority, item)
+            self.not_empty.notify()
+            return handle
+
+    def _put(self, item):
+        """
+        Stores an item at the default priority 0 (used by ``put_many``).
+
+        Args:
+            item (Any): The element to store.
+        """
+        self._push(0, item)
+
+    def _put_many(self, items: list):
+        """
+        Stores several items at the default priority 0.
+
+        Args:
+            items (list): The elements to store.
+        """
+        for item in items:
+            self._push(0, item)
+
+    def decrease_key(self, handle: HeapEntry, priority):
+        """
+        Moves a queued item to a new priority in O(log n).
+
+        The new priority is usually smaller (more urgent), but larger values
+        are accepted as well. Among equal priorities the item keeps its
+        original insertion order.
+
+        Args:
+            handle (HeapEntry): The handle returned by ``enqueue``.
+            priority (Any): The new priority.
+
+        Returns:
+            bool: True if the item was updated, False if it had already left the queue.
+        """
+        with self.mutex:
+            if not self._owns(handle):
+                return False
+            self._rekey(handle, priority)
+            return True
+
+
+class DelayQueue(_HeapQueue):
+    """
+    A thread-safe queue whose items become visible only after a delay.
+
+    Items are ordered by due time (``time.monotonic()`` plus the delay) and
+    items due at the same time come out in insertion order. ``dequeue``
+    with ``block=True`` and ``get_batch`` sleep until the earliest item is
+    due, waking up early if an earlier item is enqueued. ``enqueue`` returns
+    a handle that can be passed to ``reschedule`` or ``cancel``; all of
+    these operations are O(log n).
+
+    ``size()`` and ``is_empty()`` count all queued items, due or not;
+    ``peek`` and ``dequeue`` only see items that are due.
+    """
+
+    def enqueue(self, item, block: bool = True, timeout: float = None, *, delay: float = 0.0) -> HeapEntry:
+        """
+        Adds an item that becomes visible after ``delay`` seconds.
+
+        ``block`` and ``timeout`` keep their positions from ``Queue.enqueue``,
+        so ``delay`` is keyword-only.
+
+        Args:
+            item (Any): The element to be added to the queue.
+            block (bool): Whether to wait for space in a full queue.
+            timeout (float, optional): The maximum number of seconds to wait;
+                None waits indefinitely.
+            delay (float): The number of seconds until the item is due.
+
+        Raises:
+            IndexError: If the queue is still full when giving up.
+
+        Returns:
+            HeapEntry: The handle of the queued item.
+        """
+        with self.not_full:
+            self._wait_for_space(block, timeout)
+            handle = self._push(time.monotonic() + delay, item)
+            self.not_empty.notify_all()
+            return handle
+
+    def _put(self, item):
+        """
+        Stores an item that is due immediately.
+
+        Args:
+            item (Any): The element to store.
+        """
+        self._push(time.monotonic(), item)
+
+    def _put_many(self, items: list):
+        """
+        Stores several items that are due immediately (used by ``put_many``).
+
+        Args:
+            items (list): The elements to store.
+        """
+        now = time.monotonic()
+        for item in items:
+            self._push(now, item)
+
+    def _has_items(self):
+        """
+        Returns whether the earliest item is due.
+
+        Returns:
+            bool: True if an item can be dequeued now.
+        """
+        return bool(self.queue) and self.queue[0].key <= time.monotonic()
+
+    def _wait_for_items(self, block: bool, timeout: float = None):
+        """
+        Waits until the earliest item is due; the caller must hold the lock.
+
+        Sleeps until the due time of the current head, and re-checks whenever
+        the queue is notified, so newly enqueued earlier items are noticed.
+
+        Args:
+            block (bool): Whether to wait at all.
+            timeout (float, optional): The maximum number of seconds to wait.
+
+        Returns:
+            bool: True if an item can be dequeued, False otherwise.
+        """
+        if self._has_items():
+            return True
+        if not block:
+            return False
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            if self.queue and self.queue[0].key <= now:
+                return True
+            wait = self.queue[0].key - now if self.queue else None
+            if deadline is not None:
+                if now >= deadline:
+                    return False
+                wait = deadline - now if wait is None else min(wait, deadline - now)
+            self.not_empty.wait(wait)
+
+    def _get_many(self, max_items: int) -> list:
+        """
+        Removes and returns up to ``max_items`` items that are due.
+
+        Args:
+            max_items (int): The maximum number of items to return.
+
+        Returns:
+            list: The removed elements in due order.
+        """
+        items = []
+        now = time.monotonic()
+        while self.queue and len(items) < max_items and self.queue[0].key <= now:
+            items.append(self._get())
+        return items
+
+    def reschedule(self, handle: HeapEntry, delay: float):
+        """
+        Changes when a queued item becomes due, in O(log n).
+
+        Args:
+            handle (HeapEntry): The handle returned by ``enqueue``.
+            delay (float): The new number of seconds from now until the item is due.
+
+        Returns:
+            bool: True if the item was rescheduled, False if it had already left the queue.
+        """
+        with self.mutex:
+            if not self._owns(handle):
+                return False
+            self._rekey(handle, time.monotonic() + delay)
+            self.not_empty.notify_all()
+            return True
+
+
+class PersistentQueue(Queue):
+    """
+    A durable, disk-spilling FIFO queue backed by a segmented write-ahead log.
+
+    Every enqueued item is pickled and appended to the current log segment
+    (``<first sequence number>.log`` in ``path``); a new segment is started
+    every ``segment_items`` records. The sequence number of the next item to
+    dequeue is kept in a small ``head`` file. Only up to ``memory_items``
+    items are held in memory; the rest stay on disk and are read back in
+    batches as the in-memory window drains, so backlogs larger than RAM are
+    fine. Opening an existing directory recovers the queue: the last
+    segment is scanned and truncated at the first torn or corrupt record
+    (each record carries its length and a CRC-32), and dequeuing resumes
+    from the stored head.
+
+    ``sync`` chooses the durability/throughput trade-off:
+
+    * ``"always"``: the log and head are fsynced after every operation;
+      nothing acknowledged is lost on power failure.
+    * ``"batch"`` (group commit): writes are buffered and fsynced together
+      once ``sync_items`` operations or ``sync_interval`` seconds have
+      accumulated, the latter enforced by a timer even if the queue goes
+      idle; ``put_many`` and ``get_batch`` always commit as one group. A
+      crash loses at most the last uncommitted group.
+    * ``"none"``: every operation is handed to the OS but never fsynced;
+      this survives a process crash but not an OS crash.
+
+    Delivery is at-least-once: items dequeued after the last commit of the
+    head come out again after a crash. ``compact`` (also run whenever a new
+    segment is started) deletes segments whose items have all been dequeued.
+
+    The queue is unbounded; the disk is the buffer.
+
+    Attributes:
+        path (str): The directory holding the log segments and head file.
+        sync (str): The fsync policy, ``"always"``, ``"batch"`` or ``"none"``.
+        head (int): The sequence number of the next item to dequeue.
+        tail (int): The sequence number the next enqueued item will get.
+    """
+
+    SYNC_POLICIES = ("always", "batch", "none")
+    RECORD = struct.Struct("<II")  # payload length, CRC-32 of the payload
+    HEAD = struct.Struct("<Q")
+
+    def __init__(self, path: str, sync: str = "batch", sync_items: int = 256,
+                 sync_interval: float = 0.05, segment_items: int = 4096, memory_items: int = 1024):
+        """
+        Opens (or creates) a persistent queue in ``path`` and recovers its contents.
+
+        Args:
+            path (str): The directory for the log; created if missing.
+            sync (str): The fsync policy, ``"always"``, ``"batch"`` or ``"none"``.
+            sync_items (int): For ``"batch"``, the number of operations per commit.
+            sync_interval (float): For ``"batch"``, the maximum number of seconds
+                between commits.
+            segment_items (int): The number of records per log segment.
+            memory_items (int): The maximum number of items kept in memory.
+
+        Raises:
+            ValueError: If ``sync`` is unknown or a size is not positive.
+        """
+        if sync not in self.SYNC_POLICIES:
+            raise ValueError(f"sync must be one of {self.SYNC_POLICIES}, got {sync!r}")
+        if segment_items <= 0 or memory_items <= 0 or sync_items <= 0:
+            raise ValueError("Segment, memory and sync sizes must be positive")
+        super().__init__()
+        self.path = path
+        self.sync = sync
+        self.sync_items = sync_items
+        self.sync_interval = sync_interval
+        self.segment_items = segment_items
+        self.memory_items = memory_items
+        self._pending = 0
+        self._synced_at = time.monotonic()
+        self._log_dirty = False
+        self._timer = None
+        self._recover()
+
+    def _segment_path(self, base: int) -> str:
+        """
+        Returns the file name of the segment starting at sequence number ``base``.
+
+        Args:
+            base (int): The sequence number of the first record in the segment.
+
+        Returns:
+            str: The path of the segment file.
+        """
+        return os.path.join(self.path, f"{base:020d}.log")
+
+    def _scan(self, base: int, limit: int = None):
+        """
+        Walks the valid records of a segment.
+
+        Args:
+            base (int): The segment to scan.
+            limit (int, optional): Stop after this many records.
+
+        Returns:
+            tuple: ``(count, offset)``, the number of valid records read and
+                the byte offset just past the last of them.
+        """
+        count = offset = 0
+        with open(self._segment_path(base), "rb") as file:
+            while limit is None or count < limit:
+                header = file.read(self.RECORD.size)
+                if len(header) < self.RECORD.size:
+                    break
+                length, crc = self.RECORD.unpack(header)
+                payload = file.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                count += 1
+                offset += self.RECORD.size + length
+        return count, offset
+
+    def _recover(self):
+        """
+        Loads the head and the segment list from disk and repairs the last segment.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        self._head_fd = os.open(os.path.join(self.path, "head"), os.O_RDWR | os.O_CREAT, 0o644)
+        stored = os.pread(self._head_fd, self.HEAD.size, 0)
+        head = self.HEAD.unpack(stored)[0] if len(stored) == self.HEAD.size else 0
+
+        self._segments = sorted(int(name[:-4]) for name in os.listdir(self.path) if name.endswith(".log"))
+        if not self._segments:
+            self._segments = [head]
+            open(self._segment_path(head), "wb").close()
+
+        # Only the segment being written when the process stopped can be torn.
+        last = self._segments[-1]
+        self._segment_count, self._write_offset = self._scan(last)
+        with open(self._segment_path(last), "r+b") as file:
+            file.truncate(self._write_offset)
+        self.tail = last + self._segment_count
+        self.head = self._written_head = min(max(head, self._segments[0]), self.tail)
+
+        base = self._segments[bisect.bisect_right(self._segments, self.head) - 1]
+        self._read_base = base
+        self._read_offset = self._scan(base, self.head - base)[1]
+        self._loaded = self.head
+        self._writer = open(self._segment_path(last), "ab")
+        self._fill()
+
+    def _read(self, count: int, base: int, offset: int) -> tuple:
+        """
+        Reads up to ``count`` payloads starting at a log position.
+
+        Args:
+            count (int): The maximum number of payloads to read.
+            base (int): The segment to start in.
+            offset (int): The byte offset in that segment.
+
+        Returns:
+            tuple: ``(payloads, base, offset)``, the raw pickled payloads in
+                log order and the position just past the last of them.
+        """
+        payloads = []
+        self._writer.flush()
+        while len(payloads) < count:
+            with open(self._segment_path(base), "rb") as file:
+                file.seek(offset)
+                while len(payloads) < count:
+                    header = file.read(self.RECORD.size)
+                    if len(header) < self.RECORD.size:
+                        break
+                    length = self.RECORD.unpack(header)[0]
+                    payloads.append(file.read(length))
+                    offset += self.RECORD.size + length
+            if len(payloads) < count:
+                index = bisect.bisect_right(self._segments, base)
+                if index == len(self._segments):
+                    break
+                base, offset = self._segments[index], 0
+        return payloads, base, offset
+
+    def _fill(self):
+        """
+        Loads spilled items from disk until the in-memory window is full.
+        """
+        count = min(self.memory_items - len(self.queue), self.tail - self._loaded)
+        if count > 0:
+            payloads, self._read_base, self._read_offset = self._read(count, self._read_base, self._read_offset)
+            self.queue.extend(map(pickle.loads, payloads))
+            self._loaded += len(payloads)
+
+    def _append(self, item):
+        """
+        Appends one record to the log, keeping the item in memory if the window has room.
+
+        Args:
+            item (Any): The element to store.
+        """
+        data = pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+        self._writer.write(self.RECORD.pack(len(data), zlib.crc32(data)))
+        self._writer.write(data)
+        self._write_offset += self.RECORD.size + len(data)
+        self._segment_count += 1
+        self.tail += 1
+        self._log_dirty = True
+
+        if self._loaded == self.tail - 1 and len(self.queue) < self.memory_items:
+            # Nothing is spilled: keep the item and move the read position past it.
+            self.queue.append(item)
+            self._loaded += 1
+            self._read_base, self._read_offset = self._segments[-1], self._write_offset
+        if self._segment_count >= self.segment_items:
+            self._roll()
+
+    def _roll(self):
+        """
+        Seals the current segment, starts a new one and reclaims consumed segments.
+        """
+        self._sync()
+        self._writer.close()
+        self._segments.append(self.tail)
+        self._writer = open(self._segment_path(self.tail), "ab")
+        self._segment_count = self._write_offset = 0
+        if self.sync != "none":
+            directory = os.open(self.path, os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+        self._compact()
+
+    def _sync(self):
+        """
+        Writes out buffered records and the head, fsyncing them unless ``sync`` is ``"none"``.
+        """
+        self._writer.flush()
+        head_dirty = self.head != self._written_head
+        if head_dirty:
+            os.pwrite(self._head_fd, self.HEAD.pack(self.head), 0)
+            self._written_head = self.head
+        if self.sync != "none":
+            if self._log_dirty:
+                os.fsync(self._writer.fileno())
+            if head_dirty:
+                os.fsync(self._head_fd)
+        self._log_dirty = False
+        self._pending = 0
+        self._synced_at = time.monotonic()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _sync_due(self):
+        """
+        Commits a group left pending for ``sync_interval`` seconds (timer callback).
+        """
+        with self.mutex:
+            if self._pending:
+                self._sync()
+
+    def _commit(self, operations: int):
+        """
+        Makes the last ``operations`` operations durable according to the sync policy.
+
+        Args:
+            operations (int): The number of enqueues/dequeues just performed.
+        """
+        if self.sync == "batch":
+            self._pending += operations
+            if self._pending < self.sync_items and time.monotonic() - self._synced_at < self.sync_interval:
+                if self._timer is None:
+                    # Bound the delay even if no further operation arrives.
+                    self._timer = threading.Timer(self.sync_interval, self._sync_due)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self._sync()
+
+    def _compact(self) -> int:
+        """
+        Deletes segments whose records have all been dequeued; the caller must hold the lock.
+
+        Returns:
+            int: The number of segments removed.
+        """
+        if len(self._segments) < 2 or self._segments[1] > self.head:
+            return 0
+        self._sync()  # the head must be on disk before its segments disappear
+        removed = 0
+        while len(self._segments) > 1 and self._segments[1] <= self.head:
+            os.remove(self._segment_path(self._segments.pop(0)))
+            removed += 1
+        if self._read_base < self._segments[0]:
+            # The read position was at the end of a removed segment.
+            self._read_base, self._read_offset = self._segments[0], 0
+        return removed
+
+    def _has_items(self):
+        """
+        Returns whether any item, in memory or spilled, is waiting.
+
+        Returns:
+            bool: True if the queue is not empty.
+        """
+        return self.head < self.tail
+
+    def _put(self, item):
+        """
+        Logs an item and commits it.
+
+        Args:
+            item (Any): The element to store.
+        """
+        self._append(item)
+        self._commit(1)
+
+    def _put_many(self, items: list):
+        """
+        Logs several items and commits them as one group.
+
+        Args:
+            items (list): The elements to store.
+        """
+        for item in items:
+            self._append(item)
+        self._commit(len(items))
+
+    def _get(self):
+        """
+        Removes and returns the next item, reading spilled items back if needed.
+
+        Returns:
+            Any: The next element.
+        """
+        if not self.queue:
+            self._fill()
+        item = self.queue.popleft()
+        self.head += 1
+        self._commit(1)
+        return item
+
+    def _get_many(self, max_items: int) -> list:
+        """
+        Removes and returns up to ``max_items`` items, committing the head once.
+
+        Args:
+            max_items (int): The maximum number of items to return.
+
+        Returns:
+            list: The removed elements in order.
+        """
+        items = []
+        popleft = self.queue.popleft
+        while len(items) < max_items and self.head < self.tail:
+            if not self.queue:
+                self._fill()
+            take = min(max_items - len(items), len(self.queue))
+            items.extend([popleft() for _ in range(take)])
+            self.head += take
+        self._commit(len(items))
+        return items
+
+    def _peek(self):
+        """
+        Returns the next item without removing it.
+
+        Returns:
+            Any: The next element.
+        """
+        if not self.queue:
+            self._fill()
+        return self.queue[0]
+
+    def _items(self) -> list:
+        """
+        Returns all queued items, including spilled ones, in dequeue order.
+
+        Spilled items are read through a private cursor under the lock, so
+        this is safe to call while other threads enqueue and dequeue.
+
+        Returns:
+            list: The elements of the queue.
+        """
+        with self.mutex:
+            spilled = self._read(self.tail - self._loaded, self._read_base, self._read_offset)[0]
+            items = list(self.queue)
+        return items + [pickle.loads(payload) for payload in spilled]
+
+    def is_empty(self):
+        """
+        Checks whether the queue is empty.
+
+        Returns:
+            bool: True if the queue is empty, otherwise False.
+        """
+        return self.head == self.tail
+
+    def size(self):
+        """
+        Returns the number of elements in the queue, including spilled ones.
+
+        Returns:
+            int: The number of elements in the queue.
+        """
+        return self.tail - self.head
+
+    def _clear(self):
+        """
+        Discards all queued items, commits the head and reclaims their segments.
+        """
+        self.queue.clear()
+        self.head = self._loaded = self.tail
+        self._read_base, self._read_offset = self._segments[-1], self._write_offset
+        self._sync()
+        self._compact()
+
+    def compact(self) -> int:
+        """
+        Deletes log segments whose items have all been dequeued.
+
+        Returns:
+            int: The number of segments removed.
+        """
+        with self.mutex:
+            return self._compact()
+
+    def flush(self):
+        """
+        Commits all buffered records and the head, regardless of the sync policy.
+        """
+        with self.mutex:
+            self._sync()
+
+    def close(self):
+        """
+        Commits outstanding writes and closes the log files.
+        """
+        with self.mutex:
+            self._sync()
+            self._writer.close()
+            os.close(self._head_fd)
+
+    def __enter__(self):
+        """
+        Returns the queue, so it can be used in a ``with`` block.
+
+        Returns:
+            PersistentQueue: This queue.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Closes the queue at the end of a ``with`` block.
+        """
+        self.close()
+
+
+# Architectures whose memory model keeps stores in program order (TSO).
+_ORDERED_STORES = {"x86_64", "amd64", "i386", "i486", "i586", "i686", "x86"}
+
+
+def _check_store_order():
+    """
+    Refuses to run the lock-free ring on CPUs that may reorder stores.
+
+    Raises:
+        RuntimeError: If the machine is not x86.
+    """
+    machine = platform.machine().lower()
+    if machine not in _ORDERED_STORES:
+        raise RuntimeError(f"SharedRingQueue requires x86 store ordering, not {machine or 'unknown'}")
+
+
+def _attach_shared_memory(name: str, shared_tracker: bool = False) -> shared_memory.SharedMemory:
+    """
+    Attaches to an existing shared memory block without taking ownership of it.
+
+    Only the creating process should unlink a block. Python 3.13+ supports
+    this directly with ``track=False``. Older versions register every
+    attached block with the process's resource tracker, which unlinks it
+    (warning about a leak) when the process exits, pulling it from under
+    the creator. The registration is therefore undone, except in the
+    creator itself or a child it started through ``multiprocessing`` (fork,
+    spawn or forkserver). Those share the creator's tracker, and
+    unregistering there would drop the creator's own registration.
+
+    Args:
+        name (str): The name of the shared memory block.
+        shared_tracker (bool): Whether this process shares the creator's
+            resource tracker: it is the creator, or was started by it
+            through ``multiprocessing``.
+
+    Returns:
+        SharedMemory: The attached block.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    shm = shared_memory.SharedMemory(name=name)
+    if not shared_tracker:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+class SharedRingQueue:
+    """
+    A single-producer/single-consumer ring buffer queue in shared memory.
+
+    Items move between two processes through a ``multiprocessing.shared_memory``
+    block of fixed-size slots instead of being sent over a pipe. The producer
+    only writes the tail counter and the consumer only writes the head
+    counter, so no lock is needed: a slot is filled before the tail is
+    published and read before the head is advanced. The counters live on
+    separate cache lines to avoid false sharing. Each side caches the other
+    side's counter and only re-reads it when the ring looks full or empty.
+
+    ``enqueue``/``dequeue`` pickle items like ``Queue`` does; ``enqueue_bytes``
+    and ``dequeue_bytes`` move raw payloads without pickling, and
+    ``dequeue_bytes(copy=False)`` returns a view straight into the slot.
+
+    Exactly one process may produce and one may consume. The ordering relies
+    on stores becoming visible in program order. x86 guarantees this (TSO),
+    but ARM and POWER may reorder the stores, and Python has no memory
+    barriers. Creating or attaching a ring on other architectures therefore
+    raises ``RuntimeError``. Use ``multiprocessing.Queue`` there instead.
+
+    Attributes:
+        capacity (int): The number of slots.
+        slot_size (int): The maximum payload size of a slot in bytes.
+        name (str): The name of the shared memory block, used to attach to it.
+    """
+
+    _LAYOUT = struct.Struct("<QQ")  # capacity, slot size
+    _COUNTER = struct.Struct("<Q")
+    _LENGTH = struct.Struct("<I")
+    _HEAD = 64
+    _TAIL = 128
+    _SLOTS = 192
+
+    def __init__(self, capacity: int = 1024, slot_size: int = 256, name: str = None):
+        """
+        Creates a ring buffer queue in a new shared memory block.
+
+        Args:
+            capacity (int): The number of slots.
+            slot_size (int): The maximum payload size of a slot in bytes.
+            name (str, optional): The name of the shared memory block;
+                generated if omitted.
+
+        Raises:
+            ValueError: If ``capacity`` or ``slot_size`` is not positive.
+            RuntimeError: If the machine is not x86.
+        """
+        if capacity <= 0 or slot_size <= 0:
+            raise ValueError("Capacity and slot size must be positive")
+        _check_store_order()
+        size = self._SLOTS + capacity * (self._LENGTH.size + slot_size)
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self._LAYOUT.pack_into(self._shm.buf, 0, capacity, slot_size)
+        self._COUNTER.pack_into(self._shm.buf, self._HEAD, 0)
+        self._COUNTER.pack_into(self._shm.buf, self._TAIL, 0)
+        self._setup()
+
+    @classmethod
+    def attach(cls, name: str, shared_tracker: bool = False):
+        """
+        Attaches to a ring buffer queue created by another process.
+
+        The attaching process never owns the block: it is left in place when
+        this process exits, and only the creator should ``unlink`` it.
+
+        Args:
+            name (str): The name of the shared memory block.
+            shared_tracker (bool): Pass True in the creating process or a
+                child it started through ``multiprocessing``, which share
+                the creator's resource tracker. Leave False in independent
+                processes. Ignored on Python 3.13+.
+
+        Raises:
+            RuntimeError: If the machine is not x86.
+
+        Returns:
+            SharedRingQueue: A queue using the existing block.
+        """
+        _check_store_order()
+        ring = cls.__new__(cls)
+        ring._shm = _attach_shared_memory(name, shared_tracker)
+        ring._setup()
+        return ring
+
+    def _setup(self):
+        """
+        Reads the layout from the block header and initializes the local state.
+        """
+        self.capacity, self.slot_size = self._LAYOUT.unpack_from(self._shm.buf, 0)
+        self.name = self._shm.name
+        self._buf = self._shm.buf
+        self._stride = self._LENGTH.size + self.slot_size
+        # Each side owns one counter and keeps it locally; the other side's
+        # counter is cached and only re-read when the ring looks full/empty.
+        self._head = self._cached_head = self._read(self._HEAD)
+        self._tail = self._cached_tail = self._read(self._TAIL)
+        self._pending = None  # the slot view handed out by dequeue_bytes(copy=False)
+
+    def _read(self, offset: int) -> int:
+        """
+        Reads a counter from the block.
+
+        Args:
+            offset (int): The offset of the counter.
+
+        Returns:
+            int: The counter value.
+        """
+        return self._COUNTER.unpack_from(self._buf, offset)[0]
+
+    def _release_pending(self):
+        """
+        Frees the slot handed out by the last ``dequeue_bytes(copy=False)``.
+        """
+        if self._pending is not None:
+            self._pending.release()
+            self._pending = None
+            self._head += 1
+            self._COUNTER.pack_into(self._buf, self._HEAD, self._head)
+
+    def _wait(self, ready, block: bool, timeout: float = None):
+        """
+        Spins (yielding the CPU) until ``ready()`` is true or the timeout expires.
+
+        Args:
+            ready (callable): The condition to wait for.
+            block (bool): Whether to wait at all.
+            timeout (float, optional): The maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the condition became true.
+        """
+        if ready():
+            return True
+        if not block:
+            return False
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not ready():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0)
+        return True
+
+    def _has_space(self):
+        """
+        Returns whether the producer can write a slot, refreshing the cached head if needed.
+
+        Returns:
+            bool: True if the ring is not full.
+        """
+        if self._tail - self._cached_head < self.capacity:
+            return True
+        self._cached_head = self._read(self._HEAD)
+        return self._tail - self._cached_head < self.capacity
+
+    def _has_items(self):
+        """
+        Returns whether the consumer can read a slot, refreshing the cached tail if needed.
+
+        Returns:
+            bool: True if the ring is not empty.
+        """
+        if self._head < self._cached_tail:
+            return True
+        self._cached_tail = self._read(self._TAIL)
+        return self._head < self._cached_tail
+
+    def enqueue_bytes(self, data, block: bool = True, timeout: float = None):
+        """
+        Copies a raw payload into the next slot without pickling.
+
+        Args:
+            data (bytes-like): The payload, at most ``slot_size`` bytes.
+            block (bool): Whether to wait while the ring is full.
+            timeout (float, optional): The maximum number of seconds to wait;
+                None waits indefinitely.
+
+        Raises:
+            ValueError: If the payload does not fit in a slot.
+            IndexError: If the ring is still full when giving up.
+        """
+        length = len(data)
+        if length > self.slot_size:
+            raise ValueError(f"Payload of {length} bytes exceeds the slot size of {self.slot_size}")
+        if not self._wait(self._has_space, block, timeout):
+            raise IndexError("Queue is full")
+
+        offset = self._SLOTS + (self._tail % self.capacity) * self._stride
+        self._LENGTH.pack_into(self._buf, offset, length)
+        self._buf[offset + 4:offset + 4 + length] = data
+        self._tail += 1
+        self._COUNTER.pack_into(self._buf, self._TAIL, self._tail)  # publish the slot
+
+    def dequeue_bytes(self, block: bool = False, timeout: float = None, copy: bool = True):
+        """
+        Removes and returns the next raw payload.
+
+        Args:
+            block (bool): Whether to wait for an item if the ring is empty.
+            timeout (float, optional): The maximum number of seconds to wait
+                when blocking; None waits indefinitely.
+            copy (bool): If False, return a ``memoryview`` of the slot itself.
+                The view is released by the next dequeue on this queue, when
+                the slot is handed back to the producer, or by ``close``.
+                Views sliced from it must be dropped before ``close``.
+
+        Raises:
+            IndexError: If the ring is empty (after waiting, when blocking).
+
+        Returns:
+            bytes | memoryview: The payload.
+        """
+        self._release_pending()
+        if not self._wait(self._has_items, block, timeout):
+            raise IndexError("Queue is empty")
+
+        offset = self._SLOTS + (self._head % self.capacity) * self._stride
+        length = self._LENGTH.unpack_from(self._buf, offset)[0]
+        payload = self._buf[offset + 4:offset + 4 + length]
+        if copy:
+            payload = bytes(payload)
+            self._head += 1
+            self._COUNTER.pack_into(self._buf, self._HEAD, self._head)  # free the slot
+        else:
+            self._pending = payload
+        return payload
+
+    def enqueue(self, item, block: bool = True, timeout: float = None):
+        """
+        Adds an item to the end of the queue.
+
+        Args:
+            item (Any): The element to be added; it is pickled into a slot.
+            block (bool): Whether to wait while the ring is full.
+            timeout (float, optional): The maximum number of seconds to wait;
+                None waits indefinitely.
+
+        Raises:
+            ValueError: If the pickled item does not fit in a slot.
+            IndexError: If the ring is still full when giving up.
+        """
+        self.enqueue_bytes(pickle.dumps(item, pickle.HIGHEST_PROTOCOL), block, timeout)
+
+    def dequeue(self, block: bool = False, timeout: float = None):
+        """
+        Removes and returns the first item from the queue.
+
+        Args:
+            block (bool): Whether to wait for an item if the ring is empty.
+            timeout (float, optional): The maximum number of seconds to wait
+                when blocking; None waits indefinitely.
+
+        Raises:
+            IndexError: If the queue is empty (after waiting, when blocking).
+
+        Returns:
+            Any: The element that was removed from the queue.
+        """
+        self._release_pending()
+        if not self._wait(self._has_items, block, timeout):
+            raise IndexError("Queue is empty")
+
+        offset = self._SLOTS + (self._head % self.capacity) * self._stride
+        length = self._LENGTH.unpack_from(self._buf, offset)[0]
+        item = pickle.loads(self._buf[offset + 4:offset + 4 + length])
+        self._head += 1
+        self._COUNTER.pack_into(self._buf, self._HEAD, self._head)
+        return item
+
+    def peek(self):
+        """
+        Returns the first item in the queue without removing it (consumer side).
+
+        Raises:
+            IndexError: If the queue is empty.
+
+        Returns:
+            Any: The first element in the queue.
+        """
+        self._release_pending()
+        if not self._has_items():
+            raise IndexError("Queue is empty")
+        offset = self._SLOTS + (self._head % self.capacity) * self._stride
+        length = self._LENGTH.unpack_from(self._buf, offset)[0]
+        return pickle.loads(self._buf[offset + 4:offset + 4 + length])
+
+    def size(self):
+        """
+        Returns the number of elements in the queue.
+
+        Returns:
+            int: The number of occupied slots.
+        """
+        return self._read(self._TAIL) - self._read(self._HEAD) - (self._pending is not None)
+
+    def is_empty(self):
+        """
+        Checks whether the queue is empty.
+
+        Returns:
+            bool: True if the queue is empty, otherwise False.
+        """
+        return self.size() == 0
+
+    def is_full(self):
+        """
+        Checks whether all slots are occupied.
+
+        Returns:
+            bool: True if the queue is full, otherwise False.
+        """
+        return self._read(self._TAIL) - self._read(self._HEAD) >= self.capacity
+
+    def clear(self):
+        """
+        Discards all queued items (consumer side).
+
+        Returns:
+            None: This method clears the queue in place.
+        """
+        if self._pending is not None:
+            self._pending.release()
+            self._pending = None
+        self._head = self._cached_tail = self._read(self._TAIL)
+        self._COUNTER.pack_into(self._buf, self._HEAD, self._head)
+
+    def close(self):
+        """
+        Detaches this process from the shared memory block.
+
+        A view returned by ``dequeue_bytes(copy=False)`` is released first;
+        its slot stays queued and is dequeued again after re-attaching.
+
+        Raises:
+            BufferError: If another view into the block, such as a slice of
+                a zero-copy payload, is still alive.
+        """
+        if self._pending is not None:
+            self._pending.release()
+            self._pending = None
+        try:
+            self._shm.close()
+        except BufferError:
+            raise BufferError("Cannot close the queue while views from dequeue_bytes(copy=False) "
+                              "are still referenced") from None
+        self._buf = None
+
+    def unlink(self):
+        """
+        Destroys the shared memory block; call once, from the creating process.
+        """
+        self._shm.unlink()
+
+    def __enter__(self):
+        """
+        Returns the queue, so it can be used in a ``with`` block.
+
+        Returns:
+            SharedRingQueue: This queue.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Closes the queue at the end of a ``with`` block.
+        """
+        self.close()
+
+    def __repr__(self):
+        """
+        Returns a string representation of the queue.
+
+        Returns:
+            str: The name, capacity and current size of the queue.
+        """
+        return f"SharedRingQueue(name={self.name!r}, capacity={self.capacity}, size={self.size()})"
+
+
+class LatencyHistogram:
+    """
+    A log-linear (HDR-style) histogram of durations in nanoseconds.
+
+    Values below ``2 ** precision`` get a bucket each; larger values are
+    bucketed by their top ``precision`` bits, so every percentile is
+    reported within a relative error of ``2 ** (1 - precision)`` while
+    ``record`` stays O(1) and the bucket array has a fixed size.
+
+    Attributes:
+        precision (int): The number of significant bits kept per value.
+        counts (list): The number of values recorded in each bucket.
+        count (int): The number of recorded values.
+        total (int): The sum of the recorded values.
+        min (int): The smallest recorded value (``2 ** 64`` while empty).
+        max (int): The largest recorded value.
+    """
+
+    def __init__(self, precision: int = 7):
+        """
+        Creates an empty histogram.
+
+        Args:
+            precision (int): The number of significant bits kept per value.
+        """
+        self.precision = precision
+        self._sub = 1 << precision
+        self._half = self._sub >> 1
+        self.counts = [0] * (self._sub + 64 * self._half)
+        self.count = self.total = self.max = 0
+        self.min = 1 << 64
+
+    def _upper(self, index: int) -> int:
+        """
+        Returns the largest value that falls into a bucket.
+
+        Args:
+            index (int): The bucket index.
+
+        Returns:
+            int: The upper bound of the bucket.
+        """
+        if index < self._sub:
+            return index
+        shift, offset = divmod(index - self._sub, self._half)
+        return ((self._half + offset + 1) << (shift + 1)) - 1
+
+    def record(self, value: int):
+        """
+        Adds a duration to the histogram.
+
+        Args:
+            value (int): The duration in nanoseconds; negative values count as 0.
+        """
+        if value >= self._sub:
+            # ``_sub + (shift - 1) * _half + (value >> shift) - _half``, simplified.
+            shift = value.bit_length() - self.precision
+            self.counts[shift * self._half + (value >> shift)] += 1
+        else:
+            if value < 0:
+                value = 0
+            self.counts[value] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if value < self.min:
+            self.min = value
+
+    def percentile(self, q: float) -> int:
+        """
+        Returns the value below which ``q`` percent of the recorded values fall.
+
+        Args:
+            q (float): The percentile, between 0 and 100.
+
+        Returns:
+            int: The percentile in nanoseconds, or 0 if nothing was recorded.
+        """
+        if not self.count:
+            return 0
+        rank = max(1, -int(-q * self.count // 100))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                return min(self._upper(index), self.max)
+        return self.max
+
+    def snapshot(self) -> dict:
+        """
+        Summarises the histogram.
+
+        Returns:
+            dict: ``count`` and ``min``/``mean``/``p50``/``p90``/``p99``/
+                ``p999``/``max`` in seconds.
+        """
+        summary = {"count": self.count, "min": self.min / 1e9 if self.count else 0.0,
+                   "mean": self.total / self.count / 1e9 if self.count else 0.0}
+        for label, q in (("p50", 50), ("p90", 90), ("p99", 99), ("p999", 99.9)):
+            summary[label] = self.percentile(q) / 1e9
+        summary["max"] = self.max / 1e9
+        return summary
+
+
+class QueueMetrics:
+    """
+    Usage metrics of a queue, created by ``Queue.enable_metrics``.
+
+    Attributes:
+        sample_every (int): The latency sampling interval in items.
+        latency (LatencyHistogram): Enqueue-to-dequeue latency of sampled items.
+        started (float): The ``time.monotonic()`` when recording started.
+        hooks (tuple): The names of the instrumented hooks.
+    """
+
+    def __init__(self, sample_every: int = 64):
+        """
+        Creates empty metrics.
+
+        Args:
+            sample_every (int): The latency sampling interval in items.
+        """
+        self.sample_every = sample_every
+        self.latency = LatencyHistogram()
+        self.started = time.monotonic()
+        self.hooks = ()
+
+    def _bind(self, counters, depth, lock):
+        """
+        Connects the metrics to the instrumented queue.
+
+        Args:
+            counters (callable): Returns ``(enqueued, dequeued, high_water)``.
+            depth (callable): Returns the current number of queued items.
+            lock (threading.Lock): The queue's lock, held while taking a snapshot.
+        """
+        self._counters = counters
+        self._depth = depth
+        self._lock = lock
+        self._initial = depth()
+
+    def snapshot(self) -> dict:
+        """
+        Returns a consistent copy of the current metrics.
+
+        Returns:
+            dict: ``depth``, ``high_water``, ``enqueued``, ``dequeued``,
+                ``discarded`` (cleared or cancelled), ``elapsed`` seconds,
+                ``enqueue_rate``/``dequeue_rate`` in items per second and the
+                ``latency`` summary from ``LatencyHistogram.snapshot``.
+        """
+        with self._lock:
+            enqueued, dequeued, high_water = self._counters()
+            depth = self._depth()
+            latency = self.latency.snapshot()
+        elapsed = time.monotonic() - self.started
+        return {
+            "depth": depth,
+            "high_water": high_water,
+            "enqueued": enqueued,
+            "dequeued": dequeued,
+            "discarded": self._initial + enqueued - dequeued - depth,
+            "elapsed": elapsed,
+            "enqueue_rate": enqueued / elapsed if elapsed else 0.0,
+            "dequeue_rate": dequeued / elapsed if elapsed else 0.0,
+            "latency": latency,
+        }
@@ -0,0 +1,183 @@
+import asyncio
+import importlib.util
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import unittest
+
+# Every package directory names its module ``exp``; load this one under a unique name.
+_spec = importlib.util.spec_from_file_location("queue_exp", os.path.join(os.path.dirname(__file__), "exp.py"))
+exp = sys.modules["queue_exp"] = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(exp)
+
+
+def _echo(requests: str, replies: str):
+    """
+    Sends every item of one ring back through another until it receives None.
+    """
+    inbox = exp.SharedRingQueue.attach(requests, shared_tracker=True)
+    outbox = exp.SharedRingQueue.attach(replies, shared_tracker=True)
+    while True:
+        item = inbox.dequeue(block=True, timeout=10)
+        outbox.enqueue(item, timeout=10)
+        if item is None:
+            break
+    inbox.close()
+    outbox.close()
+
+
+def _crash_mid_drain(path: str, drained: int, lost: int):
+    """
+    Dequeues ``drained`` committed items and ``lost`` uncommitted ones, then dies.
+    """
+    q = exp.PersistentQueue(path, sync="batch", sync_items=1000, sync_interval=60)
+    for _ in range(drained):
+        q.dequeue()
+    q.flush()
+    for _ in range(lost):
+        q.dequeue()
+    os._exit(0)  # no close, no final commit
+
+
+class TestQueue(unittest.TestCase):
+    def test_fifo_and_batches(self):
+        q = exp.Queue(maxsize=8)
+        q.put_many(range(5))
+        q.enqueue(5)
+        self.assertEqual(q.dequeue(), 0)
+        self.assertEqual(q.get_batch(3), [1, 2, 3])
+        self.assertEqual(q.get_batch(10, timeout=0), [4, 5])
+        self.assertTrue(q.is_empty())
+
+
+class TestAsyncQueue(unittest.TestCase):
+    def test_get_batch_cancelled_while_lingering(self):
+        async def scenario():
+            q = exp.AsyncQueue()
+            for i in range(3):
+                q.enqueue_nowait(i)
+            batch = asyncio.create_task(q.get_batch(10, linger=10))
+            await asyncio.sleep(0.01)
+            self.assertTrue(q.is_empty())  # taken by the lingering batch
+            q.enqueue_nowait(3)
+            await asyncio.sleep(0.01)
+
+            # A second consumer waits while the batch is cancelled.
+            other = asyncio.create_task(q.dequeue())
+            await asyncio.sleep(0.01)
+            batch.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await batch
+            self.assertEqual(await asyncio.wait_for(other, 1), 0)
+            return [q.dequeue_nowait() for _ in range(q.size())]
+
+        self.assertEqual(asyncio.run(scenario()), [1, 2, 3])
+
+
+class TestPersistentQueue(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = directory.name
+
+    def open(self, **options):
+        q = exp.PersistentQueue(self.path, **options)
+        self.addCleanup(q.close)
+        return q
+
+    def drain(self, q) -> list:
+        return [q.dequeue() for _ in range(q.size())]
+
+    def test_recovers_after_torn_tail(self):
+        with exp.PersistentQueue(self.path, sync="always") as q:
+            q.put_many(range(10))
+        segment = os.path.join(self.path, max(name for name in os.listdir(self.path) if name.endswith(".log")))
+        with open(segment, "r+b") as file:
+            file.truncate(os.path.getsize(segment) - 3)  # tear the last record
+
+        q = self.open(sync="always")
+        self.assertEqual(q.size(), 9)
+        q.enqueue("after")
+        self.assertEqual(self.drain(q), list(range(9)) + ["after"])
+
+    def test_recovers_after_corrupt_tail(self):
+        with exp.PersistentQueue(self.path, sync="always") as q:
+            q.put_many(range(5))
+        segment = os.path.join(self.path, max(name for name in os.listdir(self.path) if name.endswith(".log")))
+        with open(segment, "r+b") as file:
+            file.seek(-1, os.SEEK_END)
+            last = file.read(1)
+            file.seek(-1, os.SEEK_END)
+            file.write(bytes([last[0] ^ 0xFF]))  # fails the CRC
+
+        self.assertEqual(self.drain(self.open()), list(range(4)))
+
+    def test_reopen_mid_drain(self):
+        options = {"sync": "none", "segment_items": 16, "memory_items": 8}
+        with exp.PersistentQueue(self.path, **options) as q:
+            q.put_many(range(100))
+            self.assertEqual([q.dequeue() for _ in range(30)], list(range(30)))
+            self.assertEqual(q.get_batch(5, timeout=0), list(range(30, 35)))
+
+        q = self.open(**options)
+        self.assertEqual(q.size(), 65)
+        self.assertEqual(q.peek(), 35)
+        q.enqueue(100)
+        self.assertEqual(self.drain(q), list(range(35, 101)))
+        q.compact()
+        self.assertEqual([name for name in os.listdir(self.path) if name.endswith(".log")], [f"{96:020d}.log"])
+
+    def test_at_least_once_after_crash(self):
+        with exp.PersistentQueue(self.path, sync="always") as q:
+            q.put_many(range(10))
+
+        child = multiprocessing.Process(target=_crash_mid_drain, args=(self.path, 2, 3))
+        child.start()
+        child.join(30)
+        self.assertEqual(child.exitcode, 0)
+
+        # The three uncommitted dequeues come out again; the committed ones do not.
+        self.assertEqual(self.drain(self.open()), list(range(2, 10)))
+
+
+@unittest.skipUnless(platform.machine().lower() in exp._ORDERED_STORES, "SharedRingQueue needs x86")
+class TestSharedRingQueue(unittest.TestCase):
+    def ring(self, *args):
+        ring = exp.SharedRingQueue(*args)
+        self.addCleanup(ring.unlink)
+        self.addCleanup(ring.close)
+        return ring
+
+    def test_wraps_around(self):
+        ring = self.ring(4, 64)
+        for i in range(10):
+            ring.enqueue(i)
+            ring.enqueue_bytes(b"x" * i)
+            self.assertEqual(ring.dequeue(), i)
+            self.assertEqual(bytes(ring.dequeue_bytes(copy=False)), b"x" * i)
+        self.assertTrue(ring.is_empty())
+        self.assertRaises(ValueError, ring.enqueue_bytes, bytes(65))
+
+    def test_close_with_live_view(self):
+        ring = self.ring(4, 64)
+        ring.enqueue_bytes(b"payload")
+        view = ring.dequeue_bytes(copy=False)[:3]
+        self.assertRaises(BufferError, ring.close)
+        del view
+
+    def test_cross_process_round_trip(self):
+        requests, replies = self.ring(8, 128), self.ring(8, 128)
+        child = multiprocessing.Process(target=_echo, args=(requests.name, replies.name))
+        child.start()
+        items = [0, "text", b"bytes", (1, 2.5), {"key": [None]}] * 20 + [None]
+        for item in items:
+            requests.enqueue(item, timeout=10)
+            self.assertEqual(replies.dequeue(block=True, timeout=10), item)
+        child.join(30)
+        self.assertEqual(child.exitcode, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,377 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from exp import Sort
+
+
+class Counted:
+    """
+    A wrapper that counts every comparison made between wrapped values.
+
+    Attributes:
+        value (Any): The wrapped value.
+        comparisons (int): The number of comparisons made so far (class-wide).
+    """
+
+    __slots__ = ("value",)
+    comparisons = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        Counted.comparisons += 1
+        return self.value < other.value
+
+    def __gt__(self, other):
+        Counted.comparisons += 1
+        return self.value > other.value
+
+    def __le__(self, other):
+        Counted.comparisons += 1
+        return self.value <= other.value
+
+    def __ge__(self, other):
+        Counted.comparisons += 1
+        return self.value >= other.value
+
+    def __eq__(self, other):
+        Counted.comparisons += 1
+        return self.value == other.value
+
+    def __getstate__(self):
+        return self.value
+
+    def __setstate__(self, value):
+        self.value = value
+
+
+class CountingList(list):
+    """
+    A list that counts element writes, used to measure in-place sorts.
+
+    A swap counts as two writes; a slice assignment counts one write per element.
+
+    Attributes:
+        writes (int): The number of element writes made so far.
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.writes = 0
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            self.writes += len(value)
+        else:
+            self.writes += 1
+        super().__setitem__(index, value)
+
+
+def legacy_merge_sort(data: list) -> list:
+    """
+    The original recursive merge sort with ``pop(0)``-based merging, kept as a reference.
+
+    Args:
+        data (list): The list of elements to be sorted.
+
+    Returns:
+        list: The sorted list.
+    """
+    if len(data) <= 1:
+        return data
+
+    mid = len(data) // 2
+    left = legacy_merge_sort(data[:mid])
+    right = legacy_merge_sort(data[mid:])
+
+    merged = []
+    while left and right:
+        if left[0] < right[0]:
+            merged.append(left.pop(0))
+        else:
+            merged.append(right.pop(0))
+    merged.extend(left)
+    merged.extend(right)
+    return merged
+
+
+def timed(func, data: list) -> float:
+    """
+    Runs ``func`` on a copy of ``data`` and returns the elapsed wall time.
+
+    Args:
+        func (callable): The sorting function to call.
+        data (list): The input list.
+
+    Returns:
+        float: The elapsed time in seconds.
+    """
+    data = list(data)
+    start = time.perf_counter()
+    func(data)
+    return time.perf_counter() - start
+
+
+def bench_merge_sort(sizes=(10**3, 10**4, 10**5, 10**6), legacy_limit: int = 10**5):
+    """
+    Compares the bottom-up ``Sort.merge_sort`` with the legacy implementation.
+
+    The legacy version is skipped above ``legacy_limit`` elements because its
+    quadratic merge makes larger inputs impractical.
+
+    Args:
+        sizes (tuple): The input sizes to benchmark.
+        legacy_limit (int): The largest size the legacy version is run on.
+    """
+    print(f"{'n':>10} {'merge_sort':>12} {'legacy':>12} {'sorted()':>12}")
+    for n in sizes:
+        data = [random.random() for _ in range(n)]
+        sorter = Sort(data)
+        new = timed(sorter.merge_sort, data)
+        old = f"{timed(legacy_merge_sort, data):.3f}s" if n <= legacy_limit else "-"
+        builtin = timed(sorted, data)
+        print(f"{n:>10} {new:>11.3f}s {old:>12} {builtin:>11.3f}s")
+
+
+def bench_parallel_sort(n: int = 10**6, workers=(1, 2, 4, 8)):
+    """
+    Measures how ``Sort.parallel_sort`` scales with the number of workers.
+
+    Args:
+        n (int): The input size.
+        workers (tuple): The worker counts to benchmark.
+    """
+    data = [random.randint(-10**9, 10**9) for _ in range(n)]
+    sorter = Sort(data)
+    baseline = timed(sorter.merge_sort, data)
+    print(f"merge_sort: {baseline:.3f}s")
+    print(f"{'workers':>8} {'time':>10} {'speedup':>8}")
+    for count in workers:
+        elapsed = timed(lambda values: sorter.parallel_sort(values, workers=count), data)
+        print(f"{count:>8} {elapsed:>9.3f}s {baseline / elapsed:>7.2f}x")
+
+
+DISTRIBUTIONS = {
+    "random": lambda n, rng: [rng.randrange(10 * n) for _ in range(n)],
+    "sorted": lambda n, rng: list(range(n)),
+    "reversed": lambda n, rng: list(range(n, 0, -1)),
+    "few_unique": lambda n, rng: [rng.randrange(8) for _ in range(n)],
+    "organ_pipe": lambda n, rng: list(range(n // 2)) + list(range(n - n // 2, 0, -1)),
+    "nearly_sorted": lambda n, rng: nearly_sorted(n, rng),
+}
+
+
+def nearly_sorted(n: int, rng: random.Random) -> list:
+    """
+    Builds a sorted list of ``n`` ints with about 1% of the elements swapped at random.
+
+    Args:
+        n (int): The size of the list.
+        rng (random.Random): The random number generator.
+
+    Returns:
+        list: The nearly sorted list.
+    """
+    data = list(range(n))
+    for _ in range(max(1, n // 100)):
+        i, j = rng.randrange(n), rng.randrange(n)
+        data[i], data[j] = data[j], data[i]
+    return data
+
+
+# name -> (call, sorts the given list in place, supports Counted elements, max size)
+METHODS = {
+    "bubble_sort": (lambda sorter, data: sorter.bubble_sort(), True, True, 2000),
+    "select_sort": (lambda sorter, data: sorter.select_sort(), True, True, 2000),
+    "quick_sort": (lambda sorter, data: sorter.quick_sort(data, in_place=True), True, True, None),
+    "merge_sort": (lambda sorter, data: sorter.merge_sort(data), False, True, None),
+    "adaptive_sort": (lambda sorter, data: sorter.adaptive_sort(data), False, True, None),
+    "radix_sort": (lambda sorter, data: sorter.radix_sort(data), False, False, None),
+    "external_sort": (lambda sorter, data: list(sorter.external_sort(data)), False, True, None),
+    # Selection methods use k = n // 10.
+    "select": (lambda sorter, data: sorter.select(len(data) // 10, data), False, True, None),
+    "partial_sort": (lambda sorter, data: sorter.partial_sort(len(data) // 10, data), True, True, None),
+    "nsmallest": (lambda sorter, data: sorter.nsmallest(len(data) // 10, data), False, True, None),
+    "nlargest": (lambda sorter, data: sorter.nlargest(len(data) // 10, data), False, True, None),
+}
+
+
+def measure(name: str, data: list, repeat: int = 3) -> dict:
+    """
+    Measures one sort method on one input.
+
+    Wall time is the best of ``repeat`` runs on fresh copies. Peak memory is
+    traced with ``tracemalloc`` in a separate run, and comparisons and
+    writes are counted in a third run on wrapped elements, so the
+    instrumentation does not distort the timings.
+
+    Args:
+        name (str): The method name, a key of ``METHODS``.
+        data (list): The input list.
+        repeat (int): The number of timed runs.
+
+    Returns:
+        dict: The ``time`` (seconds), ``peak_memory`` (bytes), ``comparisons``
+        and ``writes`` of the method; counts are None where not measurable.
+    """
+    call, in_place, comparable, _ = METHODS[name]
+
+    best = float("inf")
+    for _ in range(repeat):
+        copy = list(data)
+        sorter = Sort(copy)
+        start = time.perf_counter()
+        call(sorter, copy)
+        best = min(best, time.perf_counter() - start)
+
+    copy = list(data)
+    sorter = Sort(copy)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        call(sorter, copy)
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+    comparisons = writes = None
+    if comparable:
+        counted = CountingList(Counted(value) for value in data)
+        Counted.comparisons = 0
+        call(Sort(counted), counted)
+        comparisons = Counted.comparisons
+        writes = counted.writes if in_place else None
+
+    return {"time": best, "peak_memory": peak, "comparisons": comparisons, "writes": writes}
+
+
+def run_suite(sizes=(1000, 10000), distributions=None, methods=None, repeat: int = 3, seed: int = 0) -> dict:
+    """
+    Runs every method over every size and distribution.
+
+    Args:
+        sizes (tuple): The input sizes.
+        distributions (list, optional): Names from ``DISTRIBUTIONS`` (defaults to all).
+        methods (list, optional): Names from ``METHODS`` (defaults to all).
+        repeat (int): The number of timed runs per measurement.
+        seed (int): The seed for input generation, so counts are reproducible.
+
+    Returns:
+        dict: The results keyed by ``"method/distribution/size"``, plus metadata.
+    """
+    results = {}
+    for n in sizes:
+        for distribution in distributions or DISTRIBUTIONS:
+            data = DISTRIBUTIONS[distribution](n, random.Random(seed))
+            for name in methods or METHODS:
+                max_size = METHODS[name][3]
+                if max_size is not None and n > max_size:
+                    continue
+                results[f"{name}/{distribution}/{n}"] = measure(name, data, repeat)
+    return {
+        "meta": {"python": platform.python_version(), "sizes": list(sizes), "seed": seed},
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.1, time_tolerance: float = 1.0,
+            min_time: float = 0.01) -> list:
+    """
+    Compares suite results against a baseline.
+
+    A metric regresses when it exceeds the baseline by more than the allowed
+    fraction. Comparisons, writes and peak memory are deterministic for a
+    given seed and use ``tolerance``; wall time is noisy and uses the looser
+    ``time_tolerance``; baseline timings shorter than ``min_time`` seconds
+    are too noisy to compare and are skipped.
+
+    Args:
+        current (dict): The results of ``run_suite``.
+        baseline (dict): Previously stored results of ``run_suite``.
+        tolerance (float): The allowed relative increase of counts and memory.
+        time_tolerance (float): The allowed relative increase of wall time.
+        min_time (float): The timing below which time is not compared.
+
+    Returns:
+        list: A message for every regression found.
+    """
+    regressions = []
+    for case, metrics in current["results"].items():
+        reference = baseline["results"].get(case)
+        if reference is None:
+            continue
+        for metric, value in metrics.items():
+            old = reference.get(metric)
+            if value is None or old is None:
+                continue
+            allowed = tolerance
+            if metric == "time":
+                if old < min_time:
+                    continue
+                allowed = time_tolerance
+            if value > old * (1 + allowed):
+                regressions.append(f"{case}: {metric} {old:g} -> {value:g}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    """
+    Runs the benchmark suite from the command line.
+
+    Args:
+        argv (list, optional): The command line arguments (defaults to ``sys.argv``).
+
+    Returns:
+        int: The exit status, 1 if a regression against the baseline was found.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Sort methods.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--distributions", nargs="+", choices=list(DISTRIBUTIONS))
+    parser.add_argument("--methods", nargs="+", choices=list(METHODS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare the results with this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="allowed relative increase of comparisons, writes and memory")
+    parser.add_argument("--time-tolerance", type=float, default=1.0,
+                        help="allowed relative increase of wall time")
+    parser.add_argument("--scaling", action="store_true",
+                        help="run the merge_sort and parallel_sort scaling benchmarks instead")
+    args = parser.parse_args(argv)
+
+    if args.scaling:
+        bench_merge_sort()
+        bench_parallel_sort()
+        return 0
+
+    current = run_suite(args.sizes, args.distributions, args.methods, args.repeat)
+    print(f"{'case':<36} {'time':>10} {'peak KiB':>10} {'comparisons':>12} {'writes':>10}")
+    for case, metrics in current["results"].items():
+        print(f"{case:<36} {metrics['time']:>9.4f}s {metrics['peak_memory'] / 1024:>10.1f} "
+              f"{str(metrics['comparisons']):>12} {str(metrics['writes']):>10}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(current, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(current, baseline, args.tolerance, args.time_tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
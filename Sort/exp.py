@@ -1,16 +1,92 @@
+import heapq
+import operator
+import os
+import pickle
+import sys
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; radix_sort falls back to pure Python.
+    np = None
+
+
+def _sort_shared_chunk(name: str, typecode: str, lo: int, hi: int, reverse: bool) -> None:
+    """
+    Sorts one chunk of a shared memory block in place (parallel sort worker).
+
+    Args:
+        name (str): The name of the shared memory block.
+        typecode (str): The ``array`` typecode of the items in the block.
+        lo (int): The start index of the chunk (inclusive).
+        hi (int): The end index of the chunk (exclusive).
+        reverse (bool): If True, the chunk is sorted in descending order.
+    """
+    block = shared_memory.SharedMemory(name=name)
+    view = block.buf.cast(typecode)
+    try:
+        chunk = view[lo:hi].tolist()
+        view[lo:hi] = array(typecode, Sort(chunk).merge_sort(chunk, reverse=reverse))
+    finally:
+        # The view must be released before close(), or close() raises BufferError.
+        view.release()
+        block.close()
+
+
+def _sort_chunk(chunk: list, key, reverse: bool) -> list:
+    """
+    Sorts one chunk of a list (parallel sort worker for non-numeric data).
+
+    Args:
+        chunk (list): The elements to sort.
+        key (callable, optional): The key function, which must be picklable.
+        reverse (bool): If True, the chunk is sorted in descending order.
+
+    Returns:
+        list: The sorted chunk.
+    """
+    return Sort(chunk).merge_sort(chunk, key=key, reverse=reverse)
+
+
 class Sort:
     """
     A simple dynamic sort implementation.
 
-    This class provides implementations for four common sorting algorithms:
+    This class provides implementations for common sorting algorithms:
         - Bubble Sort
         - Selection Sort
         - Quick Sort
         - Merge Sort 
+        - Adaptive Sort (TimSort-style natural merge sort)
+        - Radix Sort (for integer, bytes and string keys)
+        - Parallel Sort (multi-process merge sort)
+        - External Sort (out-of-core merge sort for data larger than RAM)
 
     Attributes:
         data (list): A list of elements to be sorted.
+        MIN_RUN (int): The run length below which insertion sort is used.
+        QUICK_SORT_THRESHOLD (int): The partition size below which quick sort
+            switches to insertion sort.
+        NINTHER_THRESHOLD (int): The partition size from which quick sort picks
+            its pivot with the ninther instead of the median of three.
+        MIN_GALLOP (int): The number of consecutive wins after which the
+            adaptive sort's merge switches to galloping mode.
+        PARALLEL_THRESHOLD (int): The input size below which parallel sort
+            runs in the calling process.
+        EXTERNAL_BLOCK_SIZE (int): The number of elements pickled together
+            in one block of an external sort run file.
     """
+
+    MIN_RUN = 32
+    QUICK_SORT_THRESHOLD = 16
+    NINTHER_THRESHOLD = 128
+    MIN_GALLOP = 7
+    PARALLEL_THRESHOLD = 100_000
+    EXTERNAL_BLOCK_SIZE = 4096
     
     def __init__(self, data: list):
         """
@@ -55,73 +131,1124 @@ class Sort:
             self.data[i], self.data[min_index] = self.data[min_index], self.data[i]
         return self.data
     
-    def quick_sort(self, data: list) -> list:
+    def quick_sort(self, data: list, in_place: bool = False) -> list:
         """
-        Sorts the list using the Quick Sort algorithm (recursive implementation).
+        Sorts the list using the Quick Sort algorithm (introsort implementation).
+
+        Partitions are split around a median-of-three pivot (ninther for large
+        partitions) with a three-way partition, so runs of equal elements are
+        settled in one pass. Small partitions are finished with insertion sort
+        and partitions that exceed the depth limit fall back to heapsort, which
+        bounds the running time to O(n log n) even on adversarial input.
 
         Args:
             data (list): The list of elements to be sorted.
+            in_place (bool): If True, ``data`` itself is sorted and returned;
+                otherwise a sorted copy is returned and ``data`` is left unchanged.
 
         Returns:
             list: The sorted list.
         """
-        if len(data) <= 1:
-            return data
+        if not in_place:
+            data = list(data)
+        n = len(data)
+        if n > 1:
+            self._introsort(data, 0, n, 2 * n.bit_length())
+        return data
+
+    def _introsort(self, data: list, lo: int, hi: int, depth: int) -> None:
+        """
+        Sorts ``data[lo:hi]`` in place.
 
-        left_data = []  # Elements smaller than pivot
-        right_data = []  # Elements greater than pivot
-        pivot = data[-1]  # Choosing last element as pivot
+        Recurses into the smaller side of every partition and loops on the
+        larger one, so the stack depth stays O(log n).
 
-        for element in data[:-1]:  # Exclude pivot when iterating
-            if element < pivot:
-                left_data.append(element)
+        Args:
+            data (list): The list being sorted.
+            lo (int): The start index of the range (inclusive).
+            hi (int): The end index of the range (exclusive).
+            depth (int): The remaining partitioning depth before heapsort is used.
+        """
+        while hi - lo > self.QUICK_SORT_THRESHOLD:
+            if depth == 0:
+                self._heap_sort(data, lo, hi)
+                return
+            depth -= 1
+
+            pivot = self._choose_pivot(data, lo, hi)
+            lt, gt = self._partition(data, lo, hi, pivot)
+
+            if lt - lo < hi - gt:
+                self._introsort(data, lo, lt, depth)
+                lo = gt
             else:
-                right_data.append(element)
+                self._introsort(data, gt, hi, depth)
+                hi = lt
 
-        sorted_left_data = self.quick_sort(left_data)
-        sorted_right_data = self.quick_sort(right_data)
+        self._insertion_sort(data, data, lo, hi, operator.lt)
 
-        return sorted_left_data + [pivot] * data.count(pivot) + sorted_right_data
-    
-    def merge_sort(self, data: list) -> list:
+    def _choose_pivot(self, data: list, lo: int, hi: int):
         """
-        Sorts the list using the Merge Sort algorithm (recursive implementation).
+        Picks a pivot value for ``data[lo:hi]``.
+
+        Uses the median of the first, middle and last elements, or Tukey's
+        ninther (median of three medians) for large ranges.
+
+        Args:
+            data (list): The list being sorted.
+            lo (int): The start index of the range (inclusive).
+            hi (int): The end index of the range (exclusive).
+
+        Returns:
+            Any: The pivot value.
+        """
+        last = hi - 1
+        mid = lo + (hi - lo) // 2
+        if hi - lo < self.NINTHER_THRESHOLD:
+            return self._median_of_three(data[lo], data[mid], data[last])
+
+        step = (hi - lo) // 8
+        return self._median_of_three(
+            self._median_of_three(data[lo], data[lo + step], data[lo + 2 * step]),
+            self._median_of_three(data[mid - step], data[mid], data[mid + step]),
+            self._median_of_three(data[last - 2 * step], data[last - step], data[last]),
+        )
+
+    @staticmethod
+    def _median_of_three(a, b, c):
+        """
+        Returns the median of three values.
+
+        Args:
+            a (Any): The first value.
+            b (Any): The second value.
+            c (Any): The third value.
+
+        Returns:
+            Any: The median value.
+        """
+        if a < b:
+            if b < c:
+                return b
+            return c if a < c else a
+        if a < c:
+            return a
+        return c if b < c else b
+
+    @staticmethod
+    def _partition(data: list, lo: int, hi: int, pivot) -> tuple:
+        """
+        Three-way (Dutch national flag) partition of ``data[lo:hi]`` around ``pivot``.
+
+        After partitioning, ``data[lo:lt] < pivot``, ``data[lt:gt] == pivot``
+        and ``data[gt:hi] > pivot``.
+
+        Args:
+            data (list): The list being sorted.
+            lo (int): The start index of the range (inclusive).
+            hi (int): The end index of the range (exclusive).
+            pivot (Any): The pivot value.
+
+        Returns:
+            tuple: The ``(lt, gt)`` bounds of the block equal to the pivot.
+        """
+        lt, i, gt = lo, lo, hi
+        while i < gt:
+            value = data[i]
+            if value < pivot:
+                data[lt], data[i] = value, data[lt]
+                lt += 1
+                i += 1
+            elif pivot < value:
+                gt -= 1
+                data[gt], data[i] = value, data[gt]
+            else:
+                i += 1
+        return lt, gt
+
+    @staticmethod
+    def _heap_sort(data: list, lo: int, hi: int) -> None:
+        """
+        Sorts ``data[lo:hi]`` in place using heapsort.
+
+        Args:
+            data (list): The list being sorted.
+            lo (int): The start index of the range (inclusive).
+            hi (int): The end index of the range (exclusive).
+        """
+        n = hi - lo
+
+        def sift_down(root: int, end: int) -> None:
+            value = data[lo + root]
+            child = 2 * root + 1
+            while child < end:
+                if child + 1 < end and data[lo + child] < data[lo + child + 1]:
+                    child += 1
+                if not value < data[lo + child]:
+                    break
+                data[lo + root] = data[lo + child]
+                root = child
+                child = 2 * root + 1
+            data[lo + root] = value
+
+        for root in range(n // 2 - 1, -1, -1):
+            sift_down(root, n)
+        for end in range(n - 1, 0, -1):
+            data[lo], data[lo + end] = data[lo + end], data[lo]
+            sift_down(0, end)
+
+    def merge_sort(self, data: list, key=None, reverse: bool = False) -> list:
+        """
+        Sorts the list using the Merge Sort algorithm (bottom-up implementation).
+
+        Small runs are first sorted with insertion sort, then merged pairwise
+        with index-based merging into a single preallocated auxiliary buffer,
+        swapping the roles of the two buffers after every pass. The sort is
+        stable and does not modify the input list.
 
         Args:
             data (list): The list of elements to be sorted.
+            key (callable, optional): A function of one argument used to extract
+                a comparison key from each element, as in ``sorted()``.
+            reverse (bool): If True, the list is sorted in descending order,
+                keeping equal elements in their original order.
 
         Returns:
-            list: The sorted list.
+            list: A new sorted list.
         """
-        if len(data) <= 1:
-            return data
+        n = len(data)
+        if n <= 1:
+            return list(data)
+
+        lt = operator.gt if reverse else operator.lt
+        values = list(data)
+        keys = values if key is None else [key(value) for value in data]
+
+        # Insertion sort on fixed-size runs.
+        for lo in range(0, n, self.MIN_RUN):
+            hi = min(lo + self.MIN_RUN, n)
+            self._insertion_sort(keys, values, lo, hi, lt)
+
+        if n <= self.MIN_RUN:
+            return values
+
+        src_keys, src_values = keys, values
+        dst_values = [None] * n
+        dst_keys = dst_values if key is None else [None] * n
+
+        width = self.MIN_RUN
+        while width < n:
+            for lo in range(0, n, 2 * width):
+                mid = min(lo + width, n)
+                hi = min(lo + 2 * width, n)
+                self._merge(src_keys, src_values, dst_keys, dst_values, lo, mid, hi, lt)
+            src_keys, dst_keys = dst_keys, src_keys
+            src_values, dst_values = dst_values, src_values
+            width *= 2
+
+        return src_values
+
+    @staticmethod
+    def _insertion_sort(keys: list, values: list, lo: int, hi: int, lt) -> None:
+        """
+        Sorts ``values[lo:hi]`` in place by ``keys`` using insertion sort.
 
-        mid = len(data) // 2
-        left_data = data[:mid]
-        right_data = data[mid:]
+        When ``keys`` and ``values`` are the same list only one of them is moved.
 
-        sorted_left_data = self.merge_sort(left_data)
-        sorted_right_data = self.merge_sort(right_data)
+        Args:
+            keys (list): The comparison keys, parallel to ``values``.
+            values (list): The elements being sorted.
+            lo (int): The start index of the run (inclusive).
+            hi (int): The end index of the run (exclusive).
+            lt (callable): The strict "comes before" comparison.
+        """
+        same = keys is values
+        for i in range(lo + 1, hi):
+            current_key = keys[i]
+            current_value = values[i]
+            j = i - 1
+            while j >= lo and lt(current_key, keys[j]):
+                keys[j + 1] = keys[j]
+                if not same:
+                    values[j + 1] = values[j]
+                j -= 1
+            keys[j + 1] = current_key
+            values[j + 1] = current_value
+
+    @staticmethod
+    def _merge(src_keys: list, src_values: list, dst_keys: list, dst_values: list,
+               lo: int, mid: int, hi: int, lt) -> None:
+        """
+        Merges the sorted runs ``src[lo:mid]`` and ``src[mid:hi]`` into ``dst[lo:hi]``.
 
-        def merge(left: list, right: list) -> list:
-            """
-            Merges two sorted lists into one sorted list.
+        Elements from the left run win ties, which keeps the merge stable.
+
+        Args:
+            src_keys (list): The comparison keys of the source buffer.
+            src_values (list): The elements of the source buffer.
+            dst_keys (list): The comparison keys of the destination buffer.
+            dst_values (list): The elements of the destination buffer.
+            lo (int): The start index of the left run.
+            mid (int): The start index of the right run.
+            hi (int): The end index of the right run (exclusive).
+            lt (callable): The strict "comes before" comparison.
+        """
+        same = src_keys is src_values
+        i, j, k = lo, mid, lo
+        while i < mid and j < hi:
+            if lt(src_keys[j], src_keys[i]):
+                dst_values[k] = src_values[j]
+                if not same:
+                    dst_keys[k] = src_keys[j]
+                j += 1
+            else:
+                dst_values[k] = src_values[i]
+                if not same:
+                    dst_keys[k] = src_keys[i]
+                i += 1
+            k += 1
 
-            Args:
-                left (list): The first sorted list.
-                right (list): The second sorted list.
+        if i < mid:
+            dst_values[k:hi] = src_values[i:mid]
+            if not same:
+                dst_keys[k:hi] = src_keys[i:mid]
+        elif j < hi:
+            dst_values[k:hi] = src_values[j:hi]
+            if not same:
+                dst_keys[k:hi] = src_keys[j:hi]
 
-            Returns:
-                list: A merged sorted list.
-            """
-            merged = []
-            while left and right:
-                if left[0] < right[0]:
-                    merged.append(left.pop(0))
+    def adaptive_sort(self, data: list, key=None, reverse: bool = False) -> list:
+        """
+        Sorts the list using an adaptive natural merge sort (TimSort-style).
+
+        The input is scanned for natural runs; strictly descending runs are
+        reversed and short runs are extended to a minimum length with binary
+        insertion sort. Runs are pushed on a stack and merged following
+        TimSort's balance invariants, using a merge that switches to galloping
+        when one run keeps winning. Already sorted input is handled in O(n).
+        The sort is stable and produces the same result as ``sorted()``.
+
+        Args:
+            data (list): The list of elements to be sorted.
+            key (callable, optional): A function of one argument used to extract
+                a comparison key from each element, as in ``sorted()``.
+            reverse (bool): If True, the list is sorted in descending order,
+                keeping equal elements in their original order.
+
+        Returns:
+            list: A new sorted list.
+        """
+        n = len(data)
+        values = list(data)
+        if n <= 1:
+            return values
+
+        lt = operator.gt if reverse else operator.lt
+        keys = values if key is None else [key(value) for value in data]
+        min_run = self._min_run_length(n)
+        runs = []  # [start, length] pairs
+
+        lo = 0
+        while lo < n:
+            run_hi = self._count_run(keys, values, lo, n, lt)
+            if run_hi - lo < min_run:
+                forced_hi = min(lo + min_run, n)
+                self._binary_insertion_sort(keys, values, lo, forced_hi, run_hi, lt)
+                run_hi = forced_hi
+            runs.append([lo, run_hi - lo])
+            self._merge_collapse(keys, values, runs, lt)
+            lo = run_hi
+
+        while len(runs) > 1:
+            i = len(runs) - 2
+            if i > 0 and runs[i - 1][1] < runs[i + 1][1]:
+                i -= 1
+            self._merge_at(keys, values, runs, i, lt)
+
+        return values
+
+    @staticmethod
+    def _min_run_length(n: int) -> int:
+        """
+        Computes the minimum run length for the adaptive sort.
+
+        Returns a value in ``[32, 64]`` such that ``n / min_run`` is a power of
+        two or slightly less, which keeps the final merges balanced.
+
+        Args:
+            n (int): The length of the input.
+
+        Returns:
+            int: The minimum run length.
+        """
+        remainder = 0
+        while n >= 64:
+            remainder |= n & 1
+            n >>= 1
+        return n + remainder
+
+    @staticmethod
+    def _count_run(keys: list, values: list, lo: int, hi: int, lt) -> int:
+        """
+        Finds the natural run starting at ``lo`` and makes it ascending.
+
+        A strictly descending run is reversed in place; requiring strictness
+        keeps equal elements in their original order.
+
+        Args:
+            keys (list): The comparison keys, parallel to ``values``.
+            values (list): The elements being sorted.
+            lo (int): The start index of the run.
+            hi (int): The end index of the input (exclusive).
+            lt (callable): The strict "comes before" comparison.
+
+        Returns:
+            int: The end index of the run (exclusive).
+        """
+        run_hi = lo + 1
+        if run_hi == hi:
+            return hi
+
+        if lt(keys[run_hi], keys[lo]):
+            run_hi += 1
+            while run_hi < hi and lt(keys[run_hi], keys[run_hi - 1]):
+                run_hi += 1
+            keys[lo:run_hi] = keys[lo:run_hi][::-1]
+            if keys is not values:
+                values[lo:run_hi] = values[lo:run_hi][::-1]
+        else:
+            run_hi += 1
+            while run_hi < hi and not lt(keys[run_hi], keys[run_hi - 1]):
+                run_hi += 1
+        return run_hi
+
+    @staticmethod
+    def _binary_insertion_sort(keys: list, values: list, lo: int, hi: int, start: int, lt) -> None:
+        """
+        Extends the sorted range ``[lo, start)`` to ``[lo, hi)`` with binary insertion.
+
+        Args:
+            keys (list): The comparison keys, parallel to ``values``.
+            values (list): The elements being sorted.
+            lo (int): The start index of the range.
+            hi (int): The end index of the range (exclusive).
+            start (int): The end of the already sorted prefix.
+            lt (callable): The strict "comes before" comparison.
+        """
+        same = keys is values
+        for i in range(start, hi):
+            pivot_key = keys[i]
+            pivot_value = values[i]
+            left, right = lo, i
+            while left < right:
+                middle = (left + right) // 2
+                if lt(pivot_key, keys[middle]):
+                    right = middle
                 else:
-                    merged.append(right.pop(0))
-            merged.extend(left)
-            merged.extend(right)
-            return merged
-    
-        return merge(sorted_left_data, sorted_right_data)
\ No newline at end of file
+                    left = middle + 1
+            keys[left + 1:i + 1] = keys[left:i]
+            keys[left] = pivot_key
+            if not same:
+                values[left + 1:i + 1] = values[left:i]
+                values[left] = pivot_value
+
+    def _merge_collapse(self, keys: list, values: list, runs: list, lt) -> None:
+        """
+        Merges runs on top of the stack until TimSort's invariants hold again.
+
+        For the three topmost run lengths ``A, B, C`` the invariants are
+        ``A > B + C`` and ``B > C``.
+
+        Args:
+            keys (list): The comparison keys, parallel to ``values``.
+            values (list): The elements being sorted.
+            runs (list): The stack of ``[start, length]`` runs.
+            lt (callable): The strict "comes before" comparison.
+        """
+        while len(runs) > 1:
+            i = len(runs) - 2
+            if (i > 0 and runs[i - 1][1] <= runs[i][1] + runs[i + 1][1]) or \
+                    (i > 1 and runs[i - 2][1] <= runs[i - 1][1] + runs[i][1]):
+                if runs[i - 1][1] < runs[i + 1][1]:
+                    i -= 1
+            elif runs[i][1] > runs[i + 1][1]:
+                break
+            self._merge_at(keys, values, runs, i, lt)
+
+    def _merge_at(self, keys: list, values: list, runs: list, i: int, lt) -> None:
+        """
+        Merges the runs at stack positions ``i`` and ``i + 1``.
+
+        Args:
+            keys (list): The comparison keys, parallel to ``values``.
+            values (list): The elements being sorted.
+            runs (list): The stack of ``[start, length]`` runs.
+            i (int): The stack position of the left run.
+            lt (callable): The strict "comes before" comparison.
+        """
+        lo, left_length = runs[i]
+        right_length = runs[i + 1][1]
+        self._gallop_merge(keys, values, lo, lo + left_length, lo + left_length + right_length, lt)
+        runs[i][1] = left_length + right_length
+        del runs[i + 1]
+
+    @staticmethod
+    def _gallop(key, keys: list, lo: int, hi: int, lt, right: bool) -> int:
+        """
+        Locates the insertion point of ``key`` in the sorted range ``keys[lo:hi]``.
+
+        Probes ``lo + 1, lo + 3, lo + 7, ...`` until the key is overshot and then
+        binary searches the last interval, so the cost is logarithmic in the
+        distance from ``lo`` rather than in the length of the range.
+
+        Args:
+            key (Any): The key to locate.
+            keys (list): The sorted comparison keys.
+            lo (int): The start index of the range.
+            hi (int): The end index of the range (exclusive).
+            lt (callable): The strict "comes before" comparison.
+            right (bool): If True, return the position after any equal keys;
+                otherwise the position before them.
+
+        Returns:
+            int: The insertion point.
+        """
+        if right:
+            def before(other):
+                return not lt(key, other)
+        else:
+            def before(other):
+                return lt(other, key)
+
+        if lo >= hi or not before(keys[lo]):
+            return lo
+
+        last, offset = lo, 1
+        while lo + offset < hi and before(keys[lo + offset]):
+            last = lo + offset
+            offset = 2 * offset + 1
+        left, right_bound = last + 1, min(lo + offset, hi)
+
+        while left < right_bound:
+            middle = (left + right_bound) // 2
+            if before(keys[middle]):
+                left = middle + 1
+            else:
+                right_bound = middle
+        return left
+
+    def _gallop_merge(self, keys: list, values: list, lo: int, mid: int, hi: int, lt) -> None:
+        """
+        Stably merges the adjacent sorted runs ``[lo, mid)`` and ``[mid, hi)`` in place.
+
+        Elements of the left run that already precede the right run and
+        elements of the right run that already follow the left run are
+        skipped first. The remaining left run is copied to a temporary buffer
+        and merged forward one element at a time; once one side wins
+        ``MIN_GALLOP`` times in a row the merge gallops, copying whole blocks
+        located with exponential search.
+
+        Args:
+            keys (list): The comparison keys, parallel to ``values``.
+            values (list): The elements being sorted.
+            lo (int): The start index of the left run.
+            mid (int): The start index of the right run.
+            hi (int): The end index of the right run (exclusive).
+            lt (callable): The strict "comes before" comparison.
+        """
+        lo = self._gallop(keys[mid], keys, lo, mid, lt, right=True)
+        if lo == mid:
+            return
+        hi = self._gallop(keys[mid - 1], keys, mid, hi, lt, right=False)
+        if hi == mid:
+            return
+
+        same = keys is values
+        tmp_keys = keys[lo:mid]
+        tmp_values = tmp_keys if same else values[lo:mid]
+        i, n1, j, k = 0, mid - lo, mid, lo
+
+        while i < n1 and j < hi:
+            left_wins = right_wins = 0
+            while i < n1 and j < hi:
+                if lt(keys[j], tmp_keys[i]):
+                    keys[k] = keys[j]
+                    if not same:
+                        values[k] = values[j]
+                    j += 1
+                    right_wins += 1
+                    left_wins = 0
+                else:
+                    keys[k] = tmp_keys[i]
+                    if not same:
+                        values[k] = tmp_values[i]
+                    i += 1
+                    left_wins += 1
+                    right_wins = 0
+                k += 1
+                if left_wins >= self.MIN_GALLOP or right_wins >= self.MIN_GALLOP:
+                    break
+
+            while i < n1 and j < hi:
+                end = self._gallop(keys[j], tmp_keys, i, n1, lt, right=True)
+                left_count = end - i
+                keys[k:k + left_count] = tmp_keys[i:end]
+                if not same:
+                    values[k:k + left_count] = tmp_values[i:end]
+                k += left_count
+                i = end
+                if i == n1:
+                    break
+
+                end = self._gallop(tmp_keys[i], keys, j, hi, lt, right=False)
+                right_count = end - j
+                keys[k:k + right_count] = keys[j:end]
+                if not same:
+                    values[k:k + right_count] = values[j:end]
+                k += right_count
+                j = end
+
+                if left_count < self.MIN_GALLOP and right_count < self.MIN_GALLOP:
+                    break
+
+        if i < n1:
+            keys[k:k + n1 - i] = tmp_keys[i:]
+            if not same:
+                values[k:k + n1 - i] = tmp_values[i:]
+
+    def radix_sort(self, data: list, key=None, reverse: bool = False) -> list:
+        """
+        Sorts the list using Radix Sort, without comparing elements.
+
+        The key type is detected from the data:
+            - ``int`` keys (including negative ones) are offset by the minimum
+              and sorted with LSD radix sort, using a digit width chosen from
+              the key range and input size. When NumPy is installed the
+              digit histograms and stable scatters run as array operations.
+            - ``bytes`` keys are sorted with MSD radix sort, one byte per level.
+            - ``str`` keys are encoded to UTF-8, whose byte order matches code
+              point order, and sorted like ``bytes``.
+
+        The sort is stable and produces the same result as ``sorted()``.
+
+        Args:
+            data (list): The list of elements to be sorted.
+            key (callable, optional): A function of one argument used to extract
+                a comparison key from each element, as in ``sorted()``.
+            reverse (bool): If True, the list is sorted in descending order,
+                keeping equal elements in their original order.
+
+        Raises:
+            TypeError: If the keys are not all ints, all bytes or all strings.
+
+        Returns:
+            list: A new sorted list.
+        """
+        values = list(data)
+        if len(values) <= 1:
+            return values
+
+        # Sorting the reversed input stably and reversing the result gives a
+        # descending order that still keeps equal elements in input order.
+        if reverse:
+            values.reverse()
+
+        keys = values if key is None else [key(value) for value in values]
+        kind = self._radix_key_kind(keys)
+        if kind == "int":
+            result = self._radix_sort_ints(keys, values)
+        else:
+            if kind == "str":
+                keys = [k.encode("utf-8", "surrogatepass") for k in keys]
+            result = self._radix_sort_bytes(keys, values)
+
+        if reverse:
+            result.reverse()
+        return result
+
+    @staticmethod
+    def _radix_key_kind(keys: list) -> str:
+        """
+        Detects which radix sort variant applies to the given keys.
+
+        Args:
+            keys (list): The sort keys.
+
+        Raises:
+            TypeError: If the keys are not all ints, all bytes or all strings.
+
+        Returns:
+            str: One of ``"int"``, ``"bytes"`` or ``"str"``.
+        """
+        for kind, types in (("int", int), ("bytes", (bytes, bytearray)), ("str", str)):
+            if isinstance(keys[0], types):
+                if all(isinstance(k, types) for k in keys):
+                    return kind
+                break
+        raise TypeError("radix_sort requires all keys to be ints, bytes or strings")
+
+    @staticmethod
+    def _radix_sort_ints(keys: list, values: list) -> list:
+        """
+        Stably sorts ``values`` by their integer ``keys`` using LSD radix sort.
+
+        Args:
+            keys (list): The integer keys, parallel to ``values``.
+            values (list): The elements being sorted.
+
+        Returns:
+            list: The sorted elements.
+        """
+        n = len(values)
+        low, high = min(keys), max(keys)
+        bits = (high - low).bit_length()
+        if bits == 0:
+            return values
+
+        if np is not None and -2 ** 63 <= low and high < 2 ** 63:
+            # Offsets fit in uint64; the subtraction wraps modulo 2**64.
+            shifted = np.array(keys, dtype=np.int64).view(np.uint64) - np.uint64(low % 2 ** 64)
+            order = np.arange(n)
+            for shift in range(0, bits, 16):
+                digits = ((shifted >> np.uint64(shift)) & np.uint64(0xFFFF)).astype(np.uint16)
+                if np.bincount(digits, minlength=1 << 16).max() == n:
+                    continue  # every key has the same digit: the pass is a no-op
+                # A stable argsort of 16-bit digits is NumPy's counting/radix scatter.
+                perm = np.argsort(digits, kind="stable")
+                order = order[perm]
+                shifted = shifted[perm]
+            return [values[i] for i in order.tolist()]
+
+        # Wider digits mean fewer passes but more buckets to allocate and walk.
+        width = 8 if n < 1 << 12 else 16
+        passes = -(-bits // width)
+        width = -(-bits // passes)
+        mask = (1 << width) - 1
+
+        same = keys is values
+        items = values if same else list(zip(keys, values))
+        for shift in range(0, bits, width):
+            buckets = [[] for _ in range(1 << width)]
+            appends = [bucket.append for bucket in buckets]
+            if same:
+                for item in items:
+                    appends[((item - low) >> shift) & mask](item)
+            else:
+                for item in items:
+                    appends[((item[0] - low) >> shift) & mask](item)
+            items = list(chain.from_iterable(buckets))
+
+        return items if same else [item[1] for item in items]
+
+    def _radix_sort_bytes(self, keys: list, values: list) -> list:
+        """
+        Stably sorts ``values`` by their ``bytes`` keys using MSD radix sort.
+
+        Each level distributes a bucket by the byte at the current depth into
+        257 sub-buckets, the first one holding keys that have already ended.
+        Buckets of at most ``MIN_RUN`` elements are finished with insertion
+        sort. An explicit stack is used, so long keys cannot exhaust the
+        recursion limit.
+
+        Args:
+            keys (list): The bytes keys, parallel to ``values``.
+            values (list): The elements being sorted.
+
+        Returns:
+            list: The sorted elements.
+        """
+        result = []
+        stack = [(list(zip(keys, values)), 0)]
+        while stack:
+            items, depth = stack.pop()
+            if len(items) <= self.MIN_RUN:
+                item_keys = [item[0] for item in items]
+                item_values = [item[1] for item in items]
+                self._insertion_sort(item_keys, item_values, 0, len(items), operator.lt)
+                result.extend(item_values)
+                continue
+
+            buckets = [[] for _ in range(257)]
+            for item in items:
+                k = item[0]
+                buckets[k[depth] + 1 if depth < len(k) else 0].append(item)
+
+            result.extend(item[1] for item in buckets[0])
+            stack.extend((bucket, depth + 1) for bucket in reversed(buckets[1:]) if bucket)
+        return result
+
+    def parallel_sort(self, data: list, workers: int = None, key=None, reverse: bool = False) -> list:
+        """
+        Sorts the list with Merge Sort spread over several processes.
+
+        The input is split into one chunk per worker, the chunks are sorted
+        with ``merge_sort`` in a ``ProcessPoolExecutor`` and the sorted chunks
+        are k-way merged with a heap. Lists of ints (within 64 bits) or floats
+        are passed to the workers through a ``multiprocessing.shared_memory``
+        block and sorted there in place, so no list is pickled; other data is
+        sent to the workers as list chunks. Inputs smaller than
+        ``PARALLEL_THRESHOLD`` are sorted in the calling process.
+
+        Args:
+            data (list): The list of elements to be sorted.
+            workers (int, optional): The number of worker processes
+                (defaults to the number of CPUs).
+            key (callable, optional): A function of one argument used to extract
+                a comparison key from each element. It must be picklable.
+            reverse (bool): If True, the list is sorted in descending order.
+
+        Returns:
+            list: A new sorted list.
+        """
+        workers = workers or os.cpu_count() or 1
+        n = len(data)
+        if workers == 1 or n < self.PARALLEL_THRESHOLD:
+            return self.merge_sort(data, key=key, reverse=reverse)
+
+        step = -(-n // workers)
+        bounds = [(lo, min(lo + step, n)) for lo in range(0, n, step)]
+        typecode = self._shared_typecode(data) if key is None else None
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            if typecode is None:
+                futures = [executor.submit(_sort_chunk, data[lo:hi], key, reverse) for lo, hi in bounds]
+                chunks = [future.result() for future in futures]
+            else:
+                buffer = array(typecode, data)
+                block = shared_memory.SharedMemory(create=True, size=len(buffer) * buffer.itemsize)
+                view = block.buf.cast(typecode)
+                try:
+                    view[:] = buffer
+                    del buffer
+                    futures = [
+                        executor.submit(_sort_shared_chunk, block.name, typecode, lo, hi, reverse)
+                        for lo, hi in bounds
+                    ]
+                    for future in futures:
+                        future.result()
+                    chunks = [view[lo:hi].tolist() for lo, hi in bounds]
+                finally:
+                    view.release()
+                    block.close()
+                    block.unlink()
+
+        return list(heapq.merge(*chunks, key=key, reverse=reverse))
+
+    @staticmethod
+    def _shared_typecode(data: list):
+        """
+        Picks the ``array`` typecode used to share ``data`` between processes.
+
+        Args:
+            data (list): The list of elements to be sorted.
+
+        Returns:
+            str or None: ``"q"`` for 64-bit ints, ``"d"`` for floats, or None if
+            the data cannot be stored in a typed buffer.
+        """
+        if all(type(value) is float for value in data):
+            return "d"
+        if all(type(value) is int for value in data) and -2 ** 63 <= min(data) and max(data) < 2 ** 63:
+            return "q"
+        return None
+
+    def external_sort(self, source, key=None, reverse: bool = False, memory_limit: int = 64 * 2 ** 20,
+                      buffer_size: int = 2 ** 20, tmp_dir: str = None):
+        """
+        Sorts an iterable that may be larger than memory (external merge sort).
+
+        Elements are streamed from ``source`` (any iterable, e.g. an open file
+        yields its lines) into a run until the estimated size of the run
+        reaches ``memory_limit``. Each full run is sorted with ``merge_sort``
+        and spilled to a temporary file as pickled blocks of
+        ``EXTERNAL_BLOCK_SIZE`` elements. The runs are then lazily k-way merged
+        with a heap. All run files are read and written through buffers of
+        ``buffer_size`` bytes and are removed once the generator finishes or
+        is closed. If the whole input fits in one run nothing is spilled.
+
+        Every open run costs a read buffer plus one unpickled block, so at
+        most ``memory_limit // buffer_size`` runs (at least 2) are merged at
+        once; with more runs, intermediate passes merge consecutive groups
+        into longer run files until few enough remain for the final merge.
+        This also keeps the number of open files bounded.
+
+        The run size is estimated with ``sys.getsizeof``, which is shallow:
+        the contents of containers (and strings inside tuples, say) are not
+        counted, so runs of nested elements can use well over
+        ``memory_limit``. Sorting a run also makes a sorted copy, so memory
+        peaks at about twice the run size.
+
+        The sort is stable. Elements must be picklable.
+
+        Args:
+            source (iterable): The elements to be sorted.
+            key (callable, optional): A function of one argument used to extract
+                a comparison key from each element, as in ``sorted()``.
+            reverse (bool): If True, the elements are sorted in descending order.
+            memory_limit (int): The approximate number of bytes of elements
+                held in memory per run; it also bounds the merge fan-in.
+            buffer_size (int): The I/O buffer size for run files, in bytes.
+            tmp_dir (str, optional): The directory for run files (defaults to
+                the system temporary directory).
+
+        Yields:
+            Any: The elements in sorted order.
+        """
+        with tempfile.TemporaryDirectory(prefix="external_sort_", dir=tmp_dir) as directory:
+            paths = []
+            run, run_size = [], 0
+            for item in source:
+                run.append(item)
+                run_size += sys.getsizeof(item) + 8  # the element plus its list slot
+                if run_size >= memory_limit:
+                    paths.append(self._write_run(run, key, reverse, directory, len(paths), buffer_size))
+                    run, run_size = [], 0
+
+            if not paths:
+                yield from self.merge_sort(run, key=key, reverse=reverse)
+                return
+            if run:
+                paths.append(self._write_run(run, key, reverse, directory, len(paths), buffer_size))
+            del run
+
+            fan_in = max(2, memory_limit // buffer_size)
+            created = len(paths)
+            while len(paths) > fan_in:
+                merged = []
+                for lo in range(0, len(paths), fan_in):
+                    group = paths[lo:lo + fan_in]
+                    if len(group) == 1:
+                        merged.append(group[0])
+                        continue
+                    path = os.path.join(directory, f"run_{created:06d}.bin")
+                    created += 1
+                    self._merge_runs(group, path, key, reverse, buffer_size)
+                    merged.append(path)
+                paths = merged
+
+            runs = [self._read_run(path, buffer_size) for path in paths]
+            try:
+                yield from heapq.merge(*runs, key=key, reverse=reverse)
+            finally:
+                for reader in runs:
+                    reader.close()
+
+    def _write_run(self, run: list, key, reverse: bool, directory: str, index: int, buffer_size: int) -> str:
+        """
+        Sorts a run and spills it to a file as a sequence of pickled blocks.
+
+        Args:
+            run (list): The elements of the run.
+            key (callable, optional): The key function.
+            reverse (bool): If True, the run is sorted in descending order.
+            directory (str): The directory for the run file.
+            index (int): The run number, used in the file name.
+            buffer_size (int): The write buffer size, in bytes.
+
+        Returns:
+            str: The path of the run file.
+        """
+        path = os.path.join(directory, f"run_{index:06d}.bin")
+        self._write_blocks(self.merge_sort(run, key=key, reverse=reverse), path, buffer_size)
+        return path
+
+    def _write_blocks(self, items, path: str, buffer_size: int):
+        """
+        Writes elements to a run file as pickled blocks of ``EXTERNAL_BLOCK_SIZE``.
+
+        Args:
+            items (iterable): The elements, in run order.
+            path (str): The path of the run file.
+            buffer_size (int): The write buffer size, in bytes.
+        """
+        items = iter(items)
+        with open(path, "wb", buffering=buffer_size) as file:
+            while True:
+                block = list(islice(items, self.EXTERNAL_BLOCK_SIZE))
+                if not block:
+                    return
+                pickle.dump(block, file, pickle.HIGHEST_PROTOCOL)
+
+    def _merge_runs(self, paths: list, path: str, key, reverse: bool, buffer_size: int):
+        """
+        Merges run files into one longer run file and removes them (an intermediate merge pass).
+
+        Args:
+            paths (list): The run files, in input order so the merge stays stable.
+            path (str): The path of the merged run file.
+            key (callable, optional): The key function.
+            reverse (bool): If True, the runs are in descending order.
+            buffer_size (int): The I/O buffer size, in bytes.
+        """
+        runs = [self._read_run(run, buffer_size) for run in paths]
+        try:
+            self._write_blocks(heapq.merge(*runs, key=key, reverse=reverse), path, buffer_size)
+        finally:
+            for reader in runs:
+                reader.close()
+        for run in paths:
+            os.remove(run)
+
+    @staticmethod
+    def _read_run(path: str, buffer_size: int):
+        """
+        Lazily reads the elements of a run file written by ``_write_run``.
+
+        Args:
+            path (str): The path of the run file.
+            buffer_size (int): The read buffer size, in bytes.
+
+        Yields:
+            Any: The elements of the run in order.
+        """
+        with open(path, "rb", buffering=buffer_size) as file:
+            while True:
+                try:
+                    block = pickle.load(file)
+                except EOFError:
+                    return
+                yield from block
+
+    def nsmallest(self, k: int, data=None, key=None) -> list:
+        """
+        Returns the ``k`` smallest elements in ascending order.
+
+        Uses a bounded heap of size ``k``, so it runs in O(n log k) time and
+        O(k) memory and accepts any iterable, including a stream. Equal
+        elements keep their input order.
+
+        Args:
+            k (int): The number of elements to return.
+            data (iterable, optional): The elements to search (defaults to ``self.data``).
+            key (callable, optional): A function of one argument used to extract
+                a comparison key from each element.
+
+        Returns:
+            list: The ``k`` smallest elements, sorted.
+        """
+        return heapq.nsmallest(k, self.data if data is None else data, key=key)
+
+    def nlargest(self, k: int, data=None, key=None) -> list:
+        """
+        Returns the ``k`` largest elements in descending order.
+
+        Uses a bounded heap of size ``k``, so it runs in O(n log k) time and
+        O(k) memory and accepts any iterable, including a stream. Equal
+        elements keep their input order.
+
+        Args:
+            k (int): The number of elements to return.
+            data (iterable, optional): The elements to search (defaults to ``self.data``).
+            key (callable, optional): A function of one argument used to extract
+                a comparison key from each element.
+
+        Returns:
+            list: The ``k`` largest elements, sorted in descending order.
+        """
+        return heapq.nlargest(k, self.data if data is None else data, key=key)
+
+    def select(self, i: int, data=None):
+        """
+        Returns the element that would be at index ``i`` if the data were sorted.
+
+        Uses quickselect (introselect) with the same pivots and three-way
+        partition as ``quick_sort``; if partitioning exceeds the depth limit
+        the pivot is chosen by median of medians, which guarantees progress on
+        adversarial input. Runs in O(n) expected time on a copy of the data,
+        so the input is left unchanged. Iterators are consumed into a list.
+
+        Args:
+            i (int): The rank of the element to return; negative values count
+                from the end, as with list indexing.
+            data (iterable, optional): The elements to search (defaults to ``self.data``).
+
+        Raises:
+            IndexError: If ``i`` is out of range.
+
+        Returns:
+            Any: The element of rank ``i``.
+        """
+        data = list(self.data if data is None else data)
+        n = len(data)
+        if i < 0:
+            i += n
+        if i < 0 or i >= n:
+            raise IndexError("Index out of range")
+        self._select(data, 0, n, i)
+        return data[i]
+
+    def partial_sort(self, k: int, data: list = None) -> list:
+        """
+        Partially sorts the list in place so that its first ``k`` elements are
+        the ``k`` smallest, in ascending order.
+
+        The order of the remaining elements is unspecified. The list is
+        partitioned around the element of rank ``k - 1`` with quickselect and
+        only the first ``k`` elements are then sorted, for O(n + k log k) time.
+
+        Args:
+            k (int): The number of leading elements to sort.
+            data (list, optional): The list to partially sort (defaults to ``self.data``).
+
+        Returns:
+            list: The partially sorted list.
+        """
+        data = self.data if data is None else data
+        k = min(k, len(data))
+        if k <= 0:
+            return data
+        if k < len(data):
+            self._select(data, 0, len(data), k - 1)
+        self._introsort(data, 0, k, 2 * k.bit_length())
+        return data
+
+    def _select(self, data: list, lo: int, hi: int, i: int) -> None:
+        """
+        Partitions ``data[lo:hi]`` in place so that ``data[i]`` holds the element
+        of rank ``i``, with no larger element before it and no smaller after it.
+
+        Args:
+            data (list): The list being partitioned.
+            lo (int): The start index of the range (inclusive).
+            hi (int): The end index of the range (exclusive).
+            i (int): The target index, with ``lo <= i < hi``.
+        """
+        depth = 2 * (hi - lo).bit_length()
+        while hi - lo > self.QUICK_SORT_THRESHOLD:
+            if depth == 0:
+                pivot = self._median_of_medians(data, lo, hi)
+            else:
+                pivot = self._choose_pivot(data, lo, hi)
+                depth -= 1
+
+            lt, gt = self._partition(data, lo, hi, pivot)
+            if i < lt:
+                hi = lt
+            elif i >= gt:
+                lo = gt
+            else:
+                return
+
+        self._insertion_sort(data, data, lo, hi, operator.lt)
+
+    def _median_of_medians(self, data: list, lo: int, hi: int):
+        """
+        Picks a pivot for ``data[lo:hi]`` that is guaranteed to split it 30/70 or better.
+
+        Args:
+            data (list): The list being partitioned.
+            lo (int): The start index of the range (inclusive).
+            hi (int): The end index of the range (exclusive).
+
+        Returns:
+            Any: The median of the medians of groups of five elements.
+        """
+        medians = []
+        for start in range(lo, hi, 5):
+            group = data[start:min(start + 5, hi)]
+            self._insertion_sort(group, group, 0, len(group), operator.lt)
+            medians.append(group[len(group) // 2])
+
+        middle = len(medians) // 2
+        self._select(medians, 0, len(medians), middle)
+        return medians[middle]
@@ -0,0 +1,98 @@
+import importlib.util
+import os
+import random
+import sys
+import unittest
+
+# Every package directory names its module ``exp``; load this one under a unique name.
+_spec = importlib.util.spec_from_file_location("sort_exp", os.path.join(os.path.dirname(__file__), "exp.py"))
+exp = sys.modules["sort_exp"] = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(exp)
+Sort = exp.Sort
+
+
+def inputs(n: int, seed: int = 0) -> dict:
+    """
+    Returns lists of ``n`` ints in the shapes that stress the sorts.
+    """
+    rng = random.Random(seed)
+    nearly = list(range(n))
+    for _ in range(max(1, n // 100) if n else 0):
+        i, j = rng.randrange(n), rng.randrange(n)
+        nearly[i], nearly[j] = nearly[j], nearly[i]
+    return {
+        "random": [rng.randint(-10 * n, 10 * n) for _ in range(n)],
+        "sorted": list(range(n)),
+        "reversed": list(range(n, 0, -1)),
+        "few_unique": [rng.randrange(4) for _ in range(n)],
+        "organ_pipe": list(range(n // 2)) + list(range(n - n // 2, 0, -1)),
+        "nearly_sorted": nearly,
+    }
+
+
+class TestSort(unittest.TestCase):
+    def test_sorts_match_sorted(self):
+        for n in (0, 1, 2, 17, 300, 2000):
+            for shape, data in inputs(n).items():
+                expected = sorted(data)
+                with self.subTest(n=n, shape=shape):
+                    self.assertEqual(Sort(list(data)).quick_sort(data), expected)
+                    copy = list(data)
+                    self.assertIs(Sort(copy).quick_sort(copy, in_place=True), copy)
+                    self.assertEqual(copy, expected)
+                    self.assertEqual(Sort(data).merge_sort(data), expected)
+                    self.assertEqual(Sort(data).adaptive_sort(data), expected)
+                    self.assertEqual(Sort(data).radix_sort(data), expected)
+                    self.assertEqual(list(Sort(data).external_sort(data, memory_limit=2048)), expected)
+                    if n <= 300:
+                        self.assertEqual(Sort(list(data)).bubble_sort(), expected)
+                        self.assertEqual(Sort(list(data)).select_sort(), expected)
+
+    def test_stable_with_key_and_reverse(self):
+        rng = random.Random(1)
+        pairs = [(rng.randrange(20), i) for i in range(1000)]
+        sorter = Sort(pairs)
+        for reverse in (False, True):
+            expected = sorted(pairs, key=lambda pair: pair[0], reverse=reverse)
+            for method in (sorter.merge_sort, sorter.adaptive_sort, sorter.radix_sort):
+                self.assertEqual(method(pairs, key=lambda pair: pair[0], reverse=reverse), expected)
+            self.assertEqual(list(sorter.external_sort(pairs, key=lambda pair: pair[0], reverse=reverse,
+                                                       memory_limit=4096)), expected)
+
+    def test_radix_keys(self):
+        rng = random.Random(2)
+        words = ["".join(rng.choice("abcé") for _ in range(rng.randrange(6))) for _ in range(500)]
+        blobs = [word.encode() for word in words]
+        big = [rng.randint(-2 ** 70, 2 ** 70) for _ in range(500)]
+        sorter = Sort([])
+        for data in (words, blobs, big):
+            self.assertEqual(sorter.radix_sort(data), sorted(data))
+        self.assertRaises(TypeError, sorter.radix_sort, [1, "a"])
+
+    def test_parallel_sort(self):
+        data = inputs(5000, seed=3)["random"]
+        sorter = Sort(data)
+        sorter.PARALLEL_THRESHOLD = 1000
+        self.assertEqual(sorter.parallel_sort(data, workers=2), sorted(data))
+        self.assertEqual(sorter.parallel_sort(data, workers=2, reverse=True), sorted(data, reverse=True))
+
+    def test_selection(self):
+        for shape, data in inputs(1000, seed=4).items():
+            expected = sorted(data)
+            sorter = Sort(data)
+            with self.subTest(shape=shape):
+                for i in (0, 1, 99, 500, 999, -1):
+                    self.assertEqual(sorter.select(i), expected[i])
+                self.assertEqual(data, inputs(1000, seed=4)[shape])  # left unchanged
+                for k in (0, 1, 100, 1000, 2000):
+                    self.assertEqual(sorter.nsmallest(k), expected[:k])
+                    self.assertEqual(sorter.nlargest(k), expected[::-1][:k])
+                    copy = list(data)
+                    Sort(copy).partial_sort(k)
+                    self.assertEqual(copy[:k], expected[:k])
+                    self.assertEqual(sorted(copy), expected)
+        self.assertRaises(IndexError, Sort([1, 2]).select, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()